@@ -0,0 +1,89 @@
+# backend/benchmarks/audio_decode.py
+"""
+Per-answer audio preprocessing: ffmpeg process per file vs ffmpeg worker pool vs in-process decode.
+
+Run from the backend directory:
+    python -m benchmarks.audio_decode [--seconds 30] [--runs 20]
+"""
+import argparse
+import io
+import os
+import resource
+import shutil
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+import soundfile as sf
+
+from utils.audio_decode import decode_audio, ffmpeg_pool, av
+
+def make_answer(seconds: float) -> bytes:
+    """A browser-like answer recording: 48 kHz stereo, WebM/Opus if PyAV is available, else WAV"""
+    t = np.arange(int(seconds * 48000)) / 48000
+    samples = (0.3 * np.sin(2 * np.pi * 220 * t) * (1 + np.sin(2 * np.pi * 0.5 * t))).astype(np.float32)
+    stereo = np.stack([samples, samples])
+
+    buffer = io.BytesIO()
+    if av is not None:
+        with av.open(buffer, "w", format="webm") as container:
+            stream = container.add_stream("libopus", rate=48000)
+            stream.layout = "stereo"
+            frame = av.AudioFrame.from_ndarray(stereo, format="fltp", layout="stereo")
+            frame.sample_rate = 48000
+            for packet in stream.encode(frame):
+                container.mux(packet)
+            for packet in stream.encode(None):
+                container.mux(packet)
+    else:
+        sf.write(buffer, stereo.T, 48000, format="WAV", subtype="PCM_16")
+    return buffer.getvalue()
+
+def ffmpeg_per_file(audio: bytes) -> None:
+    """Previous path: temp input file, one ffmpeg process, temp WAV read back"""
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "answer.webm")
+        target = os.path.join(directory, "answer.wav")
+        with open(source, "wb") as f:
+            f.write(audio)
+        subprocess.run(
+            ["ffmpeg", "-loglevel", "error", "-i", source, "-acodec", "pcm_s16le", "-ar", "16000", "-ac", "1", target],
+            check=True
+        )
+        sf.read(target, dtype="int16")
+
+def cpu_seconds() -> float:
+    usage = [resource.getrusage(who) for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+    return sum(u.ru_utime + u.ru_stime for u in usage)
+
+def run(name: str, decode, audio: bytes, runs: int) -> None:
+    decode(audio)  # warm up
+    latencies = []
+    cpu_start = cpu_seconds()
+    for _ in range(runs):
+        start = time.perf_counter()
+        decode(audio)
+        latencies.append(time.perf_counter() - start)
+    cpu = (cpu_seconds() - cpu_start) / runs
+    latencies = np.array(latencies) * 1000
+    print(f"{name:>16}: mean {latencies.mean():7.1f} ms  p95 {np.percentile(latencies, 95):7.1f} ms  cpu {cpu * 1000:7.1f} ms/file")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=30, help="Answer length")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    audio = make_answer(args.seconds)
+    print(f"{args.seconds:.0f}s answer, {'WebM/Opus' if av is not None else 'WAV'}, {len(audio) / 1024:.0f} KiB")
+
+    run("in process", decode_audio, audio, args.runs)
+    if shutil.which("ffmpeg"):
+        run("ffmpeg pool", ffmpeg_pool.decode, audio, args.runs)
+        run("ffmpeg per file", ffmpeg_per_file, audio, args.runs)
+    else:
+        print("ffmpeg not found, skipping the ffmpeg modes")
+
+if __name__ == "__main__":
+    main()
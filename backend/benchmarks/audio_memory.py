@@ -0,0 +1,58 @@
+# backend/benchmarks/audio_memory.py
+"""
+Peak memory of building a transcription request, old path vs in-memory path.
+
+Run from the backend directory:
+    python -m benchmarks.audio_memory [--seconds 120]
+"""
+import argparse
+import base64
+import io
+import json
+import os
+import tempfile
+import tracemalloc
+
+from utils.voice_handling import read_audio, build_transcription_body
+
+def file_path_request(audio: bytes) -> int:
+    """Previous path: copy the upload to disk, read it back, base64 + decode + json.dumps"""
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
+        f.write(audio)
+        path = f.name
+    try:
+        with open(path, "rb") as audio_file:
+            audio_bytes = audio_file.read()
+        audio_base64 = base64.b64encode(audio_bytes).decode("utf-8")
+        body = json.dumps({"inputText": "", "inputAudio": audio_base64, "taskType": "TRANSCRIPTION"})
+        # botocore encodes str bodies to bytes before sending
+        return len(body.encode("utf-8"))
+    finally:
+        os.remove(path)
+
+def in_memory_request(audio: bytes) -> int:
+    """Current path: one buffer read from the upload, base64 written into a preallocated body"""
+    buffer = read_audio(io.BytesIO(audio), len(audio))
+    return len(build_transcription_body(buffer))
+
+def measure(build, audio: bytes) -> int:
+    tracemalloc.start()
+    try:
+        build(audio)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=120, help="Answer length (16 kHz mono 16-bit PCM)")
+    args = parser.parse_args()
+
+    audio = os.urandom(int(args.seconds * 16000) * 2)
+    print(f"Answer audio: {len(audio) / 1024 ** 2:.1f} MiB")
+    for name, build in [("file path", file_path_request), ("in memory", in_memory_request)]:
+        peak = measure(build, audio)
+        print(f"{name:>10}: peak {peak / 1024 ** 2:.1f} MiB ({peak / len(audio):.2f}x audio size)")
+
+if __name__ == "__main__":
+    main()
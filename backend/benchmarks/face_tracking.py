@@ -0,0 +1,57 @@
+# backend/benchmarks/face_tracking.py
+"""
+Per-frame face analysis cost with full-frame detection vs downscaled detection with face tracking.
+
+Also checks that both modes report the same anomalies. Run from the backend directory
+with one or more reference recordings:
+    python -m benchmarks.face_tracking clip1.webm [clip2.webm ...] [--frame-interval 30]
+"""
+import argparse
+import tempfile
+import time
+
+from config import Config
+from utils.video_processor import VideoProcessor
+
+def analyse(path: str, frame_interval: int, face_tracking: bool):
+    processor = VideoProcessor(0, tempfile.mkdtemp(), face_tracking=face_tracking)
+    frames = list(processor.sample_frames(path, frame_interval=frame_interval))
+    start = time.perf_counter()
+    for frame, timestamp in frames:
+        processor.analyze_video_frame(frame, timestamp)
+    elapsed = time.perf_counter() - start
+    anomalies = [(round(a["timestamp"], 3), a["reason"]) for a in processor.anomalies]
+    return elapsed / max(len(frames), 1), len(frames), anomalies
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("clips", nargs="+", help="Reference recordings")
+    parser.add_argument("--frame-interval", type=int, default=30)
+    args = parser.parse_args()
+
+    # Analyse every sampled frame, so only face tracking differs between the modes
+    Config.VIDEO_MOTION_THRESHOLD = 0
+    print(f"Detection width {Config.VIDEO_DETECTION_WIDTH}, full detection every {Config.VIDEO_FULL_DETECTION_INTERVAL} frames")
+    for path in args.clips:
+        full_cost, frames, full_anomalies = analyse(path, args.frame_interval, face_tracking=False)
+        # Full-resolution baseline for comparison, as before downscaling
+        Config.VIDEO_DETECTION_WIDTH, width = 1 << 16, Config.VIDEO_DETECTION_WIDTH
+        try:
+            base_cost, _, base_anomalies = analyse(path, args.frame_interval, face_tracking=False)
+        finally:
+            Config.VIDEO_DETECTION_WIDTH = width
+        tracked_cost, _, tracked_anomalies = analyse(path, args.frame_interval, face_tracking=True)
+
+        print(f"{path}: {frames} frames")
+        for name, cost, anomalies in [
+            ("full resolution", base_cost, base_anomalies),
+            ("downscaled", full_cost, full_anomalies),
+            ("downscaled+track", tracked_cost, tracked_anomalies),
+        ]:
+            print(f"  {name:>16}: {cost * 1000:7.2f} ms/frame  {len(anomalies)} anomalies")
+        if tracked_anomalies != base_anomalies:
+            changed = sorted(set(tracked_anomalies) ^ set(base_anomalies))
+            print(f"  anomalies differ from full resolution at: {changed[:10]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# backend/benchmarks/frame_metrics.py
+"""
+Video analysis summaries: per-frame dicts in a Python loop vs memory-mapped columnar metrics.
+
+Run from the backend directory:
+    python -m benchmarks.frame_metrics [--minutes 60] [--fps 1]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from utils.frame_metrics import (
+    FRAME_METRICS_DTYPE, to_frame_metrics, append_frame_metrics, load_frame_metrics,
+    summarize_frame_metrics, find_key_moments, attention_trend
+)
+
+REASONS = [None, "No face detected", "Multiple faces detected", "Eyes not visible"]
+
+def make_results(frames: int, fps: float):
+    """Frame results shaped like VideoProcessor.analyze_video_frame output"""
+    rng = np.random.default_rng(0)
+    attention = np.clip(0.6 + np.cumsum(rng.normal(0, 0.05, frames)) * 0.1, 0, 1)
+    reasons = rng.choice(len(REASONS), size=frames, p=[0.94, 0.03, 0.01, 0.02])
+    for index in range(frames):
+        reason = REASONS[reasons[index]]
+        faces = 0 if reason == "No face detected" else 2 if reason == "Multiple faces detected" else 1
+        result = {
+            "timestamp": index / fps,
+            "faces_detected": faces,
+            "eye_contact": 0.8 if faces else 0.0,
+            "facial_expression": "neutral",
+            "attention_score": float(attention[index]) if faces else 0.0,
+            "anomaly": reason is not None,
+            "anomaly_reason": reason
+        }
+        if faces:
+            result["eyes_detected"] = 0 if reason == "Eyes not visible" else 2
+        yield result
+
+def dict_analysis(path: str, threshold: float):
+    """Previous path: load every frame dict, average the score lists and walk frames for key moments"""
+    with open(path, 'r') as f:
+        frames = [json.loads(line) for line in f]
+    eye_contact = [frame["eye_contact"] for frame in frames if frame["faces_detected"]]
+    attention = [frame["attention_score"] for frame in frames if frame["faces_detected"]]
+    summary = (sum(eye_contact) / max(len(eye_contact), 1), sum(attention) / max(len(attention), 1), len(frames))
+
+    key_moments = []
+    prev_attention = None
+    for frame in frames:
+        value = frame.get("attention_score", 0.0)
+        if prev_attention is not None and abs(value - prev_attention) > threshold:
+            key_moments.append((frame["timestamp"], "attention_change"))
+        if frame.get("anomaly", False):
+            key_moments.append((frame["timestamp"], "anomaly"))
+        prev_attention = value
+    return summary, key_moments
+
+def columnar_analysis(path: str, threshold: float):
+    """Current path: memory-map the metrics and compute everything with NumPy"""
+    metrics = load_frame_metrics(path)
+    return summarize_frame_metrics(metrics), find_key_moments(metrics, threshold), attention_trend(metrics, 60)
+
+def measure(analysis, path: str, threshold: float, runs: int = 5):
+    tracemalloc.start()
+    result = analysis(path, threshold)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        analysis(path, threshold)
+    return (time.perf_counter() - start) / runs, peak, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=60, help="Recording length")
+    parser.add_argument("--fps", type=float, default=1, help="Analysed frames per second")
+    parser.add_argument("--threshold", type=float, default=0.3)
+    args = parser.parse_args()
+
+    frames = int(args.minutes * 60 * args.fps)
+    with tempfile.TemporaryDirectory() as directory:
+        log_path = os.path.join(directory, "analysis_frames.jsonl")
+        metrics_path = os.path.join(directory, "analysis_metrics.bin")
+        results = list(make_results(frames, args.fps))
+        with open(log_path, 'w') as f:
+            f.writelines(json.dumps(result) + "\n" for result in results)
+        append_frame_metrics(metrics_path, to_frame_metrics(results))
+        del results
+
+        print(
+            f"{frames} frames: frame log {os.path.getsize(log_path) / 1024 ** 2:.1f} MiB, "
+            f"metrics {os.path.getsize(metrics_path) / 1024 ** 2:.2f} MiB ({FRAME_METRICS_DTYPE.itemsize} bytes/frame)"
+        )
+        dict_time, dict_peak, (_, dict_moments) = measure(dict_analysis, log_path, args.threshold)
+        column_time, column_peak, (_, column_moments, _) = measure(columnar_analysis, metrics_path, args.threshold)
+
+        print(f"{'dicts':>9}: {dict_time * 1000:8.1f} ms  peak {dict_peak / 1024 ** 2:7.2f} MiB  {len(dict_moments)} key moments")
+        print(f"{'columnar':>9}: {column_time * 1000:8.1f} ms  peak {column_peak / 1024 ** 2:7.2f} MiB  {len(column_moments)} key moments")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# backend/benchmarks/search.py
+"""
+Full-text search latency over a large answer corpus, against the 100 ms target.
+
+Run from the backend directory:
+    python -m benchmarks.search [--answers 1000000] [--hr-users 20]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from database import models  # noqa: F401, registers the tables
+from database.database import Base
+from database.search import create_search_index, search_interviews
+
+TARGET_MS = 100
+ANSWERS_PER_INTERVIEW = 20
+BATCH_SIZE = 50000
+
+WORDS = (
+    "python java kafka redis postgres docker kubernetes react latency cache queue team deadline "
+    "customer migration outage design review testing deploy pipeline scale debug mentor conflict "
+    "budget api service database index query stream batch monitoring rollback incident"
+).split()
+FILLER = "i we the a and to of in on with for then it was that my our this".split()
+
+QUERIES = {
+    "one term": "team",
+    "two terms": "rollback incident",
+    "three terms": "kafka stream latency",
+    "filler term": "the",
+}
+
+def make_answers(count: int, rng):
+    """Answers of 30-80 words mixing topic words and filler"""
+    words = np.array(WORDS + FILLER * 4)
+    lengths = rng.integers(30, 80, size=count)
+    for length in lengths:
+        yield " ".join(words[rng.integers(0, len(words), size=length)])
+
+def build_database(path: str, answers: int, hr_users: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    create_search_index(engine)
+    rng = np.random.default_rng(0)
+    interviews = -(-answers // ANSWERS_PER_INTERVIEW)
+    now = datetime.now()
+
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO users (id, name, email, hashed_password, user_type) VALUES (:id, :name, :email, 'x', :user_type)
+        """), [
+            {"id": user_id, "name": f"User {user_id}", "email": f"user{user_id}@example.com",
+             "user_type": "HR" if user_id <= hr_users else "Candidate"}
+            for user_id in range(1, hr_users + 2)
+        ])
+        conn.execute(text("""
+            INSERT INTO interviews (id, hr_id, candidate_id, candidate_name, job_role, difficulty, scheduled_date,
+                                    duration, resume_path, job_description, status)
+            VALUES (:id, :hr_id, :candidate_id, 'Candidate', 'Engineer', 'Medium', :scheduled_date,
+                    30, 'resume.pdf', 'Build and run backend services', 'completed')
+        """), [
+            {"id": interview_id, "hr_id": interview_id % hr_users + 1, "candidate_id": hr_users + 1, "scheduled_date": now}
+            for interview_id in range(1, interviews + 1)
+        ])
+
+    rows = []
+    for index, answer in enumerate(make_answers(answers, rng)):
+        rows.append({"interview_id": index // ANSWERS_PER_INTERVIEW + 1, "answer": answer})
+        if len(rows) == BATCH_SIZE:
+            insert_answers(engine, rows)
+            rows = []
+    if rows:
+        insert_answers(engine, rows)
+    engine.dispose()
+
+def insert_answers(engine, rows) -> None:
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO interview_questions (interview_id, question, answer)
+            VALUES (:interview_id, 'Tell me about a project.', :answer)
+        """), rows)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--answers", type=int, default=1000000, help="Indexed answers")
+    parser.add_argument("--hr-users", type=int, default=20, help="HR users the interviews are spread over")
+    parser.add_argument("--runs", type=int, default=20, help="Timed runs per query")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "search.db")
+        start = time.perf_counter()
+        build_database(path, args.answers, args.hr_users)
+        print(
+            f"{args.answers} answers indexed in {time.perf_counter() - start:.1f} s "
+            f"({os.path.getsize(path) / 1024 ** 2:.0f} MiB database)"
+        )
+
+        engine = create_engine(f"sqlite:///{path}")
+        db = sessionmaker(bind=engine)()
+        try:
+            for name, query in QUERIES.items():
+                search_interviews(db, 1, query)
+                timings = []
+                for run in range(args.runs):
+                    start = time.perf_counter()
+                    results = search_interviews(db, 1, query, offset=20 * (run % 3))
+                    timings.append((time.perf_counter() - start) * 1000)
+                p95 = sorted(timings)[int(len(timings) * 0.95) - 1]
+                verdict = "ok" if p95 < TARGET_MS else "OVER TARGET"
+                print(
+                    f"{name:>11} {query!r:>28}: median {statistics.median(timings):7.1f} ms  "
+                    f"p95 {p95:7.1f} ms  {len(results)} results  {verdict}"
+                )
+        finally:
+            db.close()
+            engine.dispose()
+
+if __name__ == "__main__":
+    main()
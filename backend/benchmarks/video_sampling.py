@@ -0,0 +1,108 @@
+# backend/benchmarks/video_sampling.py
+"""
+Frame sampling for video analysis: read() every frame vs grab() with retrieve() on sampled frames vs key frames only.
+
+Run from the backend directory:
+    python -m benchmarks.video_sampling [--seconds 60] [--fps 30] [--detect]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from utils.video_processor import VideoProcessor, av
+
+WIDTH, HEIGHT = 640, 480
+
+def make_frame(index: int) -> np.ndarray:
+    """A webcam-like frame: textured background and a slowly drifting face-sized ellipse"""
+    frame = np.full((HEIGHT, WIDTH, 3), 90, dtype=np.uint8)
+    frame[::8, :, 1] = 110
+    center = (WIDTH // 2 + int(20 * np.sin(index / 40)), HEIGHT // 2)
+    cv2.ellipse(frame, center, (80, 105), 0, 0, 360, (150, 170, 200), -1)
+    cv2.circle(frame, (center[0] - 30, center[1] - 25), 10, (40, 40, 40), -1)
+    cv2.circle(frame, (center[0] + 30, center[1] - 25), 10, (40, 40, 40), -1)
+    return frame
+
+def make_recording(path: str, seconds: float, fps: int) -> str:
+    """Write a test recording: WebM/VP8 with a key frame every 2 s if PyAV is available, else MJPEG AVI"""
+    frames = int(seconds * fps)
+    if av is not None:
+        with av.open(path, "w") as container:
+            stream = container.add_stream("libvpx", rate=fps)
+            stream.width, stream.height, stream.pix_fmt = WIDTH, HEIGHT, "yuv420p"
+            stream.options = {"g": str(2 * fps)}
+            for index in range(frames):
+                for packet in stream.encode(av.VideoFrame.from_ndarray(make_frame(index), format="bgr24")):
+                    container.mux(packet)
+            for packet in stream.encode(None):
+                container.mux(packet)
+        return path
+
+    path = os.path.splitext(path)[0] + ".avi"
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), fps, (WIDTH, HEIGHT))
+    for index in range(frames):
+        writer.write(make_frame(index))
+    writer.release()
+    return path
+
+def read_every_frame(processor: VideoProcessor, path: str, frame_interval: int):
+    """Previous path: read() decodes and converts every frame, then all but every Nth is dropped"""
+    cap = cv2.VideoCapture(path)
+    frame_count = 0
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        processor.sampling_stats["frames"] += 1
+        processor.sampling_stats["decoded"] += 1
+        processor.sampling_stats["retrieved"] += 1
+        if frame_count % frame_interval == 0:
+            yield frame, cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        frame_count += 1
+    cap.release()
+
+def run(name: str, sample, path: str, seconds: float, detect: bool) -> None:
+    processor = VideoProcessor(0, tempfile.mkdtemp())
+    start = time.perf_counter()
+    analysed = 0
+    for frame, timestamp in sample(processor, path):
+        if detect:
+            processor.analyze_video_frame(frame, timestamp)
+        analysed += 1
+    elapsed = time.perf_counter() - start
+
+    stats = processor.sampling_stats
+    per_frame = max(analysed, 1)
+    print(
+        f"{name:>18}: {analysed:5d} analysed  {stats['decoded'] / per_frame:5.1f} decoded/analysed  "
+        f"{stats['retrieved'] / per_frame:5.1f} converted/analysed  "
+        f"{elapsed * 1000:8.1f} ms  {seconds / elapsed:7.1f}x real time"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60, help="Recording length")
+    parser.add_argument("--fps", type=int, default=30, help="Encoded frame rate")
+    parser.add_argument("--frame-interval", type=int, default=30)
+    parser.add_argument("--sample-fps", type=float, default=1.0)
+    parser.add_argument("--detect", action="store_true", help="Run face detection on the sampled frames too")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = make_recording(os.path.join(directory, "recording.webm"), args.seconds, args.fps)
+        print(f"{args.seconds:.0f}s at {args.fps} fps, {os.path.basename(path)}, {os.path.getsize(path) / 1024:.0f} KiB")
+
+        run("read every frame", lambda p, f: read_every_frame(p, f, args.frame_interval), path, args.seconds, args.detect)
+        run("grab interval", lambda p, f: p.sample_frames(f, frame_interval=args.frame_interval), path, args.seconds, args.detect)
+        run(f"grab {args.sample_fps:g} fps", lambda p, f: p.sample_frames(f, sample_fps=args.sample_fps), path, args.seconds, args.detect)
+        if av is not None:
+            run("key frames", lambda p, f: p.sample_frames(f, keyframes_only=True), path, args.seconds, args.detect)
+        else:
+            print("PyAV not installed, skipping key frame mode")
+
+if __name__ == "__main__":
+    main()
@@ -26,11 +26,91 @@ class Config:
     AUDIO_DIR = UPLOAD_DIR / "audio"
     VIDEO_DIR = UPLOAD_DIR / "videos"
     REPORT_DIR = UPLOAD_DIR / "reports"
+    TTS_DIR = UPLOAD_DIR / "tts"
+    TRANSCRIPT_DIR = UPLOAD_DIR / "transcripts"
     
     # LLM settings
     MAX_QUESTIONS = 15
     INTERVIEW_MAX_DURATION = 30  # minutes
     
+    # Dashboard requests over their query budget log a warning; with this set they fail instead (for tests and benchmarks)
+    QUERY_BUDGET_CHECKS = os.getenv("QUERY_BUDGET_CHECKS", "false").lower() == "true"
+    
+    # Recording upload settings
+    RECORDING_MAX_BYTES = int(os.getenv("RECORDING_MAX_BYTES", 2 * 1024 ** 3))
+    RECORDING_MAX_CHUNK_BYTES = 8 * 1024 ** 2
+    RECORDING_UPLOAD_EXPIRY_HOURS = 24  # abandoned upload sessions are deleted after this long without a chunk
+    
+    # Transcript persistence settings
+    TRANSCRIPT_FLUSH_TURNS = 5  # flush buffered Q&A rows every N turns
+    
+    # Speech-to-text settings
+    STT_BACKEND = os.getenv("STT_BACKEND", "bedrock")  # "bedrock" or "local" (stand-in for development and tests)
+    STT_SAMPLE_RATE = 16000  # streamed audio is 16-bit mono PCM at this rate
+    STT_SEGMENT_SECONDS = 5  # audio transcribed per request while the candidate is speaking
+    STT_SEGMENT_SEARCH_SECONDS = 1.5  # segments are cut at the quietest frame in this window before their length
+    STT_SEGMENT_OVERLAP_SECONDS = 0.5  # audio repeated at the start of the next segment
+    STT_MAX_WORKERS = 4
+    STT_CHUNK_SECONDS = 30  # long answers are split into chunks of about this length
+    STT_CHUNK_OVERLAP_SECONDS = 1.0
+    STT_CHUNK_CONCURRENCY = 8  # chunks of one answer transcribed at once
+    ARCHIVE_ANSWER_AUDIO = os.getenv("ARCHIVE_ANSWER_AUDIO", "false").lower() == "true"  # keep answer audio in uploads/audio
+    FFMPEG_POOL_SIZE = 2  # pre-started ffmpeg processes for codecs that cannot be decoded in process
+    
+    # Text-to-speech settings
+    TTS_VOICE = "alloy"
+    TTS_FORMAT = "wav"  # the model's 16-bit mono PCM, stored in a WAV container so browsers can play it
+    TTS_SAMPLE_RATE = 16000  # sample rate of the PCM the model returns
+    TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", 512 * 1024 ** 2))  # on-disk clip store in TTS_DIR
+    TTS_CACHE_MEMORY_BYTES = 32 * 1024 ** 2  # hot clips kept in memory
+    TTS_PREFETCH_WORKERS = 2  # background syntheses of upcoming and fixed question clips
+    
+    # Voice activity detection before transcription
+    VAD_ENABLED = os.getenv("VAD_ENABLED", "true").lower() == "true"
+    VAD_FRAME_MS = 30
+    VAD_ENERGY_MARGIN_DB = 12  # speech threshold above the noise floor
+    VAD_MIN_ENERGY_DB = -50  # bounds on the threshold (dBFS)
+    VAD_MAX_THRESHOLD_DB = -35
+    VAD_ZCR_THRESHOLD = 0.3  # zero-crossing rate of unvoiced consonants
+    VAD_HANGOVER_MS = 150  # padding kept around speech
+    VAD_KEEP_PAUSE_MS = 300  # longer pauses are shortened to this
+    VAD_SPLIT_PAUSE_MS = int(os.getenv("VAD_SPLIT_PAUSE_MS", 0))  # split segments on pauses this long (0 disables)
+    
+    # Video analysis settings
+    VIDEO_ANALYSIS_WORKERS = int(os.getenv("VIDEO_ANALYSIS_WORKERS", 0))  # processes for post-interview analysis (0 = one per core)
+    VIDEO_SAMPLE_FPS = float(os.getenv("VIDEO_SAMPLE_FPS", 0))  # frames analysed per second of media (0 = every Nth frame)
+    VIDEO_KEYFRAMES_ONLY = os.getenv("VIDEO_KEYFRAMES_ONLY", "false").lower() == "true"  # decode key frames only (needs PyAV)
+    VIDEO_FACE_TRACKING = os.getenv("VIDEO_FACE_TRACKING", "true").lower() == "true"  # search near the previous face between full scans
+    VIDEO_DETECTION_WIDTH = 320  # frames are downscaled to this width for face detection
+    VIDEO_FULL_DETECTION_INTERVAL = 10  # analysed frames between full-frame detections while tracking
+    VIDEO_TRACK_PADDING = 0.5  # search region around the tracked face, as a fraction of its size
+    VIDEO_TRACK_CHANGE_LEVEL = 25  # grey levels a thumbnail pixel must change by to count as changed
+    VIDEO_TRACK_CHANGE_PIXELS = 4  # changed thumbnail pixels outside the search region that force a full detection
+    VIDEO_MOTION_THRESHOLD = float(os.getenv("VIDEO_MOTION_THRESHOLD", 3.0))  # mean thumbnail change (grey levels) below which a frame is reused (0 disables)
+    VIDEO_MOTION_THUMBNAIL_WIDTH = 32
+    VIDEO_MOTION_MAX_REUSE = 10  # consecutive frames reused before a full analysis is forced
+    VIDEO_LOG_FSYNC_FRAMES = 256  # analysis log records written between fsyncs
+    VIDEO_TREND_WINDOW_SECONDS = 60  # window of the attention trend in the summary
+    
+    # Live interview channel settings
+    CHANNEL_MAX_PENDING = 8  # queued requests/messages per connection before the socket stops being read
+    CHANNEL_HEARTBEAT_SECONDS = 20
+    CHANNEL_IDLE_TIMEOUT_SECONDS = 90  # close connections that send nothing (not even pings) for this long
+    
+    # Warm-up scheduler settings
+    WARMUP_LEAD_MINUTES = int(os.getenv("WARMUP_LEAD_MINUTES", 15))
+    WARMUP_POLL_SECONDS = 60
+    WARMUP_MAX_CONCURRENT = 2
+    WARMUP_MAX_LIVE_INTERVIEWS = 5  # defer non-urgent warm-ups while this many interviews are live
+    WARMUP_SPACING_SECONDS = 5  # delay between launching warm-ups
+    WARMUP_TTS_QUESTIONS = 3  # opening questions to synthesise ahead of time
+    
+    # Status sweeper settings
+    SWEEP_INTERVAL_SECONDS = 300
+    SWEEP_BATCH_SIZE = 500
+    STALE_SCHEDULED_HOURS = int(os.getenv("STALE_SCHEDULED_HOURS", 24))  # scheduled but never started -> expired
+    STALE_IN_PROGRESS_HOURS = int(os.getenv("STALE_IN_PROGRESS_HOURS", 24))  # started but never completed -> cancelled
+    
     # Create directories if they don't exist
     @classmethod
     def setup(cls):
@@ -38,6 +118,8 @@ class Config:
         cls.AUDIO_DIR.mkdir(parents=True, exist_ok=True)
         cls.VIDEO_DIR.mkdir(parents=True, exist_ok=True)
         cls.REPORT_DIR.mkdir(parents=True, exist_ok=True)
+        cls.TTS_DIR.mkdir(parents=True, exist_ok=True)
+        cls.TRANSCRIPT_DIR.mkdir(parents=True, exist_ok=True)
 
 # Initialize directories
 Config.setup()
\ No newline at end of file
@@ -0,0 +1,130 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from typing import Dict, Any, List
+import logging
+
+from . import models
+
+logger = logging.getLogger(__name__)
+
+STATUSES = ["scheduled", "in_progress", "completed", "cancelled", "expired"]
+
+# Seconds from the scheduled start to a result. created_at defaults to CURRENT_TIMESTAMP,
+# which SQLite stores in UTC, while scheduled_date is the naive local time entered by HR
+# (as compared with datetime.now() elsewhere), so created_at is converted to local time first.
+# Results before the scheduled start (interviews taken early) count as 0.
+def _completion_seconds(result: str, interview: str) -> str:
+    return f"max(julianday({result}.created_at, 'localtime') - julianday({interview}.scheduled_date), 0) * 86400"
+
+def _status_counts(prefix: str, sign: str) -> str:
+    # "<status> = <status> + <sign>(<prefix>.status = '<status>')" for every status column
+    return ", ".join(f"{status} = {status} {sign} ({prefix}.status = '{status}')" for status in STATUSES)
+
+ANALYTICS_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS hiring_stats_interviews_ai AFTER INSERT ON interviews BEGIN
+        INSERT INTO hiring_stats (hr_id, job_role, difficulty, interviews_total, {", ".join(STATUSES)},
+                                  results_count, fit_count, score_sum, completion_seconds_sum)
+        VALUES (new.hr_id, new.job_role, new.difficulty, 1,
+                {", ".join(f"new.status = '{status}'" for status in STATUSES)}, 0, 0, 0, 0)
+        ON CONFLICT (hr_id, job_role, difficulty) DO UPDATE SET
+            interviews_total = interviews_total + 1, {_status_counts("new", "+")};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS hiring_stats_interviews_au AFTER UPDATE OF status ON interviews
+    WHEN old.status IS NOT new.status BEGIN
+        UPDATE hiring_stats SET {_status_counts("old", "-")}
+        WHERE hr_id = old.hr_id AND job_role = old.job_role AND difficulty = old.difficulty;
+        UPDATE hiring_stats SET {_status_counts("new", "+")}
+        WHERE hr_id = new.hr_id AND job_role = new.job_role AND difficulty = new.difficulty;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS hiring_stats_results_ai AFTER INSERT ON interview_results BEGIN
+        UPDATE hiring_stats SET
+            results_count = results_count + 1,
+            fit_count = fit_count + (new.decision = 'Fit'),
+            score_sum = score_sum + new.score,
+            completion_seconds_sum = completion_seconds_sum + coalesce(
+                (SELECT {_completion_seconds("new", "i")}
+                 FROM interviews i WHERE i.id = new.interview_id), 0)
+        WHERE (hr_id, job_role, difficulty) = (
+            SELECT hr_id, job_role, difficulty FROM interviews WHERE id = new.interview_id
+        );
+    END
+    """,
+]
+
+REBUILD_STATEMENTS = [
+    "DELETE FROM hiring_stats",
+    f"""
+    INSERT INTO hiring_stats (hr_id, job_role, difficulty, interviews_total, {", ".join(STATUSES)},
+                              results_count, fit_count, score_sum, completion_seconds_sum)
+    SELECT i.hr_id, i.job_role, i.difficulty, count(*),
+           {", ".join(f"sum(i.status = '{status}')" for status in STATUSES)},
+           count(r.id), coalesce(sum(r.decision = 'Fit'), 0), coalesce(sum(r.score), 0),
+           coalesce(sum({_completion_seconds("r", "i")}), 0)
+    FROM interviews i
+    LEFT JOIN interview_results r ON r.interview_id = i.id
+    GROUP BY i.hr_id, i.job_role, i.difficulty
+    """,
+]
+
+def create_analytics(engine) -> bool:
+    """
+    Create the triggers that maintain hiring_stats, rebuilding it from history on first run
+
+    Returns:
+        True if incremental analytics are available
+    """
+    if engine.dialect.name != "sqlite":
+        logger.warning("Incremental analytics triggers are only created for SQLite")
+        return False
+
+    try:
+        with engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'hiring_stats_interviews_ai'")
+            ).first() is not None
+            for statement in ANALYTICS_TRIGGERS:
+                conn.execute(text(statement))
+            if not exists:
+                for statement in REBUILD_STATEMENTS:
+                    conn.execute(text(statement))
+        return True
+    except Exception as e:
+        logger.error(f"Error creating analytics triggers: {e}")
+        return False
+
+def _summarise(rows: List[models.HiringStats]) -> Dict[str, Any]:
+    totals = {column: sum(getattr(row, column) for row in rows) for column in [
+        "interviews_total", *STATUSES, "results_count", "fit_count", "score_sum", "completion_seconds_sum"
+    ]}
+    results = totals["results_count"]
+    return {
+        "interviews_total": totals["interviews_total"],
+        "status_counts": {status: totals[status] for status in STATUSES},
+        "results_count": results,
+        "pass_rate": totals["fit_count"] / results if results else None,
+        "average_score": totals["score_sum"] / results if results else None,
+        "average_completion_hours": totals["completion_seconds_sum"] / results / 3600 if results else None,
+    }
+
+def get_hr_analytics(db: Session, hr_id: int) -> Dict[str, Any]:
+    """
+    Hiring analytics for an HR user, overall and per job role and difficulty
+
+    Args:
+        db: Database session
+        hr_id: ID of the HR user
+
+    Returns:
+        Dictionary with overall stats and a breakdown per job role and difficulty
+    """
+    rows = db.query(models.HiringStats).filter(models.HiringStats.hr_id == hr_id).all()
+    breakdown = [
+        dict(_summarise([row]), job_role=row.job_role, difficulty=row.difficulty)
+        for row in sorted(rows, key=lambda row: (row.job_role, row.difficulty))
+    ]
+    return {"overall": _summarise(rows), "by_role": breakdown}
@@ -0,0 +1,132 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import select, update, and_, or_, func
+from typing import Optional
+
+from . import models, schema
+from .crud import encode_interview_cursor, decode_interview_cursor, ALLOWED_STATUS_TRANSITIONS
+
+# Async variants of the operations in crud.py, for async routes and async drivers
+
+# User operations
+async def get_user(db: AsyncSession, user_id: int):
+    return await db.get(models.User, user_id)
+
+async def get_user_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(models.User).where(models.User.email == email))
+    return result.scalars().first()
+
+# Interview operations
+async def get_interview(db: AsyncSession, interview_id: int):
+    return await db.get(models.Interview, interview_id)
+
+async def _paginate_interviews(db: AsyncSession, query, limit: int, before: Optional[str]):
+    # Keyset pagination on (scheduled_date, id), newest first
+    cursor = decode_interview_cursor(before) if before else None
+    if cursor:
+        scheduled_date, interview_id = cursor
+        query = query.where(or_(
+            models.Interview.scheduled_date < scheduled_date,
+            and_(models.Interview.scheduled_date == scheduled_date, models.Interview.id < interview_id)
+        ))
+    result = await db.execute(query.order_by(
+        models.Interview.scheduled_date.desc(), models.Interview.id.desc()
+    ).limit(limit + 1))
+    interviews = result.scalars().unique().all()
+
+    next_cursor = encode_interview_cursor(interviews[limit - 1]) if len(interviews) > limit else None
+    return interviews[:limit], next_cursor
+
+async def get_interviews_by_hr(db: AsyncSession, hr_id: int, limit: int = 50, before: Optional[str] = None):
+    query = select(models.Interview).options(
+        selectinload(models.Interview.results)
+    ).where(models.Interview.hr_id == hr_id)
+    return await _paginate_interviews(db, query, limit, before)
+
+async def get_interviews_by_candidate(db: AsyncSession, candidate_id: int, limit: int = 50, before: Optional[str] = None):
+    query = select(models.Interview).options(
+        joinedload(models.Interview.hr)
+    ).where(models.Interview.candidate_id == candidate_id)
+    return await _paginate_interviews(db, query, limit, before)
+
+async def count_interviews_by_hr_status(db: AsyncSession, hr_id: int):
+    result = await db.execute(
+        select(models.Interview.status, func.count(models.Interview.id))
+        .where(models.Interview.hr_id == hr_id)
+        .group_by(models.Interview.status)
+    )
+    return dict(result.all())
+
+async def update_interview_status(db: AsyncSession, interview_id: int, status: str) -> int:
+    result = await db.execute(
+        update(models.Interview)
+        .where(models.Interview.id == interview_id)
+        .values(status=status)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount
+
+async def transition_interview_status(db: AsyncSession, interview_id: int, status: str, from_statuses=None) -> bool:
+    # Single conditional UPDATE: only applies if the interview is still in one of the expected statuses
+    from_statuses = from_statuses or ALLOWED_STATUS_TRANSITIONS[status]
+    result = await db.execute(
+        update(models.Interview)
+        .where(models.Interview.id == interview_id, models.Interview.status.in_(from_statuses))
+        .values(status=status)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+# Interview Question operations
+async def create_interview_question(db: AsyncSession, question: schema.InterviewQuestionCreate):
+    db_question = models.InterviewQuestion(**question.dict())
+    db.add(db_question)
+    await db.commit()
+    await db.refresh(db_question)
+    return db_question
+
+async def get_interview_questions(db: AsyncSession, interview_id: int):
+    result = await db.execute(
+        select(models.InterviewQuestion).where(models.InterviewQuestion.interview_id == interview_id)
+    )
+    return result.scalars().all()
+
+async def update_interview_question(db: AsyncSession, question_id: int, answer: str):
+    db_question = await db.get(models.InterviewQuestion, question_id)
+    if db_question:
+        db_question.answer = answer
+        await db.commit()
+    return db_question
+
+# Interview Question Plan operations
+async def get_question_plan(db: AsyncSession, interview_id: int):
+    result = await db.execute(
+        select(models.InterviewQuestionPlan).where(models.InterviewQuestionPlan.interview_id == interview_id)
+    )
+    return result.scalars().first()
+
+async def save_question_plan(db: AsyncSession, interview_id: int, categories: dict):
+    db_plan = await get_question_plan(db, interview_id)
+    if db_plan:
+        db_plan.categories = categories
+    else:
+        db_plan = models.InterviewQuestionPlan(interview_id=interview_id, categories=categories)
+        db.add(db_plan)
+    await db.commit()
+    return db_plan
+
+# Interview Result operations
+async def create_interview_result(db: AsyncSession, result: schema.InterviewResultCreate):
+    db_result = models.InterviewResult(**result.dict())
+    db.add(db_result)
+    await db.commit()
+    await db.refresh(db_result)
+    return db_result
+
+async def get_interview_result(db: AsyncSession, interview_id: int):
+    result = await db.execute(
+        select(models.InterviewResult).where(models.InterviewResult.interview_id == interview_id)
+    )
+    return result.scalars().first()
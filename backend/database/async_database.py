@@ -0,0 +1,38 @@
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+import os
+
+from .database import DATABASE_URL, is_sqlite, apply_sqlite_pragmas, get_engine_options
+
+# Async drivers for the supported databases
+ASYNC_DRIVERS = {
+    "sqlite://": "sqlite+aiosqlite://",
+    "postgresql://": "postgresql+asyncpg://",
+    "mysql://": "mysql+aiomysql://",
+}
+
+def get_async_database_url(url: str) -> str:
+    """Convert a synchronous database URL to its async driver equivalent"""
+    for prefix, async_prefix in ASYNC_DRIVERS.items():
+        if url.startswith(prefix):
+            return async_prefix + url[len(prefix):]
+    return url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", get_async_database_url(DATABASE_URL))
+
+# Create async SQLAlchemy engine
+async_options = get_engine_options(ASYNC_DATABASE_URL)
+if is_sqlite(ASYNC_DATABASE_URL):
+    # aiosqlite runs each connection in its own thread, so the thread check does not apply
+    async_options.get("connect_args", {}).pop("check_same_thread", None)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **async_options)
+if is_sqlite(ASYNC_DATABASE_URL):
+    event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+
+# Create async sessionmaker
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+# Dependency to get an async database session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
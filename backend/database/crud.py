@@ -1,6 +1,7 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import and_, or_, func
 from typing import List, Optional
+from datetime import datetime
 import hashlib
 import uuid
 
@@ -51,19 +52,106 @@ def create_interview(db: Session, interview: schema.InterviewCreate):
 def get_interview(db: Session, interview_id: int):
     return db.query(models.Interview).filter(models.Interview.id == interview_id).first()
 
-def get_interviews_by_hr(db: Session, hr_id: int):
-    return db.query(models.Interview).filter(models.Interview.hr_id == hr_id).all()
+def encode_interview_cursor(interview: models.Interview) -> str:
+    return f"{interview.scheduled_date.isoformat()}_{interview.id}"
 
-def get_interviews_by_candidate(db: Session, candidate_id: int):
-    return db.query(models.Interview).filter(models.Interview.candidate_id == candidate_id).all()
+def decode_interview_cursor(cursor: str):
+    try:
+        scheduled_date, interview_id = cursor.rsplit("_", 1)
+        return datetime.fromisoformat(scheduled_date), int(interview_id)
+    except ValueError:
+        return None
+
+def _paginate_interviews(query, limit: int, before: Optional[str]):
+    # Keyset pagination on (scheduled_date, id), newest first
+    cursor = decode_interview_cursor(before) if before else None
+    if cursor:
+        scheduled_date, interview_id = cursor
+        query = query.filter(or_(
+            models.Interview.scheduled_date < scheduled_date,
+            and_(models.Interview.scheduled_date == scheduled_date, models.Interview.id < interview_id)
+        ))
+    interviews = query.order_by(
+        models.Interview.scheduled_date.desc(), models.Interview.id.desc()
+    ).limit(limit + 1).all()
+    
+    next_cursor = encode_interview_cursor(interviews[limit - 1]) if len(interviews) > limit else None
+    return interviews[:limit], next_cursor
+
+def get_interviews_by_hr(db: Session, hr_id: int, limit: int = 50, before: Optional[str] = None):
+    query = db.query(models.Interview).options(
+        selectinload(models.Interview.results)
+    ).filter(models.Interview.hr_id == hr_id)
+    return _paginate_interviews(query, limit, before)
+
+def get_interviews_by_candidate(db: Session, candidate_id: int, limit: int = 50, before: Optional[str] = None):
+    query = db.query(models.Interview).options(
+        joinedload(models.Interview.hr)
+    ).filter(models.Interview.candidate_id == candidate_id)
+    return _paginate_interviews(query, limit, before)
+
+def count_interviews_by_hr_status(db: Session, hr_id: int):
+    rows = db.query(models.Interview.status, func.count(models.Interview.id)).filter(
+        models.Interview.hr_id == hr_id
+    ).group_by(models.Interview.status).all()
+    return dict(rows)
+
+def get_upcoming_interviews(db: Session, start: datetime, end: datetime):
+    return db.query(models.Interview).filter(
+        models.Interview.status == "scheduled",
+        models.Interview.scheduled_date >= start,
+        models.Interview.scheduled_date <= end
+    ).order_by(models.Interview.scheduled_date).all()
+
+def count_interviews_by_status(db: Session, status: str) -> int:
+    return db.query(models.Interview).filter(models.Interview.status == status).count()
+
+# Statuses an interview may move from, for each target status
+ALLOWED_STATUS_TRANSITIONS = {
+    "in_progress": ("scheduled",),
+    "completed": ("scheduled", "in_progress"),
+    "cancelled": ("scheduled", "in_progress"),
+    "expired": ("scheduled",),
+}
+
+def update_interview_status(db: Session, interview_id: int, status: str) -> int:
+    rows = db.query(models.Interview).filter(
+        models.Interview.id == interview_id
+    ).update({models.Interview.status: status}, synchronize_session=False)
+    db.commit()
+    return rows
 
-def update_interview_status(db: Session, interview_id: int, status: str):
-    db_interview = get_interview(db, interview_id)
-    if db_interview:
-        db_interview.status = status
+def transition_interview_status(db: Session, interview_id: int, status: str, from_statuses=None) -> bool:
+    # Single conditional UPDATE: only applies if the interview is still in one of the expected statuses
+    from_statuses = from_statuses or ALLOWED_STATUS_TRANSITIONS[status]
+    rows = db.query(models.Interview).filter(
+        models.Interview.id == interview_id,
+        models.Interview.status.in_(from_statuses)
+    ).update({models.Interview.status: status}, synchronize_session=False)
+    db.commit()
+    return rows == 1
+
+def sweep_interview_statuses(db: Session, from_status: str, to_status: str, scheduled_before: datetime, batch_size: int = 500) -> int:
+    # Move stale interviews to a new status in batched UPDATEs, returning the number of rows affected
+    total = 0
+    while True:
+        ids = [row.id for row in db.query(models.Interview.id).filter(
+            models.Interview.status == from_status,
+            models.Interview.scheduled_date < scheduled_before
+        ).limit(batch_size).all()]
+        if not ids:
+            break
+        
+        rows = db.query(models.Interview).filter(
+            models.Interview.id.in_(ids),
+            models.Interview.status == from_status
+        ).update({models.Interview.status: to_status}, synchronize_session=False)
         db.commit()
-        db.refresh(db_interview)
-    return db_interview
+        total += rows
+        
+        if len(ids) < batch_size:
+            break
+    return total
 
 # Interview Question operations
 def create_interview_question(db: Session, question: schema.InterviewQuestionCreate):
@@ -84,6 +172,63 @@ def update_interview_question(db: Session, question_id: int, answer: str):
         db.refresh(db_question)
     return db_question
 
+def bulk_create_interview_questions(db: Session, turns: List[dict], known_ids: Optional[dict] = None) -> dict:
+    # Insert a batch of transcript turns in one transaction.
+    # Each turn has "key", "interview_id", "question", "answer", "timestamp" and an optional
+    # "follow_up_to" key referring to a turn in this batch or to a key in known_ids.
+    # Returns known_ids extended with the row ids of the inserted turns.
+    ids = dict(known_ids or {})
+    parents = [turn for turn in turns if turn.get("follow_up_to") is None]
+    follow_ups = [turn for turn in turns if turn.get("follow_up_to") is not None]
+    
+    try:
+        for batch in (parents, follow_ups):
+            if not batch:
+                continue
+            mappings = [{
+                "interview_id": turn["interview_id"],
+                "question": turn["question"],
+                "answer": turn["answer"],
+                "timestamp": turn["timestamp"],
+                "follow_up_to": ids.get(turn.get("follow_up_to"))
+            } for turn in batch]
+            db.bulk_insert_mappings(models.InterviewQuestion, mappings, return_defaults=True)
+            for turn, mapping in zip(batch, mappings):
+                ids[turn["key"]] = mapping["id"]
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return ids
+
+def get_recorded_question_texts(db: Session, interview_id: int) -> List[str]:
+    return [row.question for row in db.query(models.InterviewQuestion.question).filter(
+        models.InterviewQuestion.interview_id == interview_id
+    )]
+
+def find_interview_question_id(db: Session, interview_id: int, question: str, answer: str) -> Optional[int]:
+    row = db.query(models.InterviewQuestion.id).filter(
+        models.InterviewQuestion.interview_id == interview_id,
+        models.InterviewQuestion.question == question,
+        models.InterviewQuestion.answer == answer
+    ).first()
+    return row.id if row else None
+
+# Interview Question Plan operations
+def save_question_plan(db: Session, interview_id: int, categories: dict):
+    db_plan = get_question_plan(db, interview_id)
+    if db_plan:
+        db_plan.categories = categories
+    else:
+        db_plan = models.InterviewQuestionPlan(interview_id=interview_id, categories=categories)
+        db.add(db_plan)
+    db.commit()
+    db.refresh(db_plan)
+    return db_plan
+
+def get_question_plan(db: Session, interview_id: int):
+    return db.query(models.InterviewQuestionPlan).filter(models.InterviewQuestionPlan.interview_id == interview_id).first()
+
 # Interview Result operations
 def create_interview_result(db: Session, result: schema.InterviewResultCreate):
     db_result = models.InterviewResult(**result.dict())
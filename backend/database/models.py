@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, JSON, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -31,7 +31,7 @@ class Interview(Base):
     resume_path = Column(String, nullable=False)
     job_description = Column(Text, nullable=False)
     custom_questions = Column(JSON, nullable=True)
-    status = Column(String, nullable=False)  # "scheduled", "in_progress", "completed", "cancelled"
+    status = Column(String, nullable=False)  # "scheduled", "in_progress", "completed", "cancelled", "expired"
     created_at = Column(DateTime, default=func.now())
     
     # Relationships
@@ -39,6 +39,13 @@ class Interview(Base):
     candidate = relationship("User", foreign_keys=[candidate_id], back_populates="candidate_interviews")
     results = relationship("InterviewResult", back_populates="interview", uselist=False)
     questions = relationship("InterviewQuestion", back_populates="interview")
+    question_plan = relationship("InterviewQuestionPlan", back_populates="interview", uselist=False)
+    
+    # Indexes for the dashboard queries
+    __table_args__ = (
+        Index("ix_interviews_hr_id_scheduled_date", "hr_id", "scheduled_date"),
+        Index("ix_interviews_candidate_id_status", "candidate_id", "status"),
+    )
 
 class InterviewQuestion(Base):
     __tablename__ = "interview_questions"
@@ -54,11 +61,22 @@ class InterviewQuestion(Base):
     interview = relationship("Interview", back_populates="questions")
     follow_ups = relationship("InterviewQuestion", foreign_keys=[follow_up_to])
 
+class InterviewQuestionPlan(Base):
+    __tablename__ = "interview_question_plans"
+
+    id = Column(Integer, primary_key=True, index=True)
+    interview_id = Column(Integer, ForeignKey("interviews.id"), unique=True, index=True, nullable=False)
+    categories = Column(JSON, nullable=False)  # {"<category>": {"questions": [...]}} in asking order
+    created_at = Column(DateTime, default=func.now())
+    
+    # Relationships
+    interview = relationship("Interview", back_populates="question_plan")
+
 class InterviewResult(Base):
     __tablename__ = "interview_results"
 
     id = Column(Integer, primary_key=True, index=True)
-    interview_id = Column(Integer, ForeignKey("interviews.id"), unique=True, nullable=False)
+    interview_id = Column(Integer, ForeignKey("interviews.id"), unique=True, index=True, nullable=False)
     score = Column(Float, nullable=False)  # 0-100
     decision = Column(String, nullable=False)  # "Fit" or "Not Fit"
     report_path = Column(String, nullable=False)
@@ -67,4 +85,27 @@ class InterviewResult(Base):
     created_at = Column(DateTime, default=func.now())
     
     # Relationships
-    interview = relationship("Interview", back_populates="results")
\ No newline at end of file
+    interview = relationship("Interview", back_populates="results")
+
+class HiringStats(Base):
+    __tablename__ = "hiring_stats"
+
+    # Maintained incrementally by triggers (see database/analytics.py)
+    id = Column(Integer, primary_key=True, index=True)
+    hr_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    job_role = Column(String, nullable=False)
+    difficulty = Column(String, nullable=False)
+    interviews_total = Column(Integer, nullable=False, default=0)
+    scheduled = Column(Integer, nullable=False, default=0)
+    in_progress = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+    cancelled = Column(Integer, nullable=False, default=0)
+    expired = Column(Integer, nullable=False, default=0)
+    results_count = Column(Integer, nullable=False, default=0)
+    fit_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+    completion_seconds_sum = Column(Float, nullable=False, default=0.0)  # scheduled start to result
+    
+    __table_args__ = (
+        UniqueConstraint("hr_id", "job_role", "difficulty", name="uq_hiring_stats_hr_role_difficulty"),
+    )
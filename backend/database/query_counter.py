@@ -0,0 +1,56 @@
+import logging
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+class QueryBudgetExceeded(Exception):
+    """More statements were executed than the query budget allows"""
+
+class QueryCounter:
+    """
+    Count the ORM statements executed through a session, including lazy relationship loads.
+
+    Usage:
+        with QueryCounter(db, max_queries=3) as counter:
+            interviews = get_interviews_by_hr(db, hr_id)
+            render(interviews)
+        print(counter.count)
+
+    If more than max_queries statements were executed, exiting raises QueryBudgetExceeded
+    when strict (tests and benchmarks), and otherwise logs a warning, so a request that goes
+    over its budget in production is reported without failing.
+    """
+
+    def __init__(self, db: Session, max_queries: int = None, strict: bool = True):
+        self.db = db
+        self.max_queries = max_queries
+        self.strict = strict
+        self.count = 0
+        self.statements: List[str] = []
+
+    def _on_execute(self, orm_execute_state):
+        self.count += 1
+        self.statements.append(str(orm_execute_state.statement))
+
+    def __enter__(self):
+        event.listen(self.db, "do_orm_execute", self._on_execute)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        event.remove(self.db, "do_orm_execute", self._on_execute)
+        if exc_type is None and self.max_queries is not None:
+            if self.strict:
+                self.assert_max_queries(self.max_queries)
+            elif self.count > self.max_queries:
+                logger.warning(self._budget_message(self.max_queries))
+        return False
+
+    def _budget_message(self, max_queries: int) -> str:
+        return f"Expected at most {max_queries} queries, got {self.count}:\n" + "\n".join(self.statements)
+
+    def assert_max_queries(self, max_queries: int) -> None:
+        """Raise QueryBudgetExceeded if more than max_queries statements were executed"""
+        if self.count > max_queries:
+            raise QueryBudgetExceeded(self._budget_message(max_queries))
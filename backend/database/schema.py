@@ -60,8 +60,8 @@ class InterviewCreate(InterviewBase):
     
     @validator('status')
     def valid_status(cls, v):
-        if v not in ["scheduled", "in_progress", "completed", "cancelled"]:
-            raise ValueError('Status must be one of: scheduled, in_progress, completed, cancelled')
+        if v not in ["scheduled", "in_progress", "completed", "cancelled", "expired"]:
+            raise ValueError('Status must be one of: scheduled, in_progress, completed, cancelled, expired')
         return v
 
 class InterviewUpdate(BaseModel):
@@ -69,8 +69,8 @@ class InterviewUpdate(BaseModel):
     
     @validator('status')
     def valid_status(cls, v):
-        if v not in ["scheduled", "in_progress", "completed", "cancelled"]:
-            raise ValueError('Status must be one of: scheduled, in_progress, completed, cancelled')
+        if v not in ["scheduled", "in_progress", "completed", "cancelled", "expired"]:
+            raise ValueError('Status must be one of: scheduled, in_progress, completed, cancelled, expired')
         return v
 
 class InterviewResponse(InterviewBase):
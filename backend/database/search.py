@@ -0,0 +1,197 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from typing import List, Dict, Any
+import html
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Sources indexed in the search table. Row ids are (source row id * 4 + source code),
+# so triggers can update and delete index entries by rowid. The owner column holds an
+# "hr<id>" token, so a search only ranks the documents of one HR user.
+SEARCH_SOURCES = {
+    1: "answer",
+    2: "feedback",
+    3: "job_description",
+}
+
+SEARCH_INDEX_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+        source UNINDEXED,
+        interview_id UNINDEXED,
+        owner,
+        body,
+        tokenize = 'porter unicode61'
+    )
+    """,
+    # Interview questions and answers
+    """
+    CREATE TRIGGER IF NOT EXISTS search_questions_ai AFTER INSERT ON interview_questions BEGIN
+        INSERT INTO search_index(rowid, source, interview_id, owner, body)
+        SELECT new.id * 4 + 1, 1, new.interview_id, 'hr' || i.hr_id, new.question || ' ' || coalesce(new.answer, '')
+        FROM interviews i WHERE i.id = new.interview_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_questions_au AFTER UPDATE OF question, answer ON interview_questions BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 1;
+        INSERT INTO search_index(rowid, source, interview_id, owner, body)
+        SELECT new.id * 4 + 1, 1, new.interview_id, 'hr' || i.hr_id, new.question || ' ' || coalesce(new.answer, '')
+        FROM interviews i WHERE i.id = new.interview_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_questions_ad AFTER DELETE ON interview_questions BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 1;
+    END
+    """,
+    # Interview result feedback
+    """
+    CREATE TRIGGER IF NOT EXISTS search_results_ai AFTER INSERT ON interview_results WHEN new.notes IS NOT NULL BEGIN
+        INSERT INTO search_index(rowid, source, interview_id, owner, body)
+        SELECT new.id * 4 + 2, 2, new.interview_id, 'hr' || i.hr_id, new.notes
+        FROM interviews i WHERE i.id = new.interview_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_results_au AFTER UPDATE OF notes ON interview_results BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 2;
+        INSERT INTO search_index(rowid, source, interview_id, owner, body)
+        SELECT new.id * 4 + 2, 2, new.interview_id, 'hr' || i.hr_id, new.notes
+        FROM interviews i WHERE i.id = new.interview_id AND new.notes IS NOT NULL;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_results_ad AFTER DELETE ON interview_results BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 2;
+    END
+    """,
+    # Job descriptions
+    """
+    CREATE TRIGGER IF NOT EXISTS search_interviews_ai AFTER INSERT ON interviews BEGIN
+        INSERT INTO search_index(rowid, source, interview_id, owner, body)
+        VALUES (new.id * 4 + 3, 3, new.id, 'hr' || new.hr_id, new.job_description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_interviews_au AFTER UPDATE OF job_description ON interviews BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 3;
+        INSERT INTO search_index(rowid, source, interview_id, owner, body)
+        VALUES (new.id * 4 + 3, 3, new.id, 'hr' || new.hr_id, new.job_description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_interviews_owner_au AFTER UPDATE OF hr_id ON interviews BEGIN
+        UPDATE search_index SET owner = 'hr' || new.hr_id WHERE interview_id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS search_interviews_ad AFTER DELETE ON interviews BEGIN
+        DELETE FROM search_index WHERE rowid = old.id * 4 + 3;
+    END
+    """,
+]
+
+# Fill the index from existing rows when it is first created
+SEARCH_INDEX_BACKFILL = [
+    """
+    INSERT INTO search_index(rowid, source, interview_id, owner, body)
+    SELECT q.id * 4 + 1, 1, q.interview_id, 'hr' || i.hr_id, q.question || ' ' || coalesce(q.answer, '')
+    FROM interview_questions q JOIN interviews i ON i.id = q.interview_id
+    """,
+    """
+    INSERT INTO search_index(rowid, source, interview_id, owner, body)
+    SELECT r.id * 4 + 2, 2, r.interview_id, 'hr' || i.hr_id, r.notes
+    FROM interview_results r JOIN interviews i ON i.id = r.interview_id WHERE r.notes IS NOT NULL
+    """,
+    """
+    INSERT INTO search_index(rowid, source, interview_id, owner, body)
+    SELECT id * 4 + 3, 3, id, 'hr' || hr_id, job_description FROM interviews
+    """,
+]
+
+def create_search_index(engine) -> bool:
+    """
+    Create the FTS5 search table and its sync triggers, backfilling existing rows
+
+    Returns:
+        True if full-text search is available
+    """
+    if engine.dialect.name != "sqlite":
+        logger.warning("Full-text search requires SQLite FTS5, search is disabled")
+        return False
+
+    try:
+        with engine.begin() as conn:
+            exists = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'")
+            ).first() is not None
+            for statement in SEARCH_INDEX_DDL:
+                conn.execute(text(statement))
+            if not exists:
+                for statement in SEARCH_INDEX_BACKFILL:
+                    conn.execute(text(statement))
+        return True
+    except Exception as e:
+        logger.error(f"Error creating search index: {e}")
+        return False
+
+# Control characters around matches in raw snippets, replaced with <mark> after escaping
+MATCH_START = "\x02"
+MATCH_END = "\x03"
+
+def highlight_snippet(raw_snippet: str) -> str:
+    """Escape a raw snippet as HTML and wrap its matches in <mark>"""
+    escaped = html.escape(raw_snippet or "")
+    return escaped.replace(MATCH_START, "<mark>").replace(MATCH_END, "</mark>")
+
+def build_match_query(query: str, hr_id: int) -> str:
+    """Turn free text into an FTS5 query matching all of its terms in the documents of an HR user"""
+    terms = [term.replace('"', '""') for term in query.split()]
+    if not terms:
+        return ""
+    phrases = " ".join(f'"{term}"' for term in terms)
+    return f'owner : "hr{int(hr_id)}" AND body : ({phrases})'
+
+def search_interviews(db: Session, hr_id: int, query: str, limit: int = 20, offset: int = 0) -> List[Dict[str, Any]]:
+    """
+    Ranked full-text search over answers, feedback and job descriptions of an HR user's interviews
+
+    Args:
+        db: Database session
+        hr_id: ID of the HR user
+        query: Free text query
+        limit: Page size
+        offset: Number of results to skip
+
+    Returns:
+        List of matches with interview details and an HTML-escaped snippet with matches in <mark>
+    """
+    match_query = build_match_query(query, hr_id)
+    if not match_query:
+        return []
+
+    rows = db.execute(text("""
+        SELECT s.interview_id, s.source, i.candidate_name, i.job_role, i.scheduled_date,
+               snippet(search_index, 3, :match_start, :match_end, '...', 16) AS snippet,
+               bm25(search_index, 0, 0, 0, 1) AS rank
+        FROM search_index s
+        JOIN interviews i ON i.id = s.interview_id
+        WHERE search_index MATCH :query AND i.hr_id = :hr_id
+        ORDER BY rank
+        LIMIT :limit OFFSET :offset
+    """), {
+        "query": match_query, "hr_id": hr_id, "limit": limit, "offset": offset,
+        "match_start": MATCH_START, "match_end": MATCH_END
+    }).mappings().all()
+
+    return [{
+        "interview_id": row["interview_id"],
+        "source": SEARCH_SOURCES.get(int(row["source"]), "unknown"),
+        "candidate_name": row["candidate_name"],
+        "job_role": row["job_role"],
+        "scheduled_date": row["scheduled_date"],
+        "snippet": highlight_snippet(row["snippet"]),
+        "rank": row["rank"]
+    } for row in rows]
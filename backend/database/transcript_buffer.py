@@ -0,0 +1,266 @@
+import os
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from config import Config
+from .database import SessionLocal
+from .crud import bulk_create_interview_questions, get_recorded_question_texts, find_interview_question_id
+
+logger = logging.getLogger(__name__)
+
+def question_key(question_id) -> str:
+    """Normalise a question id (1, "1", 1.0, "1.1") to a stable key"""
+    try:
+        return str(float(question_id))
+    except (ValueError, TypeError):
+        return str(question_id)
+
+class TranscriptBuffer:
+    """
+    Write-behind buffer for interview transcripts.
+
+    Each answered turn is appended (and fsynced) to a per-interview replay log, then kept in
+    memory. Buffered turns are written to interview_questions in one transaction every
+    flush_turns turns and when the interview completes. After a flush the log is rewritten
+    to a {"flushed": {question key: row id}} record followed by the turns still buffered, so
+    follow-ups replayed after a crash keep their link to questions flushed earlier. Logs left
+    behind by a crash are replayed on startup.
+    """
+
+    def __init__(
+        self,
+        flush_turns: int = Config.TRANSCRIPT_FLUSH_TURNS,
+        log_dir: str = str(Config.TRANSCRIPT_DIR),
+        session_factory=SessionLocal
+    ):
+        self.flush_turns = flush_turns
+        self.log_dir = log_dir
+        self.session_factory = session_factory
+        os.makedirs(log_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.pending_questions: Dict[int, Dict[str, Dict[str, Any]]] = {}  # questions awaiting an answer
+        self.buffers: Dict[int, List[Dict[str, Any]]] = {}  # answered turns awaiting a flush
+        self.row_ids: Dict[int, Dict[str, int]] = {}  # question key -> interview_questions.id
+        self._flush_locks: Dict[int, threading.Lock] = {}
+
+    def _log_path(self, interview_id: int) -> str:
+        return os.path.join(self.log_dir, f"interview_{interview_id}.jsonl")
+
+    def _append_log(self, interview_id: int, turn: Dict[str, Any]) -> None:
+        with open(self._log_path(interview_id), "a") as f:
+            f.write(json.dumps(turn) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def record_question(self, interview_id: int, question_obj: Dict[str, Any]) -> None:
+        """Remember a question sent to the candidate until its answer arrives"""
+        with self._lock:
+            self.pending_questions.setdefault(interview_id, {})[question_key(question_obj["id"])] = question_obj
+
+    def record_answer(self, interview_id: int, question_id, answer: str, question: Optional[str] = None) -> bool:
+        """
+        Record the candidate's answer to a question
+
+        Args:
+            interview_id: ID of the interview
+            question_id: ID of the question that was answered
+            answer: The candidate's answer
+            question: Question text, if it was not recorded with record_question
+
+        Returns:
+            True if enough turns are buffered that a flush is due
+        """
+        key = question_key(question_id)
+        with self._lock:
+            question_obj = self.pending_questions.get(interview_id, {}).pop(key, None)
+            if question_obj is None and question is None:
+                logger.warning(f"Answer for unknown question {key} in interview {interview_id}")
+                return False
+
+            follow_up_to = question_obj.get("follow_up_to") if question_obj else None
+            turn = {
+                "key": key,
+                "interview_id": interview_id,
+                "question": question_obj["question"] if question_obj else question,
+                "answer": answer,
+                "timestamp": datetime.now().isoformat(),
+                "follow_up_to": question_key(follow_up_to) if follow_up_to is not None else None
+            }
+            self._append_log(interview_id, turn)
+
+            buffer = self.buffers.setdefault(interview_id, [])
+            buffer.append(turn)
+            return len(buffer) >= self.flush_turns
+
+    def has_turns(self, interview_id: int) -> bool:
+        """Check whether any turns were recorded for an interview, in this buffer or in the database"""
+        with self._lock:
+            if self.buffers.get(interview_id) or self.row_ids.get(interview_id):
+                return True
+        db = self.session_factory()
+        try:
+            return bool(get_recorded_question_texts(db, interview_id))
+        finally:
+            db.close()
+
+    def merge_client_turns(self, interview_id: int, turns: List[Dict[str, Any]]) -> int:
+        """
+        Record the turns of the client's transcript copy that the server has not seen
+
+        The last answer is only sent with the completed interview, and turns can be lost
+        from memory by a restart, so each turn whose question was not recorded already (in
+        this buffer or in the database) is recorded as an answer.
+
+        Args:
+            interview_id: ID of the interview
+            turns: Client turns with "id", "question" and "answer"
+
+        Returns:
+            Number of turns recorded
+        """
+        with self._lock:
+            known_keys = set(self.row_ids.get(interview_id, {}))
+            known_keys.update(turn["key"] for turn in self.buffers.get(interview_id, []))
+            known_questions = {turn["question"] for turn in self.buffers.get(interview_id, [])}
+        db = self.session_factory()
+        try:
+            known_questions.update(get_recorded_question_texts(db, interview_id))
+        finally:
+            db.close()
+
+        recorded = 0
+        for turn in turns:
+            if question_key(turn.get("id")) in known_keys or turn["question"] in known_questions:
+                continue
+            if self.record_answer(interview_id, turn.get("id"), turn["answer"], question=turn["question"]):
+                self.flush(interview_id)
+            recorded += 1
+        return recorded
+
+    def _flush_lock(self, interview_id: int) -> threading.Lock:
+        with self._lock:
+            return self._flush_locks.setdefault(interview_id, threading.Lock())
+
+    def flush(self, interview_id: int) -> int:
+        """
+        Write the buffered turns of an interview in one transaction
+
+        The turns are copied under the lock and written to the database outside it, so
+        answers can be recorded while a flush is running.
+
+        Returns:
+            Number of rows written
+        """
+        # One flush per interview at a time, so row ids of earlier batches are known
+        with self._flush_lock(interview_id):
+            return self._flush_locked(interview_id)
+
+    def _flush_locked(self, interview_id: int) -> int:
+        # Caller holds the interview's flush lock
+        with self._lock:
+            turns = list(self.buffers.get(interview_id) or [])
+            known_ids = self.row_ids.get(interview_id)
+        if not turns:
+            return 0
+
+        db = self.session_factory()
+        try:
+            rows = [dict(turn, timestamp=datetime.fromisoformat(turn["timestamp"])) for turn in turns]
+            row_ids = bulk_create_interview_questions(db, rows, known_ids=known_ids)
+        except Exception as e:
+            # Keep the turns buffered and the replay log intact for the next attempt
+            logger.error(f"Error flushing transcript for interview {interview_id}: {e}")
+            return 0
+        finally:
+            db.close()
+
+        with self._lock:
+            self.row_ids[interview_id] = row_ids
+            # Turns recorded during the write stay buffered and in the replay log
+            remaining = self.buffers.get(interview_id, [])[len(turns):]
+            self.buffers[interview_id] = remaining
+            self._rewrite_log(interview_id, row_ids, remaining)
+        return len(turns)
+
+    def _rewrite_log(self, interview_id: int, row_ids: Dict[str, int], turns: List[Dict[str, Any]]) -> None:
+        # Caller holds the lock
+        log_path = self._log_path(interview_id)
+        tmp_path = log_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(json.dumps({"flushed": row_ids}) + "\n")
+            f.writelines(json.dumps(turn) + "\n" for turn in turns)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, log_path)
+
+    def complete(self, interview_id: int) -> int:
+        """Flush the remaining turns of a completed interview and release its state"""
+        # Held through the teardown, so a background flush never runs alongside it
+        with self._flush_lock(interview_id):
+            written = self._flush_locked(interview_id)
+            with self._lock:
+                if not self.buffers.get(interview_id):
+                    self.buffers.pop(interview_id, None)
+                    self.pending_questions.pop(interview_id, None)
+                    self.row_ids.pop(interview_id, None)
+                    self._flush_locks.pop(interview_id, None)
+                    log_path = self._log_path(interview_id)
+                    if os.path.exists(log_path):
+                        os.remove(log_path)
+        return written
+
+    def replay(self) -> int:
+        """
+        Persist turns left in replay logs by a crash, skipping rows that were already written
+
+        Returns:
+            Number of rows written
+        """
+        written = 0
+        for filename in os.listdir(self.log_dir):
+            if not (filename.startswith("interview_") and filename.endswith(".jsonl")):
+                continue
+            log_path = os.path.join(self.log_dir, filename)
+
+            db = self.session_factory()
+            try:
+                turns = []
+                known_ids = {}
+                with open(log_path, "r") as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            # A crash mid-append leaves a partial last line
+                            logger.warning(f"Skipping partial line in {log_path}")
+                            continue
+                        if "flushed" in record:
+                            # Rows of earlier batches, which replayed follow-ups may refer to
+                            known_ids = record["flushed"]
+                        else:
+                            turns.append(record)
+
+                rows = []
+                for turn in turns:
+                    row_id = find_interview_question_id(db, turn["interview_id"], turn["question"], turn["answer"])
+                    if row_id is None:
+                        rows.append(dict(turn, timestamp=datetime.fromisoformat(turn["timestamp"])))
+                    else:
+                        # Written before the crash but after the last log rewrite
+                        known_ids[turn["key"]] = row_id
+                if rows:
+                    bulk_create_interview_questions(db, rows, known_ids=known_ids)
+                    written += len(rows)
+                os.remove(log_path)
+            except Exception as e:
+                logger.error(f"Error replaying transcript log {log_path}: {e}")
+            finally:
+                db.close()
+
+        if written:
+            logger.info(f"Replayed {written} transcript turns from replay logs")
+        return written
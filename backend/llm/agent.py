@@ -10,11 +10,64 @@ import random
 import re
 
 from database.models import Interview, InterviewQuestion
-from .prompts import SYSTEM_PROMPT, INTERVIEW_PROMPT, FOLLOW_UP_PROMPT, EVALUATION_PROMPT
-from utils.resume_parser import extract_skills_from_resume
+from .prompts import (
+    SYSTEM_PROMPT, INTERVIEW_PROMPT, FOLLOW_UP_PROMPT, EVALUATION_PROMPT,
+    QUESTION_GENERATION_PROMPT, FOLLOW_UP_DECISION_PROMPT, FOLLOW_UP_QUESTION_PROMPT,
+    NEW_QUESTION_PROMPT, TRANSCRIPT_EVALUATION_PROMPT
+)
+from .context import InterviewContext, build_interview_context
 
 logger = logging.getLogger(__name__)
 
+# Question categories and templates of the structured question plan
+QUESTION_TEMPLATES = {
+    "Technical Skills": {
+        "weight": 0.4,
+        "templates": [
+            "Can you explain your experience with {skill}?",
+            "How would you approach a problem using {skill}?",
+            "What challenges have you faced with {skill} and how did you overcome them?"
+        ]
+    },
+    "Behavioral": {
+        "weight": 0.3,
+        "templates": [
+            "Tell me about a time you faced a difficult challenge at work and how you handled it.",
+            "Describe a situation where you had to work with a difficult team member.",
+            "Give an example of how you've handled a tight deadline."
+        ]
+    },
+    "Scenario-Based": {
+        "weight": 0.2,
+        "templates": [
+            "If you encountered [job-specific scenario], how would you handle it?",
+            "How would you approach [job-specific problem]?",
+            "What would you do if [job-specific situation] occurred?"
+        ]
+    },
+    "Company/Position": {
+        "weight": 0.1,
+        "templates": [
+            "What interests you about this position at our company?",
+            "How do you see yourself contributing to our team?",
+            "What do you know about our company's work in [relevant field]?"
+        ]
+    }
+}
+
+# Spoken when the interview ends
+CLOSING_MESSAGE = "Thank you for your time. This concludes our interview."
+
+def fixed_question_texts() -> List[str]:
+    """Question texts that are the same in every interview: templates asked verbatim and the closing message"""
+    texts = [
+        template
+        for config in QUESTION_TEMPLATES.values()
+        for template in config["templates"]
+        if "{" not in template and "[job-specific" not in template
+    ]
+    return texts + [CLOSING_MESSAGE]
+
 class LLMAgent:
     def __init__(self):
         # Initialize AWS Bedrock client
@@ -39,24 +92,66 @@ class LLMAgent:
         # Initialize conversation memories for each interview
         self.interview_memories = {}
         
+        # Compiled prompt contexts for each interview
+        self.interview_contexts = {}
+        
+        # Question plans and asked categories for each interview
+        self.interview_questions = {}
+        self.asked_questions = {}
+        
     def _get_interview_memory(self, interview_id: int) -> ConversationBufferMemory:
         """Get or create conversation memory for an interview"""
         if interview_id not in self.interview_memories:
             self.interview_memories[interview_id] = ConversationBufferMemory()
         return self.interview_memories[interview_id]
+    
+    def get_interview_context(self, interview: Interview) -> InterviewContext:
+        """Get or build the compiled prompt context for an interview"""
+        if interview.id not in self.interview_contexts:
+            self.interview_contexts[interview.id] = build_interview_context(interview)
+        return self.interview_contexts[interview.id]
+    
+    def build_question_plan(self, interview: Interview) -> Dict[str, Dict]:
+        """Build the full question plan for an interview, including LLM-generated questions"""
+        plan = self._prepare_structured_questions(interview)
+        
+        try:
+            tailored_questions = self.prepare_interview(interview)
+        except Exception as e:
+            logger.error(f"Error generating tailored questions for interview {interview.id}: {e}")
+            tailored_questions = list(interview.custom_questions or [])
+        
+        if tailored_questions:
+            plan["Tailored"] = {"questions": tailored_questions}
+        
+        return plan
+    
+    def has_question_plan(self, interview_id: int) -> bool:
+        """Check whether a question plan is already loaded for an interview"""
+        return interview_id in self.interview_questions
+    
+    def load_question_plan(self, interview_id: int, plan: Dict[str, Dict]) -> None:
+        """Load a stored question plan for an interview"""
+        self.interview_questions[interview_id] = {
+            category: {"questions": list(config.get("questions", []))}
+            for category, config in plan.items()
+        }
+    
+    def upcoming_questions(self, interview_id: int) -> List[str]:
+        """Questions that may be asked next from the plan of an interview (the next one of each category)"""
+        plan = self.interview_questions.get(interview_id, {})
+        return [config["questions"][0] for config in plan.values() if config.get("questions")]
+    
+    def get_token_savings(self, interview_id: int) -> Dict[str, Any]:
+        """Get the input tokens saved by the compiled prompt context of an interview"""
+        context = self.interview_contexts.get(interview_id)
+        return context.get_token_savings() if context else {}
         
     def prepare_interview(self, interview: Interview) -> List[str]:
         """Generate initial list of questions based on resume and job description"""
-        # Extract skills from resume
-        skills = extract_skills_from_resume(interview.resume_path)
-        
         # Prepare prompt for generating questions
-        prompt = INTERVIEW_PROMPT.format(
-            job_role=interview.job_role,
-            job_description=interview.job_description,
-            candidate_skills=", ".join(skills),
-            difficulty=interview.difficulty
-        )
+        context = self.get_interview_context(interview)
+        prompt = context.render(QUESTION_GENERATION_PROMPT)
         
         # Generate questions using LLM
         response = self.llm.invoke(prompt)
@@ -166,52 +261,16 @@ class LLMAgent:
                 return {
                     "interview_complete": True,
                     "id": next_id,
-                    "question": "Thank you for your time. This concludes our interview.",
+                    "question": CLOSING_MESSAGE,
                     "is_follow_up": False,
                     "follow_up_to": None
                 }
     def _prepare_structured_questions(self, interview: Interview) -> Dict[str, Dict]:
         """Prepare a structured set of questions by category"""
-        skills = extract_skills_from_resume(interview.resume_path)
-        
-        # Define question categories and templates
-        categories = {
-            "Technical Skills": {
-                "weight": 0.4,
-                "templates": [
-                    "Can you explain your experience with {skill}?",
-                    "How would you approach a problem using {skill}?",
-                    "What challenges have you faced with {skill} and how did you overcome them?"
-                ]
-            },
-            "Behavioral": {
-                "weight": 0.3,
-                "templates": [
-                    "Tell me about a time you faced a difficult challenge at work and how you handled it.",
-                    "Describe a situation where you had to work with a difficult team member.",
-                    "Give an example of how you've handled a tight deadline."
-                ]
-            },
-            "Scenario-Based": {
-                "weight": 0.2,
-                "templates": [
-                    "If you encountered [job-specific scenario], how would you handle it?",
-                    "How would you approach [job-specific problem]?",
-                    "What would you do if [job-specific situation] occurred?"
-                ]
-            },
-            "Company/Position": {
-                "weight": 0.1,
-                "templates": [
-                    "What interests you about this position at our company?",
-                    "How do you see yourself contributing to our team?",
-                    "What do you know about our company's work in [relevant field]?"
-                ]
-            }
-        }
+        skills = self.get_interview_context(interview).candidate_skills
         
         questions = {}
-        for category, config in categories.items():
+        for category, config in QUESTION_TEMPLATES.items():
             questions[category] = {"questions": []}
             
             # Generate questions for this category
@@ -239,100 +298,39 @@ class LLMAgent:
 
     def _should_ask_followup(self, question: str, answer: str, interview: Interview) -> bool:
         """Determine if a follow-up question is warranted"""
-        prompt = f"""
-        Analyze this interview exchange and determine if a follow-up question is needed.
-        
-        Job Role: {interview.job_role}
-        Job Description: {interview.job_description}
-        
-        Question: {question}
-        Answer: {answer}
-        
-        Should we ask a follow-up question? (YES/NO)
-        If YES, briefly explain why.
-        """
+        context = self.get_interview_context(interview)
+        prompt = context.render(FOLLOW_UP_DECISION_PROMPT, question=question, answer=answer)
         
         response = self.llm.invoke(prompt)
         return "YES" in response.upper()
 
     def _generate_followup_question(self, question: str, answer: str, interview: Interview) -> str:
         """Generate a relevant follow-up question"""
-        prompt = f"""
-        Based on this interview exchange, generate one relevant follow-up question.
-        
-        Job Role: {interview.job_role}
-        Job Description: {interview.job_description}
-        
-        Original Question: {question}
-        Candidate's Answer: {answer}
-        
-        Generate a follow-up question that:
-        1. Digs deeper into the candidate's response
-        2. Explores related aspects not covered
-        3. Is relevant to the job requirements
-        
-        Follow-up Question:
-        """
+        context = self.get_interview_context(interview)
+        prompt = context.render(FOLLOW_UP_QUESTION_PROMPT, question=question, answer=answer)
         return self.llm.invoke(prompt).strip()
 
     def _generate_new_question_based_on_context(self, interview: Interview, memory: ConversationBufferMemory) -> str:
         """Generate a new question based on conversation context"""
-        prompt = f"""
-        Generate one new interview question based on:
-        - Job requirements for {interview.job_role}
-        - The conversation so far
-        - Ensuring it's different from previous questions
-        
-        Job Description: {interview.job_description}
-        Conversation History: {memory.load_memory_variables({})}
-        
-        The question should:
-        1. Cover a new aspect not discussed yet
-        2. Be relevant to the position
-        3. Be open-ended to encourage detailed response
-        
-        New Question:
-        """
+        context = self.get_interview_context(interview)
+        prompt = context.render(NEW_QUESTION_PROMPT, history=memory.load_memory_variables({}))
         return self.llm.invoke(prompt).strip()
     def evaluate_interview(self, interview: Interview, questions_and_answers: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Evaluate the interview based on the questions and answers"""
         # Prepare the evaluation prompt
-        prompt = f"""
-        Evaluate this job interview for the position of {interview.job_role}.
-        
-        Job Description: {interview.job_description}
-        
-        Interview Transcript:
-        {json.dumps([{"Q": qa["question"], "A": qa["answer"]} for qa in questions_and_answers], indent=2)}
-        
-        Please provide:
-        1. A score from 0-100 where 100 is perfect
-        2. A decision: "Fit" or "Not Fit"
-        3. Detailed feedback with specific strengths and areas for improvement
-        4. List of 3-5 specific strengths
-        5. List of 3-5 specific areas for improvement
-        
-        Format your response like this:
-        SCORE: [0-100]
-        DECISION: [Fit/Not Fit]
-        
-        DETAILED FEEDBACK:
-        [Your comprehensive evaluation]
-        
-        STRENGTHS:
-        - [Strength 1]
-        - [Strength 2]
-        - [Strength 3]
-        
-        AREAS FOR IMPROVEMENT:
-        - [Area 1]
-        - [Area 2]
-        - [Area 3]
-        """
+        context = self.get_interview_context(interview)
+        transcript = json.dumps([{"Q": qa["question"], "A": qa["answer"]} for qa in questions_and_answers], indent=2)
+        prompt = context.render(TRANSCRIPT_EVALUATION_PROMPT, transcript=transcript)
         
         # Generate evaluation using LLM
         response = self.llm.invoke(prompt)
         
+        savings = context.get_token_savings()
+        logger.info(
+            f"Interview {interview.id}: saved ~{savings['tokens_saved']} input tokens "
+            f"across {savings['prompts']} prompts with the compiled job digest"
+        )
+        
         try:
             # Parse evaluation results
             result = {}
@@ -387,4 +385,5 @@ class LLMAgent:
     def clear_interview_memory(self, interview_id: int) -> None:
         """Clear the conversation memory for an interview"""
         if interview_id in self.interview_memories:
-            del self.interview_memories[interview_id]
\ No newline at end of file
+            del self.interview_memories[interview_id]
+        self.interview_contexts.pop(interview_id, None)
\ No newline at end of file
@@ -0,0 +1,125 @@
+# llm/context.py
+import re
+import logging
+from typing import List
+
+from database.models import Interview
+from utils.resume_parser import get_resume_skills
+from .prompts import CONTEXT_PREFIX_PROMPT
+
+logger = logging.getLogger(__name__)
+
+# Lines matching these patterns are boilerplate that does not help the model assess the candidate
+BOILERPLATE_PATTERNS = [
+    r"equal opportunity", r"\beeo\b", r"regardless of (?:race|gender|age)", r"disabilit",
+    r"benefits?\b", r"perks", r"paid time off", r"\bpto\b", r"health insurance", r"401\(?k\)?",
+    r"salary", r"compensation", r"how to apply", r"apply (?:now|today)", r"send your (?:cv|resume)",
+    r"about us", r"who we are", r"our mission", r"our culture", r"privacy (?:policy|notice)",
+    r"recruitment agenc", r"background check"
+]
+
+# Lines matching these patterns carry the actual requirements of the role
+REQUIREMENT_PATTERNS = [
+    r"experience", r"require", r"responsib", r"skill", r"knowledge", r"proficien", r"familiar",
+    r"must", r"should", r"years?\b", r"degree", r"ability to", r"understanding of", r"design",
+    r"build", r"develop", r"manage", r"lead"
+]
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (about four characters per token for English text)"""
+    return (len(text) + 3) // 4 if text else 0
+
+def condense_job_description(job_description: str, max_chars: int = 1200) -> str:
+    """
+    Condense a job description into a short digest of its requirements
+
+    Args:
+        job_description: Raw job description text
+        max_chars: Maximum length of the digest
+
+    Returns:
+        Digest containing the requirement lines of the job description
+    """
+    if not job_description:
+        return ""
+
+    lines = []
+    seen = set()
+    for raw_line in re.split(r"[\r\n]+|(?<=[.!?])\s+(?=[A-Z])", job_description):
+        line = re.sub(r"^\s*(?:[\-\*•]+|\d+[\.\)])?\s*", "", raw_line).strip()
+        key = line.lower()
+        # Skip empty lines, duplicates and section headings such as "Requirements:"
+        if len(line) < 4 or key in seen or (line.endswith(":") and len(line) < 40):
+            continue
+        seen.add(key)
+        if any(re.search(pattern, key) for pattern in BOILERPLATE_PATTERNS):
+            continue
+        lines.append(line)
+
+    # Requirement lines first, then whatever else fits, keeping the original order within each group
+    requirements = [line for line in lines if any(re.search(p, line.lower()) for p in REQUIREMENT_PATTERNS)]
+    others = [line for line in lines if line not in requirements]
+
+    digest_lines = []
+    length = 0
+    for line in requirements + others:
+        if length + len(line) + 3 > max_chars:
+            continue
+        digest_lines.append(f"- {line}")
+        length += len(line) + 3
+
+    if not digest_lines:
+        return job_description[:max_chars].strip()
+
+    return "\n".join(digest_lines)
+
+class InterviewContext:
+    """Prompt context compiled once per interview and shared by every prompt"""
+
+    def __init__(self, interview: Interview, job_digest: str, candidate_skills: List[str]):
+        self.interview_id = interview.id
+        self.job_role = interview.job_role
+        self.difficulty = interview.difficulty
+        self.job_digest = job_digest
+        self.candidate_skills = candidate_skills
+
+        # Stable prefix shared by every prompt so provider-side prompt caching can apply
+        self.prefix = CONTEXT_PREFIX_PROMPT.format(
+            job_role=self.job_role,
+            difficulty=self.difficulty,
+            job_digest=self.job_digest,
+            candidate_skills=", ".join(self.candidate_skills) or "Not specified"
+        ).strip()
+
+        # Token accounting against embedding the raw job description in every prompt
+        self.raw_job_description_tokens = estimate_tokens(interview.job_description)
+        self.digest_tokens = estimate_tokens(self.job_digest)
+        self.prompt_count = 0
+        self.tokens_saved = 0
+
+    def render(self, prompt_template: str, **kwargs) -> str:
+        """Render a prompt with the stable context prefix in front of the variable part"""
+        self.prompt_count += 1
+        self.tokens_saved += max(self.raw_job_description_tokens - self.digest_tokens, 0)
+        return f"{self.prefix}\n\n{prompt_template.format(**kwargs).strip()}"
+
+    def get_token_savings(self) -> dict:
+        """Return the input token savings for this interview"""
+        return {
+            "interview_id": self.interview_id,
+            "prompts": self.prompt_count,
+            "raw_job_description_tokens": self.raw_job_description_tokens,
+            "digest_tokens": self.digest_tokens,
+            "tokens_saved": self.tokens_saved
+        }
+
+def build_interview_context(interview: Interview) -> InterviewContext:
+    """Build the prompt context for an interview from its job description and resume"""
+    job_digest = condense_job_description(interview.job_description)
+    skills = get_resume_skills(interview.resume_path)
+    context = InterviewContext(interview, job_digest, skills)
+    logger.info(
+        f"Built prompt context for interview {interview.id}: "
+        f"{context.raw_job_description_tokens} -> {context.digest_tokens} job description tokens"
+    )
+    return context
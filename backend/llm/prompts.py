@@ -82,6 +82,107 @@ DETAILED FEEDBACK:
 [Your detailed evaluation]
 """
 
+# Stable context prefix shared by every prompt of an interview
+CONTEXT_PREFIX_PROMPT = """
+You are conducting a job interview for the position of {job_role}.
+Interview difficulty: {difficulty}
+
+Job Requirements:
+{job_digest}
+
+Candidate's Skills:
+{candidate_skills}
+"""
+
+# Prompt for generating initial interview questions from the compiled interview context
+QUESTION_GENERATION_PROMPT = """
+Based on the job requirements and candidate's skills above, generate 10 relevant interview questions.
+
+Remember to:
+1. Include technical questions relevant to the job role
+2. Ask about specific skills mentioned in the job requirements
+3. Include behavioral questions to assess soft skills
+4. Adjust the complexity based on the interview difficulty
+5. Format each question clearly and concisely
+
+Return ONLY the questions, one per line, without any additional text.
+"""
+
+# Prompt for deciding whether a follow-up question is warranted
+FOLLOW_UP_DECISION_PROMPT = """
+Analyze this interview exchange and determine if a follow-up question is needed.
+
+Question: {question}
+Answer: {answer}
+
+Should we ask a follow-up question? (YES/NO)
+If YES, briefly explain why.
+"""
+
+# Prompt for generating a follow-up question
+FOLLOW_UP_QUESTION_PROMPT = """
+Based on this interview exchange, generate one relevant follow-up question.
+
+Original Question: {question}
+Candidate's Answer: {answer}
+
+Generate a follow-up question that:
+1. Digs deeper into the candidate's response
+2. Explores related aspects not covered
+3. Is relevant to the job requirements
+
+Follow-up Question:
+"""
+
+# Prompt for generating a new question from the conversation so far
+NEW_QUESTION_PROMPT = """
+Generate one new interview question based on:
+- The job requirements above
+- The conversation so far
+- Ensuring it's different from previous questions
+
+Conversation History: {history}
+
+The question should:
+1. Cover a new aspect not discussed yet
+2. Be relevant to the position
+3. Be open-ended to encourage detailed response
+
+New Question:
+"""
+
+# Prompt for evaluating the full interview transcript
+TRANSCRIPT_EVALUATION_PROMPT = """
+Evaluate this job interview.
+
+Interview Transcript:
+{transcript}
+
+Please provide:
+1. A score from 0-100 where 100 is perfect
+2. A decision: "Fit" or "Not Fit"
+3. Detailed feedback with specific strengths and areas for improvement
+4. List of 3-5 specific strengths
+5. List of 3-5 specific areas for improvement
+
+Format your response like this:
+SCORE: [0-100]
+DECISION: [Fit/Not Fit]
+
+DETAILED FEEDBACK:
+[Your comprehensive evaluation]
+
+STRENGTHS:
+- [Strength 1]
+- [Strength 2]
+- [Strength 3]
+
+AREAS FOR IMPROVEMENT:
+- [Area 1]
+- [Area 2]
+- [Area 3]
+"""
+
 # Prompt for parsing resume
 RESUME_PARSING_PROMPT = """
 Extract the following information from the resume:
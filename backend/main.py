@@ -1,4 +1,4 @@
-from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, Form, status, Request, Response
+from fastapi import FastAPI, BackgroundTasks, Depends, HTTPException, UploadFile, File, Form, status, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
@@ -11,25 +11,46 @@ import shutil
 import os
 import uuid
 import json
+import asyncio
+import logging
 from pydantic import BaseModel
 from starlette.responses import RedirectResponse
+from starlette.requests import HTTPConnection
 
 # Import project modules
-from database.database import get_db, engine, Base
+from config import Config
+from database.database import get_db, engine, Base, SessionLocal, create_missing_indexes
+from database.query_counter import QueryCounter
+from database.transcript_buffer import TranscriptBuffer
+from database.search import create_search_index, search_interviews
+from database.analytics import create_analytics, get_hr_analytics
+from database.async_database import get_async_db, AsyncSessionLocal
+from database import async_crud
+from sqlalchemy.ext.asyncio import AsyncSession
 from database.models import User, Interview, InterviewResult
 from database.schema import UserCreate, UserLogin, InterviewCreate, InterviewUpdate, InterviewResultCreate
 from database.crud import (
     create_user, get_user_by_email, authenticate_user, create_interview,
     get_interviews_by_hr, get_interviews_by_candidate, get_interview,
-    update_interview_status, create_interview_result, get_interview_result
+    update_interview_status, transition_interview_status, create_interview_result, get_interview_result,
+    save_question_plan, get_question_plan, count_interviews_by_hr_status
 )
-from llm.agent import LLMAgent
+from llm.agent import LLMAgent, fixed_question_texts
 from utils.report_generator import generate_pdf_report
-from utils.voice_handling import set_up_sonic, process_audio
+from utils.video_processor import VideoProcessor
+from utils.voice_handling import (
+    set_up_sonic, process_audio, create_transcription_stream,
+    read_audio, transcribe_audio_bytes, archive_audio, tts_cache, prefetch_speech
+)
 from utils.resume_parser import parse_resume
+from utils.scheduler import WarmupScheduler, StatusSweeper
+from utils.recording_upload import RecordingUploadStore, UploadError
+from utils.interview_channel import InterviewChannel
+from utils.auth import TokenUser, create_access_token, decode_access_token, revoke_access_token
 
 from starlette.middleware.sessions import SessionMiddleware
 
+logger = logging.getLogger(__name__)
 
 # Initialize FastAPI app
 app = FastAPI(title="HireIQ API")
@@ -53,57 +74,109 @@ templates = Jinja2Templates(directory="../frontend/templates")
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+create_missing_indexes()
+create_search_index(engine)
+analytics_enabled = create_analytics(engine)
 
 # Set up OAuth2 password bearer
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 # Dependency to get current user
-# Replace the get_current_user dependency function in your FastAPI app
+def get_request_token(request: HTTPConnection) -> Optional[str]:
+    """
+    Get the auth token from the session, cookie or Authorization header.
+    Works for both HTTP requests and WebSocket connections.
+    """
+    token = request.session.get("auth_token") or request.cookies.get("auth_token")
+    if not token:
+        authorization = request.headers.get("Authorization", "")
+        if authorization.startswith("Bearer "):
+            token = authorization[len("Bearer "):]
+    return token
 
-async def get_current_user(
-    request: Request,
-    db: Session = Depends(get_db)
-):
+def get_websocket_user(websocket: WebSocket) -> Optional[TokenUser]:
     """
-    Get the current user from session or cookie.
+    Get the user of a WebSocket connection from its signed auth token.
     """
-    user_email = request.session.get("user_email")
-    if not user_email:
-        user_email = request.cookies.get("auth_token")
-        if not user_email:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Not authenticated"
-            )
-        # Add to session for future requests
-        request.session["user_email"] = user_email
+    token = get_request_token(websocket) or websocket.query_params.get("token")
+    return decode_access_token(token) if token else None
+
+async def get_current_user(request: Request):
+    """
+    Get the current user from the signed auth token.
+    The token carries the user id and type, so no database lookup is needed.
+    """
+    token = get_request_token(request)
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     
-    user = get_user_by_email(db, user_email)
+    user = decode_access_token(token)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials"
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Add to session for future requests
+    request.session["auth_token"] = token
     return user
-    
-    # Try with cookie last
-    auth_token = request.cookies.get("auth_token")
-    if auth_token:
-        user = get_user_by_email(db, auth_token)
-        if user:
-            return user
-    
-    # No authentication method worked
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Not authenticated",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
 
 # Initialize LLMAgent
 llm_agent = LLMAgent()
 
+# Warm interview resources ahead of their scheduled date
+warmup_scheduler = WarmupScheduler(llm_agent)
+
+# Expire and cancel stale interviews
+status_sweeper = StatusSweeper()
+
+# Write-behind persistence of interview transcripts
+transcript_buffer = TranscriptBuffer()
+
+# Resumable recording uploads
+recording_uploads = RecordingUploadStore()
+
+# Live interview channels by interview ID
+interview_channels = {}
+
+# Asked when the agent returns no question
+FALLBACK_QUESTION = "Could you tell me about your relevant experience for this position?"
+
+@app.on_event("startup")
+async def start_schedulers():
+    await asyncio.to_thread(transcript_buffer.replay)
+    # Questions asked verbatim in every interview are synthesised once, in the background
+    prefetch_speech(fixed_question_texts() + [FALLBACK_QUESTION])
+    warmup_scheduler.start()
+    status_sweeper.start()
+
+@app.on_event("shutdown")
+async def stop_schedulers():
+    await warmup_scheduler.stop()
+    await status_sweeper.stop()
+
+def generate_question_plan(interview_id: int):
+    """
+    Generate and store the question plan for an interview.
+    Runs in the background after the HR user creates the interview.
+    """
+    db = SessionLocal()
+    try:
+        interview = get_interview(db, interview_id)
+        if not interview:
+            return
+        plan = llm_agent.build_question_plan(interview)
+        save_question_plan(db, interview_id, plan)
+    except Exception as e:
+        logger.error(f"Error generating question plan for interview {interview_id}: {e}")
+    finally:
+        db.close()
+
 # Root endpoint
 @app.get("/", response_class=HTMLResponse)
 async def root(request: Request):
@@ -134,20 +207,21 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Set session variable
-    request.session["user_email"] = user.email
+    # Issue a signed token and keep it in the session
+    access_token = create_access_token(user)
+    request.session["auth_token"] = access_token
     
     # Set auth cookie directly in response
     response.set_cookie(
         key="auth_token",
-        value=user.email,
+        value=access_token,
         httponly=True,
         max_age=3600,
         path="/"
     )
     
     # Return token response
-    return {"access_token": user.email, "token_type": "bearer", "user_type": user.user_type}
+    return {"access_token": access_token, "token_type": "bearer", "user_type": user.user_type}
 
 @app.post("/login", response_class=HTMLResponse)
 async def login_form(
@@ -165,10 +239,11 @@ async def login_form(
         )
     
     # Set both session and cookie
-    request.session["user_email"] = user.email
+    access_token = create_access_token(user)
+    request.session["auth_token"] = access_token
     response.set_cookie(
         key="auth_token",
-        value=user.email,
+        value=access_token,
         httponly=True,
         max_age=3600,
         secure=False,  # Set to True in production with HTTPS
@@ -190,22 +265,20 @@ async def register_page(request: Request):
     return templates.TemplateResponse("register.html", {"request": request})
 
 @app.get("/dashboard")
-async def dashboard_redirect(request: Request, response: Response, db: Session = Depends(get_db)):
+async def dashboard_redirect(request: Request, response: Response):
     """
     Redirect to the appropriate dashboard based on user type.
     If not authenticated, redirect to login page.
     """
-    # Try to get user from session or cookie
-    user_email = request.session.get("user_email")
-    if not user_email:
-        user_email = request.cookies.get("auth_token")
+    # Try to get the auth token from session or cookie
+    token = get_request_token(request)
     
-    if not user_email:
+    if not token:
         # Not authenticated, redirect to login
         return RedirectResponse(url="/login", status_code=status.HTTP_303_SEE_OTHER)
     
-    # Get user from database
-    user = get_user_by_email(db, user_email)
+    # Verify the token
+    user = decode_access_token(token)
     if not user:
         # Invalid user, redirect to login
         return RedirectResponse(url="/login", status_code=status.HTTP_303_SEE_OTHER)
@@ -223,9 +296,11 @@ async def logout(request: Request, response: Response):
     Clear user session and cookie to log the user out.
     Redirect to login page.
     """
-    # Clear session
-    if "user_email" in request.session:
-        del request.session["user_email"]
+    # Revoke the token and clear session
+    token = get_request_token(request)
+    if token:
+        revoke_access_token(token)
+    request.session.pop("auth_token", None)
     
     # Clear auth cookie
     response = RedirectResponse(url="/login", status_code=status.HTTP_303_SEE_OTHER)
@@ -238,22 +313,34 @@ async def logout(request: Request, response: Response):
 async def hr_dashboard(
     request: Request, 
     message: str = None,
-    user: User = Depends(get_current_user), 
+    before: str = None,
+    user: TokenUser = Depends(get_current_user), 
     db: Session = Depends(get_db)
 ):
     if user.user_type != "HR":
         raise HTTPException(status_code=403, detail="Access denied")
     
-    interviews = get_interviews_by_hr(db, user.id)
-    return templates.TemplateResponse("hr_dashboard.html", {
-        "request": request, 
-        "user": user, 
-        "interviews": interviews,
-        "message": message
-    })
+    # Interviews page (with eager-loaded results) and stats from the materialised analytics
+    with QueryCounter(db, max_queries=3, strict=Config.QUERY_BUDGET_CHECKS):
+        interviews, next_cursor = get_interviews_by_hr(db, user.id, before=before)
+        if analytics_enabled:
+            analytics = get_hr_analytics(db, user.id)["overall"]
+            status_counts = analytics["status_counts"]
+        else:
+            analytics = None
+            status_counts = count_interviews_by_hr_status(db, user.id)
+        return templates.TemplateResponse("hr_dashboard.html", {
+            "request": request, 
+            "user": user, 
+            "interviews": interviews,
+            "status_counts": status_counts,
+            "analytics": analytics,
+            "next_cursor": next_cursor,
+            "message": message
+        })
 
 @app.get("/hr/create-interview", response_class=HTMLResponse)
-async def create_interview_page(request: Request, user: User = Depends(get_current_user)):
+async def create_interview_page(request: Request, user: TokenUser = Depends(get_current_user)):
     if user.user_type != "HR":
         raise HTTPException(status_code=403, detail="Access denied")
     
@@ -261,6 +348,7 @@ async def create_interview_page(request: Request, user: User = Depends(get_curre
 
 @app.post("/hr/create-interview")
 async def create_new_interview(
+    background_tasks: BackgroundTasks,
     candidate_name: str = Form(...),
     job_role: str = Form(...),
     difficulty: str = Form(...),
@@ -270,7 +358,7 @@ async def create_new_interview(
     job_description: str = Form(...),
     custom_questions: str = Form(None),
     candidate_email: str = Form(...),
-    user: User = Depends(get_current_user),
+    user: TokenUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     if user.user_type != "HR":
@@ -322,6 +410,10 @@ async def create_new_interview(
     )
     
     interview = create_interview(db, interview_data)
+    
+    # Prepare the question plan before the candidate joins
+    background_tasks.add_task(generate_question_plan, interview.id)
+    
     return RedirectResponse(
         url="/hr/dashboard?message=Interview created successfully",
         status_code=status.HTTP_303_SEE_OTHER
@@ -330,7 +422,7 @@ async def create_new_interview(
 @app.get("/hr/interview/{interview_id}/report")
 async def get_interview_report(
     interview_id: int,
-    user: User = Depends(get_current_user),
+    user: TokenUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     if user.user_type != "HR":
@@ -355,25 +447,69 @@ async def get_interview_report(
         filename=f"interview_report_{interview_id}.pdf"
     )
 
+@app.get("/hr/analytics")
+async def hr_analytics(
+    user: TokenUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Hiring analytics (pass rate, average score, time to complete) overall and per job role and difficulty.
+    Served from the incrementally maintained hiring_stats table.
+    """
+    if user.user_type != "HR":
+        raise HTTPException(status_code=403, detail="Access denied")
+    if not analytics_enabled:
+        raise HTTPException(status_code=503, detail="Analytics are not available for this database")
+    
+    return get_hr_analytics(db, user.id)
+
+@app.get("/hr/search")
+async def search_past_interviews(
+    q: str,
+    page: int = 1,
+    page_size: int = 20,
+    user: TokenUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Full-text search over answers, feedback and job descriptions of the HR user's interviews.
+    Results are ranked by relevance and include a highlighted snippet.
+    """
+    if user.user_type != "HR":
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    page = max(page, 1)
+    page_size = min(max(page_size, 1), 100)
+    results = search_interviews(db, user.id, q, limit=page_size, offset=(page - 1) * page_size)
+    return {"query": q, "page": page, "page_size": page_size, "results": results}
+
 # Candidate Dashboard endpoints
 @app.get("/candidate/dashboard", response_class=HTMLResponse)
-async def candidate_dashboard(request: Request, user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def candidate_dashboard(
+    request: Request,
+    before: str = None,
+    user: TokenUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     if user.user_type != "Candidate":
         raise HTTPException(status_code=403, detail="Access denied")
     
-    interviews = get_interviews_by_candidate(db, user.id)
-    return templates.TemplateResponse("candidate_dashboard.html", {
-        "request": request, 
-        "user": user, 
-        "interviews": interviews,
-        "now": datetime.now()  # Add this line
-    })
+    # Interviews page with the HR user joined in
+    with QueryCounter(db, max_queries=1, strict=Config.QUERY_BUDGET_CHECKS):
+        interviews, next_cursor = get_interviews_by_candidate(db, user.id, before=before)
+        return templates.TemplateResponse("candidate_dashboard.html", {
+            "request": request, 
+            "user": user, 
+            "interviews": interviews,
+            "next_cursor": next_cursor,
+            "now": datetime.now()  # Add this line
+        })
 
 @app.get("/candidate/interview/{interview_id}", response_class=HTMLResponse)
 async def interview_page(
     interview_id: int,
     request: Request,
-    user: User = Depends(get_current_user),
+    user: TokenUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     if user.user_type != "Candidate":
@@ -383,8 +519,19 @@ async def interview_page(
     if not interview or interview.candidate_id != user.id:
         raise HTTPException(status_code=404, detail="Interview not found")
     
-    # Update interview status
-    update_interview_status(db, interview_id, "in_progress")
+    # Update interview status (only scheduled -> in_progress); reopening a started interview is allowed
+    was_scheduled = interview.status == "scheduled"
+    if transition_interview_status(db, interview_id, "in_progress"):
+        # Record which resources were warm at start time
+        if was_scheduled:
+            warmup_scheduler.record_start(db, interview)
+    else:
+        db.refresh(interview)
+        if interview.status != "in_progress":
+            raise HTTPException(status_code=409, detail=f"Interview is {interview.status} and cannot be taken")
+    
+    # Compile the prompt context once at the start of the interview
+    llm_agent.get_interview_context(interview)
     
     return templates.TemplateResponse("interview.html", {"request": request, "user": user, "interview": interview})
 
@@ -392,7 +539,7 @@ async def interview_page(
 async def interview_complete(
     interview_id: int,
     request: Request,
-    user: User = Depends(get_current_user),
+    user: TokenUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     if user.user_type != "Candidate":
@@ -402,37 +549,39 @@ async def interview_complete(
     if not interview or interview.candidate_id != user.id:
         raise HTTPException(status_code=404, detail="Interview not found")
     
-    # Update interview status
-    update_interview_status(db, interview_id, "completed")
+    # Update interview status (only scheduled/in_progress -> completed)
+    if not transition_interview_status(db, interview_id, "completed"):
+        db.refresh(interview)
+        if interview.status != "completed":
+            raise HTTPException(status_code=409, detail=f"Interview is {interview.status} and cannot be completed")
     
     return templates.TemplateResponse("interview_results_candidate.html", {"request": request, "user": user})
 
 # Interview process endpoints
-@app.post("/interview/{interview_id}/question")
-async def get_next_question(
-    interview_id: int,
-    current_question_id: Optional[str] = Form(None),
-    answer: Optional[str] = Form(None),
-    user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
+def parse_question_id(current_question_id):
+    """Convert a question ID from the client to the appropriate type"""
+    if current_question_id is None or current_question_id == "":
+        return None
+    try:
+        # Try to convert to float first to handle potential decimal IDs
+        return float(current_question_id)
+    except (ValueError, TypeError):
+        # If conversion fails, use as is
+        return current_question_id
+
+def serve_next_question(interview: Interview, current_question_id=None, answer: Optional[str] = None):
     """
-    Get the next question from the LLM agent.
-    Returns a question object with id, question text, and other metadata.
+    Record the answered turn and get the next question from the LLM agent.
+    
+    Returns:
+        Tuple of the question object and whether a transcript flush is due
     """
-    interview = get_interview(db, interview_id)
-    if not interview:
-        raise HTTPException(status_code=404, detail="Interview not found")
+    question_id = parse_question_id(current_question_id)
     
-    # Convert question ID to the appropriate type
-    question_id = None
-    if current_question_id:
-        try:
-            # Try to convert to float first to handle potential decimal IDs
-            question_id = float(current_question_id)
-        except (ValueError, TypeError):
-            # If conversion fails, use as is
-            question_id = current_question_id
+    # Buffer the answered turn; the caller flushes every few turns
+    flush_due = False
+    if question_id is not None and answer:
+        flush_due = transcript_buffer.record_answer(interview.id, question_id, answer)
     
     # Get next question from LLM
     question_obj = llm_agent.get_next_question(interview, question_id, answer)
@@ -443,13 +592,64 @@ async def get_next_question(
     # Handle potential None response
     if question_obj is None:
         # Provide a fallback question
-        return {
+        question_obj = {
             "id": 1 if question_id is None else (int(float(question_id)) + 1 if isinstance(question_id, (float, int, str)) else 1),
-            "question": "Could you tell me about your relevant experience for this position?",
+            "question": FALLBACK_QUESTION,
             "is_follow_up": False,
             "follow_up_to": None
         }
     
+    # Point the client at synthesised audio when this question is already cached
+    audio_key = tts_cache.key(question_obj["question"])
+    if tts_cache.contains(audio_key):
+        question_obj["audio_url"] = f"/tts/{audio_key}"
+    
+    # Synthesise the candidates for the next question while the candidate answers this one
+    prefetch_speech(llm_agent.upcoming_questions(interview.id))
+    
+    transcript_buffer.record_question(interview.id, question_obj)
+    return question_obj, flush_due
+
+def transcribe_answer_audio(interview_id: int, audio_bytes) -> str:
+    """Transcribe the audio of an answer in memory, archiving it to disk in the background if enabled"""
+    if Config.ARCHIVE_ANSWER_AUDIO:
+        archive_audio(audio_bytes, f"uploads/audio/{interview_id}_{uuid.uuid4()}.wav")
+    
+    # Transcribe audio using AWS Bedrock Nova Sonic
+    return transcribe_audio_bytes(audio_bytes)
+
+async def load_question_plan(db: AsyncSession, interview_id: int):
+    """Load the stored question plan if this interview has not been served yet"""
+    if not llm_agent.has_question_plan(interview_id):
+        question_plan = await async_crud.get_question_plan(db, interview_id)
+        if question_plan:
+            llm_agent.load_question_plan(interview_id, question_plan.categories)
+
+@app.post("/interview/{interview_id}/question")
+async def get_next_question(
+    interview_id: int,
+    background_tasks: BackgroundTasks,
+    current_question_id: Optional[str] = Form(None),
+    answer: Optional[str] = Form(None),
+    user: TokenUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get the next question from the LLM agent.
+    Returns a question object with id, question text, and other metadata.
+    Live interviews use the /interview/{interview_id}/channel WebSocket instead.
+    """
+    interview = await async_crud.get_interview(db, interview_id)
+    if not interview:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    
+    await load_question_plan(db, interview_id)
+    
+    # Recording the turn fsyncs the replay log, so keep it off the event loop
+    question_obj, flush_due = await asyncio.to_thread(serve_next_question, interview, current_question_id, answer)
+    if flush_due:
+        background_tasks.add_task(transcript_buffer.flush, interview_id)
+    
     # Return the question object
     return question_obj
 
@@ -457,33 +657,148 @@ async def get_next_question(
 async def process_interview_audio(
     interview_id: int,
     audio_data: UploadFile = File(...),
-    user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user: TokenUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    interview = get_interview(db, interview_id)
+    interview = await async_crud.get_interview(db, interview_id)
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
     
-    # Process audio and transcribe
-    audio_path = f"uploads/audio/{interview_id}_{uuid.uuid4()}.wav"
-    os.makedirs("uploads/audio", exist_ok=True)
+    # Read the upload into one buffer and transcribe it without touching disk
+    audio_bytes = await asyncio.to_thread(read_audio, audio_data.file, audio_data.size)
+    transcription = await asyncio.to_thread(transcribe_answer_audio, interview_id, audio_bytes)
     
-    with open(audio_path, "wb") as buffer:
-        shutil.copyfileobj(audio_data.file, buffer)
+    return {"transcription": transcription}
+
+@app.websocket("/interview/{interview_id}/speech")
+async def stream_interview_speech(websocket: WebSocket, interview_id: int):
+    """
+    Streaming speech-to-text for the candidate's answers.
+    Binary messages are 16 kHz mono 16-bit PCM frames. The server sends
+    {"type": "partial", "transcript": ...} as audio is transcribed, and on a text message
+    {"type": "end"} replies {"type": "final", "transcript": ..., "placeholder": ...} and starts
+    a new answer. "placeholder" is true when the transcript is a stand-in from the local
+    development backend rather than recognised speech. A text message {"type": "start"}
+    discards any audio buffered since the last answer (avatar speech, silence).
+    """
+    user = get_websocket_user(websocket)
+    if not user:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
     
-    # Transcribe audio using AWS Bedrock Nova Sonic
-    transcription = process_audio(audio_path)
+    async with AsyncSessionLocal() as db:
+        interview = await async_crud.get_interview(db, interview_id)
+    if not interview or interview.candidate_id != user.id:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
     
-    return {"transcription": transcription}
+    await websocket.accept()
+    stream = create_transcription_stream()
+    last_partial = ""
+    
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            
+            if message.get("bytes") is not None:
+                stream.send_audio(message["bytes"])
+                partial = stream.partial()
+                if partial != last_partial:
+                    last_partial = partial
+                    await websocket.send_json({"type": "partial", "transcript": partial})
+            
+            elif message.get("text") is not None:
+                try:
+                    control = json.loads(message["text"])
+                except json.JSONDecodeError:
+                    await websocket.send_json({"error": "Invalid JSON"})
+                    continue
+                if not isinstance(control, dict):
+                    continue
+                if control.get("type") == "end":
+                    transcript = await asyncio.to_thread(stream.finish)
+                    await websocket.send_json({
+                        "type": "final",
+                        "transcript": transcript,
+                        "placeholder": Config.STT_BACKEND == "local"
+                    })
+                    stream = create_transcription_stream()
+                    last_partial = ""
+                elif control.get("type") == "start":
+                    stream = create_transcription_stream()
+                    last_partial = ""
+    except WebSocketDisconnect:
+        pass
+
+@app.websocket("/interview/{interview_id}/channel")
+async def interview_channel(websocket: WebSocket, interview_id: int):
+    """
+    Persistent channel for a live interview carrying questions, answers, transcription
+    requests, heartbeats and server-pushed events (see InterviewChannel for the protocol).
+    """
+    user = get_websocket_user(websocket)
+    if not user:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    async with AsyncSessionLocal() as db:
+        interview = await async_crud.get_interview(db, interview_id)
+        if not interview or interview.candidate_id != user.id:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+        await load_question_plan(db, interview_id)
+    
+    await websocket.accept()
+    channel = InterviewChannel(
+        websocket, interview,
+        next_question=serve_next_question,
+        transcribe=transcribe_answer_audio,
+        flush=transcript_buffer.flush
+    )
+    
+    # One live channel per interview: a reconnect replaces the previous connection
+    previous = interview_channels.get(interview_id)
+    interview_channels[interview_id] = channel
+    if previous:
+        await previous.close()
+    
+    try:
+        await channel.run()
+    finally:
+        if interview_channels.get(interview_id) is channel:
+            del interview_channels[interview_id]
+
+@app.get("/tts/{key}")
+async def get_tts_clip(
+    key: str,
+    request: Request,
+    user: TokenUser = Depends(get_current_user)
+):
+    """
+    Serve a cached speech clip by its content address.
+    Clips never change for a key, so the key is a strong ETag.
+    """
+    etag = f'"{key}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=31536000, immutable"}
+    if etag in [tag.strip() for tag in request.headers.get("If-None-Match", "").split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    audio_bytes = await asyncio.to_thread(tts_cache.get, key)
+    if audio_bytes is None:
+        raise HTTPException(status_code=404, detail="Clip not found")
+    
+    return Response(content=audio_bytes, media_type=tts_cache.media_type(key), headers=headers)
 
 @app.post("/interview/{interview_id}/save-recording")
 async def save_interview_recording(
     interview_id: int,
     video_data: UploadFile = File(...),
-    user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user: TokenUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    interview = get_interview(db, interview_id)
+    interview = await async_crud.get_interview(db, interview_id)
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
     
@@ -496,23 +811,226 @@ async def save_interview_recording(
     
     return {"message": "Recording saved successfully"}
 
+# Resumable recording upload endpoints
+async def get_candidate_interview(db: AsyncSession, interview_id: int, user: TokenUser) -> Interview:
+    """Load an interview of the current candidate, raising 404 for anyone else's"""
+    interview = await async_crud.get_interview(db, interview_id)
+    if not interview or interview.candidate_id != user.id:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    return interview
+
+def upload_error_response(error: UploadError) -> JSONResponse:
+    content = {"detail": error.detail}
+    if error.offset is not None:
+        content["offset"] = error.offset
+    return JSONResponse(status_code=error.status_code, content=content)
+
+@app.post("/interview/{interview_id}/recording-uploads")
+async def create_recording_upload(
+    interview_id: int,
+    total_size: Optional[int] = Form(None),
+    user: TokenUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Start a resumable recording upload.
+    Returns the upload ID and the maximum chunk size.
+    """
+    await get_candidate_interview(db, interview_id, user)
+    
+    try:
+        return await asyncio.to_thread(recording_uploads.create, interview_id, total_size)
+    except UploadError as e:
+        return upload_error_response(e)
+
+@app.get("/interview/{interview_id}/recording-uploads/{upload_id}")
+async def get_recording_upload(
+    interview_id: int,
+    upload_id: str,
+    user: TokenUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get the committed offset of a recording upload, to resume after a failure.
+    """
+    await get_candidate_interview(db, interview_id, user)
+    
+    try:
+        return await asyncio.to_thread(recording_uploads.get, interview_id, upload_id)
+    except UploadError as e:
+        return upload_error_response(e)
+
+@app.put("/interview/{interview_id}/recording-uploads/{upload_id}")
+async def upload_recording_chunk(
+    interview_id: int,
+    upload_id: str,
+    offset: int,
+    request: Request,
+    user: TokenUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Append a chunk (raw request body) at the given offset.
+    An optional X-Chunk-SHA256 header is verified before the chunk is committed.
+    """
+    await get_candidate_interview(db, interview_id, user)
+    
+    content_length = request.headers.get("Content-Length")
+    try:
+        new_offset = await recording_uploads.append_chunk(
+            interview_id,
+            upload_id,
+            offset,
+            request.stream(),
+            content_length=int(content_length) if content_length else None,
+            checksum=request.headers.get("X-Chunk-SHA256")
+        )
+    except UploadError as e:
+        return upload_error_response(e)
+    
+    return {"upload_id": upload_id, "offset": new_offset}
+
+@app.post("/interview/{interview_id}/recording-uploads/{upload_id}/finalize")
+async def finalize_recording_upload(
+    interview_id: int,
+    upload_id: str,
+    user: TokenUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Complete a recording upload and store it as the interview recording.
+    """
+    await get_candidate_interview(db, interview_id, user)
+    
+    try:
+        await recording_uploads.finalize(interview_id, upload_id)
+    except UploadError as e:
+        return upload_error_response(e)
+    
+    return {"message": "Recording saved successfully"}
+
+@app.websocket("/interview/{interview_id}/recording-stream")
+async def stream_interview_recording(websocket: WebSocket, interview_id: int):
+    """
+    Live recording ingestion.
+    The client connects with ?session=<id>, a recording session ID generated when recording starts.
+    Each binary message is a 4-byte big-endian sequence number followed by a MediaRecorder chunk.
+    The server replies {"ack": <last committed sequence>} so the client can drop acknowledged
+    chunks and resend from ack + 1. A text message {"type": "end"} finalizes the recording.
+    If the socket drops without "end", the recording is finalized when the interview has
+    already ended (e.g. the page was closed after completing it); otherwise it stays
+    resumable from its committed state for the client's reconnect.
+    """
+    user = get_websocket_user(websocket)
+    if not user:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    async with AsyncSessionLocal() as db:
+        interview = await async_crud.get_interview(db, interview_id)
+    if not interview or interview.candidate_id != user.id:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    video_processor = VideoProcessor(interview_id)
+    try:
+        video_processor.open_stream(websocket.query_params.get("session", ""))
+    except ValueError:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await websocket.accept()
+    
+    # Tell a reconnecting client where to resume
+    stream_state = await asyncio.to_thread(video_processor.get_stream_state)
+    await websocket.send_json({"ack": stream_state["last_sequence"]})
+    
+    finalized = False
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            
+            if message.get("bytes") is not None:
+                data = message["bytes"]
+                if len(data) < 4 or len(data) - 4 > Config.RECORDING_MAX_CHUNK_BYTES:
+                    await websocket.send_json({"error": "Invalid chunk"})
+                    continue
+                
+                sequence = int.from_bytes(data[:4], "big")
+                if stream_state["size"] + len(data) - 4 > Config.RECORDING_MAX_BYTES:
+                    await websocket.send_json({"error": "Recording exceeds its size limit"})
+                    break
+                
+                ack = await asyncio.to_thread(video_processor.append_stream_chunk, sequence, data[4:])
+                await websocket.send_json({"ack": ack})
+            
+            elif message.get("text") is not None:
+                try:
+                    control = json.loads(message["text"])
+                except json.JSONDecodeError:
+                    await websocket.send_json({"error": "Invalid JSON"})
+                    continue
+                if isinstance(control, dict) and control.get("type") == "end":
+                    video_path = await asyncio.to_thread(
+                        video_processor.finalize_stream, f"uploads/videos/{interview_id}.webm"
+                    )
+                    finalized = True
+                    await websocket.send_json({"finalized": bool(video_path)})
+                    break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if websocket.client_state.name == "CONNECTED":
+            await websocket.close()
+        if not finalized and stream_state["size"] > 0:
+            await finalize_abandoned_stream(video_processor, interview_id)
+
+async def finalize_abandoned_stream(video_processor: VideoProcessor, interview_id: int) -> None:
+    """Finalize a live recording whose socket closed without "end", once the interview is over"""
+    async with AsyncSessionLocal() as db:
+        interview = await async_crud.get_interview(db, interview_id)
+    if interview and interview.status == "in_progress":
+        logger.info(f"Recording stream of interview {interview_id} disconnected, keeping it resumable")
+        return
+    await asyncio.to_thread(video_processor.finalize_stream, f"uploads/videos/{interview_id}.webm")
+
 @app.post("/interview/{interview_id}/complete")
 async def complete_interview(
     interview_id: int,
     interview_data: str = Form(...),
-    user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user: TokenUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    interview = get_interview(db, interview_id)
+    interview = await async_crud.get_interview(db, interview_id)
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
     
-    # Update interview status
-    update_interview_status(db, interview_id, "completed")
+    # Update interview status (only scheduled/in_progress -> completed); a repeated request
+    # gets the existing result instead of scoring the interview again
+    if not await async_crud.transition_interview_status(db, interview_id, "completed"):
+        await db.refresh(interview)
+        if interview.status == "completed":
+            existing = await async_crud.get_interview_result(db, interview_id)
+            if existing:
+                return {"message": "Interview already completed", "result_id": existing.id}
+            raise HTTPException(status_code=409, detail="Interview is already being completed")
+        raise HTTPException(status_code=409, detail=f"Interview is {interview.status} and cannot be completed")
+    
+    # Let the live channel know, so the client stops sending turns
+    channel = interview_channels.get(interview_id)
+    if channel:
+        await channel.push({"event": "completed"})
     
     # Parse interview data
     data = json.loads(interview_data)
     
+    # Persist the transcript, adding the turns of the client's copy that never reached the
+    # server (always the last answer, which is only sent here)
+    await asyncio.to_thread(transcript_buffer.merge_client_turns, interview_id, data["questions"])
+    await asyncio.to_thread(transcript_buffer.complete, interview_id)
+    
     # Evaluate the interview using LLM agent
     if len(data["questions"]) > 0:
         # Use LLM to evaluate the interview
@@ -540,7 +1058,7 @@ async def complete_interview(
         notes=data.get("detailed_feedback", "")
     )
     
-    result = create_interview_result(db, result_data)
+    result = await async_crud.create_interview_result(db, result_data)
     return {"message": "Interview completed successfully", "result_id": result.id}
 
 if __name__ == "__main__":
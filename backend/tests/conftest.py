@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modules are imported relative to the backend directory, as when the app is run
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,71 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database import models
+from database.analytics import create_analytics, get_hr_analytics
+from database.database import Base
+
+@pytest.fixture(params=["UTC", "Asia/Tokyo", "America/New_York"])
+def local_timezone(request, monkeypatch):
+    monkeypatch.setenv("TZ", request.param)
+    time.tzset()
+    yield request.param
+    monkeypatch.undo()
+    time.tzset()
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    assert create_analytics(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+def add_interview(db, hr_id, candidate_id, scheduled_date, status="scheduled"):
+    interview = models.Interview(
+        hr_id=hr_id, candidate_id=candidate_id, candidate_name="Candidate", job_role="Engineer",
+        difficulty="Medium", scheduled_date=scheduled_date, duration=30, resume_path="resume.pdf",
+        job_description="Build things", status=status
+    )
+    db.add(interview)
+    db.commit()
+    return interview
+
+def test_completion_time_from_local_scheduled_start(db, local_timezone):
+    hr = models.User(name="HR", email="hr@example.com", hashed_password="x", user_type="HR")
+    candidate = models.User(name="Candidate", email="c@example.com", hashed_password="x", user_type="Candidate")
+    db.add_all([hr, candidate])
+    db.commit()
+
+    # Scheduled two hours ago in local time, completed now (created_at defaults to UTC)
+    interview = add_interview(db, hr.id, candidate.id, datetime.now() - timedelta(hours=2))
+    db.add(models.InterviewResult(interview_id=interview.id, score=80.0, decision="Fit", report_path="r.pdf"))
+    db.commit()
+
+    overall = get_hr_analytics(db, hr.id)["overall"]
+    assert overall["results_count"] == 1
+    assert overall["pass_rate"] == 1.0
+    assert overall["average_completion_hours"] == pytest.approx(2.0, abs=0.01)
+
+def test_status_counts_follow_updates(db):
+    hr = models.User(name="HR", email="hr@example.com", hashed_password="x", user_type="HR")
+    candidate = models.User(name="Candidate", email="c@example.com", hashed_password="x", user_type="Candidate")
+    db.add_all([hr, candidate])
+    db.commit()
+
+    interview = add_interview(db, hr.id, candidate.id, datetime.now())
+    add_interview(db, hr.id, candidate.id, datetime.now())
+    interview.status = "in_progress"
+    db.commit()
+
+    counts = get_hr_analytics(db, hr.id)["overall"]["status_counts"]
+    assert counts["scheduled"] == 1 and counts["in_progress"] == 1
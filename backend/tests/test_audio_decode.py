@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from utils.audio_decode import RESAMPLE_BLOCK_SAMPLES, resample, to_pcm16
+
+def tone(frequency, rate, seconds=3.0):
+    return np.sin(2 * np.pi * frequency * np.arange(int(rate * seconds)) / rate).astype(np.float32)
+
+@pytest.mark.parametrize("from_rate", [48000, 44100, 22050, 8000])
+def test_resampled_tone_matches_tone_at_target_rate(from_rate):
+    output = resample(tone(440, from_rate), from_rate, 16000)
+
+    assert output.dtype == np.float32
+    assert len(output) == 48000 > RESAMPLE_BLOCK_SAMPLES
+    # Away from the edges the output is the same tone sampled at 16 kHz, in phase
+    middle = slice(1000, -1000)
+    assert np.abs(output[middle] - tone(440, 16000)[middle]).max() < 1e-3
+
+@pytest.mark.parametrize("from_rate", [48000, 44100])
+def test_frequencies_above_target_nyquist_are_removed(from_rate):
+    output = resample(tone(10000, from_rate), from_rate, 16000)
+    assert np.sqrt(np.mean(output[1000:-1000] ** 2)) < 1e-3
+
+def test_same_rate_and_empty_input_pass_through():
+    samples = tone(440, 16000, 0.1)
+    assert resample(samples, 16000, 16000) is samples
+    assert len(resample(np.zeros(0, dtype=np.float32), 48000, 16000)) == 0
+
+def test_to_pcm16_clips():
+    assert to_pcm16(np.array([-2.0, -1.0, 0.0, 0.5, 1.0, 2.0])).tolist() == [-32767, -32767, 0, 16383, 32767, 32767]
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from utils.frame_metrics import (
+    ANOMALY_NONE, FRAME_METRICS_DTYPE, append_frame_metrics, attention_trend, find_key_moments,
+    load_frame_metrics, rolling_attention, summarize_frame_metrics, to_frame_metrics
+)
+
+def frame(timestamp, attention=0.5, faces=1, eyes=2, reason=None):
+    result = {
+        "timestamp": timestamp, "faces_detected": faces, "eye_contact": attention if faces else 0.0,
+        "attention_score": attention if faces else 0.0, "anomaly": reason is not None, "anomaly_reason": reason
+    }
+    if faces:
+        result["eyes_detected"] = eyes
+    return result
+
+def test_frame_results_become_metric_records():
+    metrics = to_frame_metrics([
+        frame(0.0),
+        {"error": "could not decode"},
+        frame(1.0, faces=0, reason="No face detected"),
+        frame(2.0, eyes=0, reason="Eyes not visible"),
+        frame(3.0, reason="Something new"),
+    ])
+
+    assert metrics.dtype == FRAME_METRICS_DTYPE
+    assert metrics["timestamp"].tolist() == [0.0, 1.0, 2.0, 3.0]
+    assert metrics["eyes"].tolist() == [2, -1, 0, 2]
+    assert metrics["anomaly"].tolist() == [ANOMALY_NONE, 1, 3, 255]
+    assert len(to_frame_metrics([])) == 0
+
+def test_metrics_file_round_trip_drops_partial_record(tmp_path):
+    path = str(tmp_path / "metrics.bin")
+    assert len(load_frame_metrics(path)) == 0
+
+    append_frame_metrics(path, to_frame_metrics([frame(0.0), frame(1.0)]))
+    with open(path, "ab") as f:
+        f.write(b"\x01\x02\x03")  # a record cut short by a crash
+    assert len(load_frame_metrics(path)) == 2
+
+    append_frame_metrics(path, to_frame_metrics([frame(2.0, attention=0.9)]))
+    metrics = load_frame_metrics(path)
+    assert metrics["timestamp"].tolist() == [0.0, 1.0, 2.0]
+    assert metrics["attention"][2] == pytest.approx(0.9)
+
+def test_summary_averages_frames_with_a_face():
+    metrics = to_frame_metrics([
+        frame(0.0, attention=0.4), frame(1.0, attention=0.8),
+        frame(2.0, faces=0, reason="No face detected"), frame(3.0, faces=2, attention=0.6, reason="Multiple faces detected"),
+    ])
+    summary = summarize_frame_metrics(metrics)
+
+    assert summary["average_attention"] == pytest.approx(0.6)
+    assert summary["average_eye_contact"] == pytest.approx(0.6)
+    assert summary["total_frames_analyzed"] == 4
+    assert summary["anomaly_frames"] == {"No face detected": 1, "Multiple faces detected": 1}
+
+def test_key_moments_in_frame_order():
+    metrics = to_frame_metrics([
+        frame(0.0, attention=0.9), frame(1.0, attention=0.2, reason="Eyes not visible"),
+        frame(2.0, attention=0.3), frame(3.0, attention=0.9),
+    ])
+    moments = find_key_moments(metrics, threshold=0.3)
+
+    assert [(m["timestamp"], m["type"]) for m in moments] == [
+        (1.0, "attention_change"), (1.0, "anomaly"), (3.0, "attention_change")
+    ]
+    assert (moments[0]["from"], moments[0]["to"]) == (0.9, 0.2)
+    assert moments[1]["reason"] == "Eyes not visible"
+
+def test_rolling_attention_matches_a_direct_window_mean():
+    rng = np.random.default_rng(1)
+    timestamps = np.cumsum(rng.uniform(0.2, 2.0, 200))
+    metrics = to_frame_metrics([frame(float(t), attention=float(a)) for t, a in zip(timestamps, rng.uniform(0, 1, 200))])
+    rolling = rolling_attention(metrics, 10.0)
+
+    attention = metrics["attention"].astype(np.float64)
+    expected = [attention[(timestamps >= t - 10.0) & (timestamps <= t)].mean() for t in timestamps]
+    assert np.allclose(rolling, expected)
+    assert len(rolling_attention(metrics[:0], 10.0)) == 0
+
+def test_attention_trend_skips_empty_windows():
+    metrics = to_frame_metrics([
+        frame(65.0, attention=0.2), frame(70.0, attention=0.4), frame(190.0, attention=0.9)
+    ])
+    assert attention_trend(metrics, 60) == [
+        {"start": 60.0, "end": 120.0, "average_attention": 0.3, "frames": 2},
+        {"start": 180.0, "end": 240.0, "average_attention": 0.9, "frames": 1},
+    ]
+    assert attention_trend(metrics[:0], 60) == []
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+from utils.interview_channel import InterviewChannel
+
+class FakeWebSocket:
+    """Client end of a WebSocket: the test feeds incoming messages and reads what was sent"""
+
+    def __init__(self):
+        self.incoming = asyncio.Queue()
+        self.sent = asyncio.Queue()
+        self.closed = False
+
+    def send_text(self, message):
+        self.incoming.put_nowait({"type": "websocket.receive", "text": json.dumps(message) if isinstance(message, dict) else message})
+
+    def send_bytes(self, data):
+        self.incoming.put_nowait({"type": "websocket.receive", "bytes": data})
+
+    def disconnect(self):
+        self.incoming.put_nowait({"type": "websocket.disconnect"})
+
+    async def receive(self):
+        return await self.incoming.get()
+
+    async def send_json(self, message):
+        await self.sent.put(message)
+
+    async def close(self):
+        self.closed = True
+
+    async def reply(self, timeout=2):
+        return await asyncio.wait_for(self.sent.get(), timeout)
+
+def make_channel(websocket, next_question=None, transcribe=None, flush=None, **kwargs):
+    return InterviewChannel(
+        websocket, SimpleNamespace(id=1),
+        next_question or (lambda interview, question_id, answer: ({"id": 1, "question": "Q"}, False)),
+        transcribe or (lambda interview_id, audio: f"{len(audio)} bytes"),
+        flush or (lambda interview_id: 0),
+        **dict(dict(heartbeat_seconds=60, idle_timeout_seconds=60), **kwargs)
+    )
+
+def run(test):
+    asyncio.run(asyncio.wait_for(test(), 5))
+
+def test_ping_and_malformed_messages():
+    async def test():
+        websocket = FakeWebSocket()
+        task = asyncio.create_task(make_channel(websocket).run())
+
+        websocket.send_text({"type": "ping"})
+        assert await websocket.reply() == {"type": "pong"}
+        websocket.send_text("{not json")
+        assert await websocket.reply() == {"type": "error", "detail": "Invalid JSON"}
+        websocket.send_text("[1, 2]")
+        assert await websocket.reply() == {"type": "error", "detail": "Expected a JSON object"}
+        websocket.send_bytes(b"audio")
+        assert await websocket.reply() == {"type": "error", "detail": "Expected a JSON message"}
+        websocket.send_text({"type": "dance", "request_id": 4})
+        assert await websocket.reply() == {"type": "error", "request_id": 4, "detail": "Unknown message type"}
+
+        websocket.disconnect()
+        await task
+    run(test)
+
+def test_requests_are_answered_in_order():
+    async def test():
+        websocket = FakeWebSocket()
+        asked = []
+        def next_question(interview, question_id, answer):
+            asked.append((question_id, answer))
+            return {"id": len(asked), "question": f"Q{len(asked)}"}, False
+        task = asyncio.create_task(make_channel(websocket, next_question).run())
+
+        websocket.send_text({"type": "next_question", "request_id": "a"})
+        websocket.send_text({"type": "transcribe", "request_id": "b"})
+        websocket.send_bytes(b"12345")
+        websocket.send_text({"type": "next_question", "request_id": "c", "current_question_id": 1, "answer": "yes"})
+
+        assert await websocket.reply() == {"type": "question", "request_id": "a", "question": {"id": 1, "question": "Q1"}}
+        assert await websocket.reply() == {"type": "transcription", "request_id": "b", "transcription": "5 bytes"}
+        assert await websocket.reply() == {"type": "question", "request_id": "c", "question": {"id": 2, "question": "Q2"}}
+        assert asked == [(None, None), (1, "yes")]
+
+        websocket.disconnect()
+        await task
+    run(test)
+
+def test_transcribe_without_audio_and_failed_requests():
+    async def test():
+        websocket = FakeWebSocket()
+        def next_question(interview, question_id, answer):
+            raise RuntimeError("model unavailable")
+        task = asyncio.create_task(make_channel(websocket, next_question).run())
+
+        websocket.send_text({"type": "transcribe", "request_id": 1})
+        websocket.send_text({"type": "ping"})
+        assert await websocket.reply() == {"type": "error", "request_id": 1, "detail": "Expected audio"}
+        websocket.send_text({"type": "next_question", "request_id": 2})
+        assert await websocket.reply() == {"type": "error", "request_id": 2, "detail": "Request failed"}
+
+        websocket.disconnect()
+        await task
+    run(test)
+
+def test_due_flush_completes_before_the_channel_closes():
+    async def test():
+        websocket = FakeWebSocket()
+        flushed = threading.Event()
+        def flush(interview_id):
+            time.sleep(0.1)
+            flushed.set()
+            return 1
+        channel = make_channel(websocket, lambda *args: ({"id": 1, "question": "Q"}, True), flush=flush)
+        task = asyncio.create_task(channel.run())
+
+        websocket.send_text({"type": "next_question", "request_id": 1})
+        assert (await websocket.reply())["type"] == "question"
+        websocket.disconnect()
+        await task
+        assert flushed.is_set()
+    run(test)
+
+def test_socket_is_not_read_while_requests_are_pending():
+    async def test():
+        websocket = FakeWebSocket()
+        release = threading.Event()
+        def next_question(interview, question_id, answer):
+            release.wait(5)
+            return {"id": 1, "question": "Q"}, False
+        task = asyncio.create_task(make_channel(websocket, next_question, max_pending=1).run())
+
+        for request_id in range(4):
+            websocket.send_text({"type": "next_question", "request_id": request_id})
+        await asyncio.sleep(0.2)
+        # One request being handled and one queued; the rest stay unread in the socket
+        assert websocket.incoming.qsize() == 1
+
+        release.set()
+        assert [(await websocket.reply())["request_id"] for _ in range(4)] == [0, 1, 2, 3]
+        websocket.disconnect()
+        await task
+    run(test)
+
+def test_idle_connection_is_closed_and_heartbeats_are_sent():
+    async def test():
+        websocket = FakeWebSocket()
+        channel = make_channel(websocket, heartbeat_seconds=0.05, idle_timeout_seconds=0.3)
+        task = asyncio.create_task(channel.run())
+
+        assert await websocket.reply() == {"type": "ping"}
+        await task
+        assert websocket.closed and channel.closed
+    run(test)
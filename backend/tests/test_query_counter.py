@@ -0,0 +1,75 @@
+import logging
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import crud, models
+from database.database import Base
+from database.query_counter import QueryCounter, QueryBudgetExceeded
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+@pytest.fixture
+def hr_id(db):
+    hr = models.User(name="HR", email="hr@example.com", hashed_password="x", user_type="HR")
+    candidate = models.User(name="Candidate", email="candidate@example.com", hashed_password="x", user_type="Candidate")
+    db.add_all([hr, candidate])
+    db.flush()
+
+    start = datetime(2026, 1, 5, 9, 0)
+    for day in range(5):
+        interview = models.Interview(
+            hr_id=hr.id,
+            candidate_id=candidate.id,
+            candidate_name="Candidate",
+            job_role="Engineer",
+            difficulty="Medium",
+            scheduled_date=start + timedelta(days=day),
+            duration=30,
+            resume_path="resume.pdf",
+            job_description="Build things",
+            status="completed"
+        )
+        db.add(interview)
+        db.flush()
+        db.add(models.InterviewResult(interview_id=interview.id, score=70.0, decision="Fit", report_path="report.pdf"))
+    db.commit()
+    hr_id = hr.id
+    db.expunge_all()
+    return hr_id
+
+def test_counts_eager_loaded_dashboard_query(db, hr_id):
+    with QueryCounter(db, max_queries=2) as counter:
+        interviews, _ = crud.get_interviews_by_hr(db, hr_id)
+        scores = [interview.results.score for interview in interviews]
+
+    assert len(scores) == 5
+    assert counter.count == 2  # interviews, then results in one selectin query
+
+def test_counts_lazy_loads(db, hr_id):
+    with pytest.raises(QueryBudgetExceeded):
+        with QueryCounter(db, max_queries=2) as counter:
+            interviews = db.query(models.Interview).filter(models.Interview.hr_id == hr_id).all()
+            [interview.results.score for interview in interviews]
+
+    # One query for the interviews and one lazy load per result
+    assert counter.count == 6
+
+def test_non_strict_budget_logs_instead_of_raising(db, hr_id, caplog):
+    with caplog.at_level(logging.WARNING, logger="database.query_counter"):
+        with QueryCounter(db, max_queries=0, strict=False) as counter:
+            crud.count_interviews_by_hr_status(db, hr_id)
+
+    assert counter.count == 1
+    assert "Expected at most 0 queries, got 1" in caplog.text
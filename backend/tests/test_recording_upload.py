@@ -0,0 +1,99 @@
+import asyncio
+import hashlib
+import os
+import time
+
+import pytest
+
+from utils.recording_upload import RecordingUploadStore, UploadError
+
+INTERVIEW_ID = 3
+
+@pytest.fixture
+def store(tmp_path):
+    return RecordingUploadStore(
+        upload_dir=str(tmp_path / "uploads"), video_dir=str(tmp_path),
+        max_bytes=100, max_chunk_bytes=40, expiry_seconds=3600
+    )
+
+async def body(*pieces):
+    for piece in pieces:
+        yield piece
+
+def append(store, upload_id, offset, *pieces, **kwargs):
+    return asyncio.run(store.append_chunk(INTERVIEW_ID, upload_id, offset, body(*pieces), **kwargs))
+
+def upload_error(call, *args, **kwargs) -> UploadError:
+    with pytest.raises(UploadError) as error:
+        call(*args, **kwargs)
+    return error.value
+
+def test_chunks_append_and_finalize(store, tmp_path):
+    upload_id = store.create(INTERVIEW_ID, total_size=30)["upload_id"]
+    assert append(store, upload_id, 0, b"a" * 10, b"b" * 10) == 20
+    assert append(store, upload_id, 20, b"c" * 10, checksum=hashlib.sha256(b"c" * 10).hexdigest()) == 30
+
+    path = asyncio.run(store.finalize(INTERVIEW_ID, upload_id))
+    assert path == str(tmp_path / f"{INTERVIEW_ID}.webm")
+    with open(path, "rb") as f:
+        assert f.read() == b"a" * 10 + b"b" * 10 + b"c" * 10
+    assert upload_error(store.get, INTERVIEW_ID, upload_id).status_code == 404
+
+def test_offset_conflict_reports_committed_offset(store):
+    upload_id = store.create(INTERVIEW_ID)["upload_id"]
+    append(store, upload_id, 0, b"a" * 10)
+
+    # A resent chunk and a chunk past the end are both rejected
+    for offset in (0, 15):
+        error = upload_error(append, store, upload_id, offset, b"a" * 5)
+        assert (error.status_code, error.offset) == (409, 10)
+    assert store.get(INTERVIEW_ID, upload_id)["offset"] == 10
+
+def test_checksum_mismatch_rolls_back(store):
+    upload_id = store.create(INTERVIEW_ID)["upload_id"]
+    append(store, upload_id, 0, b"a" * 10)
+
+    error = upload_error(append, store, upload_id, 10, b"b" * 10, checksum="0" * 64)
+    assert (error.status_code, error.offset) == (422, 10)
+    assert store.get(INTERVIEW_ID, upload_id)["offset"] == 10
+    assert append(store, upload_id, 10, b"b" * 10) == 20
+
+def test_size_limits(store):
+    upload_id = store.create(INTERVIEW_ID, total_size=50)["upload_id"]
+
+    # Declared sizes are rejected before reading, streamed bodies as soon as they cross a limit
+    assert upload_error(append, store, upload_id, 0, b"", content_length=41).status_code == 413
+    assert upload_error(append, store, upload_id, 0, b"a" * 30, b"a" * 30).status_code == 413
+    assert store.get(INTERVIEW_ID, upload_id)["offset"] == 0
+
+    append(store, upload_id, 0, b"a" * 40)
+    assert upload_error(append, store, upload_id, 40, b"a" * 20).status_code == 413
+    assert store.get(INTERVIEW_ID, upload_id)["offset"] == 40
+    assert upload_error(store.create, INTERVIEW_ID, total_size=101).status_code == 413
+
+def test_finalize_rejects_incomplete_upload(store):
+    upload_id = store.create(INTERVIEW_ID, total_size=20)["upload_id"]
+    append(store, upload_id, 0, b"a" * 10)
+
+    error = upload_error(asyncio.run, store.finalize(INTERVIEW_ID, upload_id))
+    assert (error.status_code, error.offset) == (409, 10)
+
+def test_other_interview_cannot_use_upload(store):
+    upload_id = store.create(INTERVIEW_ID)["upload_id"]
+    assert upload_error(store.get, INTERVIEW_ID + 1, upload_id).status_code == 404
+    with pytest.raises(UploadError):
+        asyncio.run(store.append_chunk(INTERVIEW_ID + 1, upload_id, 0, body(b"a")))
+
+def test_abandoned_uploads_expire(store):
+    stale_id = store.create(INTERVIEW_ID)["upload_id"]
+    active_id = store.create(INTERVIEW_ID)["upload_id"]
+    append(store, active_id, 0, b"a" * 10)
+
+    old = time.time() - 7200
+    for extension in (".json", ".part"):
+        os.utime(os.path.join(store.upload_dir, stale_id + extension), (old, old))
+
+    assert store.expire_stale() == 1
+    assert upload_error(store.get, INTERVIEW_ID, stale_id).status_code == 404
+    assert store.get(INTERVIEW_ID, active_id)["offset"] == 10
+    assert sorted(os.listdir(store.upload_dir)) == [f"{active_id}.json", f"{active_id}.part"]
@@ -0,0 +1,75 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database import models
+from database.database import Base
+from database.search import create_search_index, search_interviews
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    assert create_search_index(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+def add_answer(db, hr_id, answer):
+    candidate = models.User(name="Candidate", email=f"c{hr_id}@example.com", hashed_password="x", user_type="Candidate")
+    db.add(candidate)
+    db.commit()
+    interview = models.Interview(
+        hr_id=hr_id, candidate_id=candidate.id, candidate_name="Candidate", job_role="Engineer",
+        difficulty="Medium", scheduled_date=datetime.now(), duration=30, resume_path="resume.pdf",
+        job_description="Build services", status="completed"
+    )
+    db.add(interview)
+    db.commit()
+    db.add(models.InterviewQuestion(interview_id=interview.id, question="Tell me about a project.", answer=answer))
+    db.commit()
+    return interview
+
+def test_snippet_escapes_stored_markup(db):
+    hr = models.User(name="HR", email="hr@example.com", hashed_password="x", user_type="HR")
+    db.add(hr)
+    db.commit()
+    add_answer(db, hr.id, 'I used kafka <img src=x onerror="alert(1)"> & <mark>redis</mark>')
+
+    results = search_interviews(db, hr.id, "kafka")
+    assert len(results) == 1
+    snippet = results[0]["snippet"]
+    assert "<mark>kafka</mark>" in snippet
+    assert "<img" not in snippet and "&lt;img src=x onerror=&quot;alert(1)&quot;&gt;" in snippet
+    assert "&lt;mark&gt;redis&lt;/mark&gt;" in snippet and "&amp;" in snippet
+
+def test_search_is_scoped_to_the_hr_user(db):
+    hr = models.User(name="HR", email="hr@example.com", hashed_password="x", user_type="HR")
+    other = models.User(name="Other", email="other@example.com", hashed_password="x", user_type="HR")
+    db.add_all([hr, other])
+    db.commit()
+    add_answer(db, hr.id, "I built a kafka pipeline")
+
+    assert [result["source"] for result in search_interviews(db, hr.id, "kafka pipeline")] == ["answer"]
+    assert search_interviews(db, other.id, "kafka") == []
+    assert search_interviews(db, hr.id, '"') == []
+
+def test_reassigned_interview_moves_to_the_new_hr_user(db):
+    hr = models.User(name="HR", email="hr@example.com", hashed_password="x", user_type="HR")
+    other = models.User(name="Other", email="other@example.com", hashed_password="x", user_type="HR")
+    db.add_all([hr, other])
+    db.commit()
+    interview = add_answer(db, hr.id, "I built a kafka pipeline")
+
+    interview.hr_id = other.id
+    db.commit()
+    assert search_interviews(db, hr.id, "kafka") == []
+    assert len(search_interviews(db, other.id, "kafka")) == 1
+    # The owner token is not searchable as text
+    assert search_interviews(db, other.id, f"hr{other.id}") == []
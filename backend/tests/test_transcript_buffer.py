@@ -0,0 +1,141 @@
+import json
+import os
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from database import models
+from database.database import Base
+from database.transcript_buffer import TranscriptBuffer
+
+INTERVIEW_ID = 7
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+@pytest.fixture
+def make_buffer(session_factory, tmp_path):
+    def make(flush_turns=10):
+        return TranscriptBuffer(flush_turns=flush_turns, log_dir=str(tmp_path), session_factory=session_factory)
+    return make
+
+def ask_and_answer(buffer, question_id, answer, follow_up_to=None):
+    buffer.record_question(INTERVIEW_ID, {"id": question_id, "question": f"Q{question_id}", "follow_up_to": follow_up_to})
+    return buffer.record_answer(INTERVIEW_ID, question_id, answer)
+
+def stored_rows(session_factory):
+    db = session_factory()
+    try:
+        rows = db.query(models.InterviewQuestion).order_by(models.InterviewQuestion.id).all()
+        return {row.question: (row.id, row.answer, row.follow_up_to) for row in rows}
+    finally:
+        db.close()
+
+def test_flush_links_follow_ups_across_batches(make_buffer, session_factory, tmp_path):
+    buffer = make_buffer()
+    ask_and_answer(buffer, 1, "first")
+    assert buffer.flush(INTERVIEW_ID) == 1
+    ask_and_answer(buffer, 1.1, "follow-up", follow_up_to=1)
+    assert buffer.flush(INTERVIEW_ID) == 1
+
+    rows = stored_rows(session_factory)
+    assert rows["Q1.1"][2] == rows["Q1"][0]
+
+    # The log keeps only the row ids of flushed questions
+    with open(tmp_path / f"interview_{INTERVIEW_ID}.jsonl") as f:
+        records = [json.loads(line) for line in f]
+    assert records == [{"flushed": {"1.0": rows["Q1"][0], "1.1": rows["Q1.1"][0]}}]
+
+def test_flush_due_after_flush_turns(make_buffer):
+    buffer = make_buffer(flush_turns=2)
+    assert not ask_and_answer(buffer, 1, "a")
+    assert ask_and_answer(buffer, 2, "b")
+
+def test_replay_links_follow_up_to_question_flushed_earlier(make_buffer, session_factory, tmp_path):
+    buffer = make_buffer()
+    ask_and_answer(buffer, 1, "first")
+    buffer.flush(INTERVIEW_ID)
+    ask_and_answer(buffer, 1.1, "follow-up", follow_up_to=1)
+
+    # Restart with the follow-up only in the replay log
+    assert make_buffer().replay() == 1
+    rows = stored_rows(session_factory)
+    assert rows["Q1.1"][2] == rows["Q1"][0]
+    assert not os.path.exists(tmp_path / f"interview_{INTERVIEW_ID}.jsonl")
+
+def test_replay_skips_rows_already_written_and_partial_lines(make_buffer, session_factory, tmp_path):
+    buffer = make_buffer()
+    ask_and_answer(buffer, 1, "first")
+    ask_and_answer(buffer, 2, "second")
+    log_path = tmp_path / f"interview_{INTERVIEW_ID}.jsonl"
+    with open(log_path) as f:
+        log = f.read()
+    buffer.flush(INTERVIEW_ID)
+
+    # Crash after the database write, before the log was rewritten, and mid-append
+    with open(log_path, "w") as f:
+        f.write(log + '{"key": "3.0", "interview_id"')
+
+    assert make_buffer().replay() == 0
+    assert len(stored_rows(session_factory)) == 2
+
+def test_complete_flushes_and_releases_state(make_buffer, tmp_path):
+    buffer = make_buffer()
+    ask_and_answer(buffer, 1, "first")
+    assert buffer.complete(INTERVIEW_ID) == 1
+    assert buffer.buffers == {} and buffer.row_ids == {} and buffer._flush_locks == {}
+    assert not os.path.exists(tmp_path / f"interview_{INTERVIEW_ID}.jsonl")
+
+def test_complete_waits_for_running_flush(make_buffer):
+    buffer = make_buffer()
+    ask_and_answer(buffer, 1, "first")
+
+    flush_lock = buffer._flush_lock(INTERVIEW_ID)
+    flush_lock.acquire()
+    completer = threading.Thread(target=buffer.complete, args=(INTERVIEW_ID,))
+    completer.start()
+    completer.join(timeout=0.2)
+    assert completer.is_alive()
+    assert INTERVIEW_ID in buffer._flush_locks
+
+    flush_lock.release()
+    completer.join(timeout=5)
+    assert not completer.is_alive()
+    assert buffer._flush_locks == {}
+
+def test_merge_client_turns_adds_only_unseen_turns(make_buffer, session_factory):
+    buffer = make_buffer()
+    ask_and_answer(buffer, 1, "first")
+    buffer.flush(INTERVIEW_ID)
+    ask_and_answer(buffer, 2, "second")
+    buffer.record_question(INTERVIEW_ID, {"id": 3, "question": "Q3", "follow_up_to": None})
+
+    client_turns = [
+        {"id": 1, "question": "Q1", "answer": "first"},
+        {"id": 2, "question": "Q2", "answer": "second"},
+        {"id": 3, "question": "Q3", "answer": "last"},
+    ]
+    assert buffer.merge_client_turns(INTERVIEW_ID, client_turns) == 1
+    buffer.complete(INTERVIEW_ID)
+
+    rows = stored_rows(session_factory)
+    assert sorted(rows) == ["Q1", "Q2", "Q3"]
+    assert rows["Q3"][1] == "last"
+
+def test_turns_survive_restart(make_buffer, session_factory):
+    buffer = make_buffer()
+    ask_and_answer(buffer, 1, "first")
+    buffer.flush(INTERVIEW_ID)
+
+    # A restarted server only knows the turns from the database
+    restarted = make_buffer()
+    assert restarted.has_turns(INTERVIEW_ID)
+    assert restarted.merge_client_turns(INTERVIEW_ID, [{"id": 1, "question": "Q1", "answer": "first"}]) == 0
+    assert not make_buffer().has_turns(INTERVIEW_ID + 1)
@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import pytest
+
+from utils.tts_cache import TTSCache
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        yield pool
+
+def make_cache(tmp_path, synthesize=None, **kwargs):
+    synthesize = synthesize or (lambda text, voice, audio_format: text.encode("utf-8"))
+    return TTSCache(synthesize, cache_dir=str(tmp_path), voice="v", audio_format="wav", **kwargs)
+
+def test_prefetch_synthesises_each_missing_clip_once(tmp_path, executor):
+    calls = []
+    release = threading.Event()
+    def synthesize(text, voice, audio_format):
+        calls.append(text)
+        release.wait(5)
+        return text.encode("utf-8")
+    cache = make_cache(tmp_path, synthesize)
+    release.set()
+    cache.get_or_synthesize("cached")
+    calls.clear()
+    release.clear()
+
+    futures = cache.prefetch(["cached", "next", "next", " ", "later"], executor)
+    # Already queued clips are not queued again
+    assert cache.prefetch(["next"], executor) == []
+    release.set()
+    wait(futures)
+
+    assert sorted(calls) == ["later", "next"]
+    assert cache.contains(cache.key("next")) and cache.contains(cache.key("later"))
+    assert cache.prefetch(["next"], executor) == []
+
+def test_prefetch_survives_failed_synthesis(tmp_path, executor):
+    def synthesize(text, voice, audio_format):
+        raise RuntimeError("service unavailable")
+    cache = make_cache(tmp_path, synthesize)
+
+    wait(cache.prefetch(["question"], executor))
+    assert not cache.contains(cache.key("question"))
+    # A failed clip can be prefetched again
+    assert len(cache.prefetch(["question"], executor)) == 1
+
+def clip(size, fill=b"a"):
+    return fill * size
+
+def test_memory_lru_is_bounded_by_bytes(tmp_path):
+    cache = make_cache(tmp_path, max_memory_bytes=25)
+    keys = [cache.key(text) for text in "abc"]
+    for key in keys:
+        cache.put(key, clip(10))
+
+    # a was evicted from memory first; it is still served from disk
+    assert list(cache._memory) == keys[1:] and cache._memory_bytes == 20
+    assert cache.get(keys[0]) == clip(10)
+    assert cache.metrics["disk_hits"] == 1
+    assert list(cache._memory) == [keys[2], keys[0]]
+
+    # Clips larger than the memory budget are only kept on disk
+    big = cache.key("big")
+    cache.put(big, clip(30))
+    assert big not in cache._memory and cache.get(big) == clip(30)
+
+def test_disk_eviction_removes_least_recently_used_clip(tmp_path):
+    cache = make_cache(tmp_path, max_disk_bytes=30, max_memory_bytes=0)
+    a, b, c, d = (cache.key(text) for text in "abcd")
+    for key in (a, b, c):
+        cache.put(key, clip(10))
+    cache.get(a)  # a becomes the most recently used
+
+    cache.put(d, clip(10))
+    assert not cache.contains(b) and not (tmp_path / f"{b}.wav").exists()
+    assert all(cache.contains(key) for key in (a, c, d))
+    assert cache.metrics["evictions"] == 1
+    assert cache._disk_bytes == 30
+
+def test_index_is_rebuilt_from_disk_in_recency_order(tmp_path):
+    cache = make_cache(tmp_path, max_disk_bytes=30)
+    keys = [cache.key(text) for text in "abc"]
+    for age, key in zip((30, 10, 20), keys):
+        cache.put(key, clip(10))
+        path = tmp_path / f"{key}.wav"
+        os.utime(path, (time.time() - age, time.time() - age))
+    (tmp_path / "notes.txt").write_text("not a clip")
+
+    restarted = make_cache(tmp_path, max_disk_bytes=30)
+    assert list(restarted._disk) == [keys[0], keys[2], keys[1]]
+    assert restarted.media_type(keys[0]) == "audio/wav"
+
+def test_deleted_clip_is_a_miss(tmp_path):
+    cache = make_cache(tmp_path, max_memory_bytes=0)
+    key, _ = cache.get_or_synthesize("question")
+    os.remove(tmp_path / f"{key}.wav")
+
+    assert cache.get(key) is None
+    assert not cache.contains(key) and cache._disk_bytes == 0
+
+def test_concurrent_misses_synthesise_once(tmp_path):
+    calls = []
+    def synthesize(text, voice, audio_format):
+        calls.append(text)
+        time.sleep(0.05)
+        return b"audio"
+    cache = make_cache(tmp_path, synthesize)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: cache.get_or_synthesize("Tell me about yourself."), range(8)))
+
+    assert calls == ["Tell me about yourself."]
+    assert {data for _, data in results} == {b"audio"}
+    assert cache._synth_locks == {}
+
+def test_key_depends_on_text_voice_and_format(tmp_path):
+    cache = make_cache(tmp_path)
+    assert cache.key(" Hello ") == cache.key("Hello")
+    assert len({cache.key("Hello"), cache.key("Hello", voice="w"), cache.key("Hello", audio_format="mp3")}) == 3
@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+
+import pytest
+
+from config import Config
+from utils import video_processor as video_module
+from utils.video_processor import VideoProcessor, chunk_sequence
+
+INTERVIEW_ID = 5
+
+@pytest.fixture
+def processor(tmp_path):
+    return VideoProcessor(INTERVIEW_ID, storage_dir=str(tmp_path), face_tracking=False)
+
+def fake_outcome(duration, timestamps=()):
+    return {
+        "results": [{"timestamp": t, "faces_detected": 1, "eye_contact": 0.5, "attention_score": 0.5} for t in timestamps],
+        "anomalies": [],
+        "eye_contact_scores": [],
+        "attention_scores": [],
+        "sampling_stats": {},
+        "motion_stats": {},
+        "duration": duration
+    }
+
+def test_chunks_get_distinct_increasing_sequence_numbers(processor):
+    paths = []
+    def save(index):
+        paths.append(processor.save_video_chunk(bytes([index])))
+    threads = [threading.Thread(target=save, args=(index,)) for index in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    chunks = processor.list_video_chunks()
+    assert sorted(paths) == chunks
+    assert [chunk_sequence(path) for path in chunks] == list(range(16))
+
+def test_chunk_order_does_not_depend_on_name_sorting(processor):
+    for sequence in (2, 10, 1):
+        open(os.path.join(processor.interview_dir, f"chunk_{sequence}.webm"), "wb").close()
+    assert [chunk_sequence(path) for path in processor.list_video_chunks()] == [1, 2, 10]
+    assert processor.save_video_chunk(b"x").endswith("chunk_000011.webm")
+
+def test_recording_files_fall_back_to_finalized_recording_and_streams(processor, tmp_path):
+    assert processor.list_recording_files() == []
+
+    older, newer = (os.path.join(processor.interview_dir, f"stream_{name}.webm") for name in ("b", "a"))
+    for path, age in ((older, 60), (newer, 0)):
+        open(path, "wb").close()
+        os.utime(path, (time.time() - age, time.time() - age))
+    assert processor.list_recording_files() == [older, newer]
+
+    recording = tmp_path / f"{INTERVIEW_ID}.webm"
+    recording.write_bytes(b"x")
+    assert processor.list_recording_files() == [str(recording)]
+
+    chunk = processor.save_video_chunk(b"x")
+    assert processor.list_recording_files() == [chunk]
+
+def test_workers_get_the_parent_settings(processor, monkeypatch):
+    processor.save_video_chunk(b"x")
+    calls = []
+    def worker(interview_id, storage_dir, video_path, frame_interval, sample_fps, keyframes_only, face_tracking):
+        calls.append(face_tracking)
+        return fake_outcome(1.0)
+    monkeypatch.setattr(video_module, "_analyze_chunk_worker", worker)
+
+    processor.analyze_recording(max_workers=1)
+    assert calls == [False]
+
+    monkeypatch.setattr(Config, "VIDEO_MOTION_THRESHOLD", 7.5)
+    video_module._init_analysis_worker({"VIDEO_MOTION_THRESHOLD": 1.25})
+    assert Config.VIDEO_MOTION_THRESHOLD == 1.25
+
+def summary_state(processor):
+    return processor._load_summary_file()
+
+def test_reanalysing_a_chunk_keeps_its_offset(processor, monkeypatch):
+    first, second = processor.save_video_chunk(b"1"), processor.save_video_chunk(b"2")
+    monkeypatch.setattr(processor, "_analyze_frames", lambda path, *args: (
+        [{"timestamp": 0.5, "faces_detected": 1, "eye_contact": 0.5, "attention_score": 0.5}], 10.0
+    ))
+
+    assert [r["timestamp"] for r in processor.analyze_video_chunk(first)] == [0.5]
+    assert [r["timestamp"] for r in processor.analyze_video_chunk(second)] == [10.5]
+    assert [r["timestamp"] for r in processor.analyze_video_chunk(first)] == [0.5]
+
+    state = summary_state(processor)
+    assert state["media_offset"] == 20.0 and state["frames_logged"] == 2
+    assert state["chunk_offsets"] == {os.path.basename(first): [0.0, 10.0], os.path.basename(second): [10.0, 10.0]}
+    assert [frame["timestamp"] for frame in processor.iter_analysis_frames()] == [0.5, 10.5]
+
+def test_recording_analysis_only_analyses_new_chunks(processor, monkeypatch):
+    analysed = []
+    def worker(interview_id, storage_dir, video_path, *args):
+        analysed.append(os.path.basename(video_path))
+        return fake_outcome(4.0, [1.0])
+    monkeypatch.setattr(video_module, "_analyze_chunk_worker", worker)
+
+    processor.save_video_chunk(b"1")
+    processor.save_video_chunk(b"2")
+    assert [r["timestamp"] for r in processor.analyze_recording(max_workers=1)] == [1.0, 5.0]
+    assert processor.analyze_recording(max_workers=1) == []
+
+    processor.save_video_chunk(b"3")
+    assert [r["timestamp"] for r in processor.analyze_recording(max_workers=1)] == [9.0]
+    assert analysed == ["chunk_000000.webm", "chunk_000001.webm", "chunk_000002.webm"]
+    state = summary_state(processor)
+    assert state["media_offset"] == 12.0 and state["frames_logged"] == 3
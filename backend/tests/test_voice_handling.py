@@ -0,0 +1,190 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from config import Config
+from utils.voice_handling import (
+    TranscriptionStream, VoiceActivityDetector, create_transcription_stream, quietest_cut,
+    split_long_audio, stitch_transcripts
+)
+
+SAMPLE_RATE = 16000
+WORD_SECONDS = 0.4
+GAP_SECONDS = 0.15
+
+def spoken_words(count: int) -> np.ndarray:
+    """PCM in which word k is WORD_SECONDS of the constant sample value 1000 * k, separated by silence"""
+    gap = np.zeros(int(GAP_SECONDS * SAMPLE_RATE), dtype=np.int16)
+    parts = []
+    for k in range(1, count + 1):
+        parts += [np.full(int(WORD_SECONDS * SAMPLE_RATE), 1000 * k, dtype=np.int16), gap]
+    return np.concatenate(parts)
+
+def word_transcriber(pcm_bytes: bytes) -> str:
+    """Stand-in speech service: one word per run of non-silent samples, named by its value"""
+    samples = np.frombuffer(pcm_bytes, dtype=np.int16)
+    values = [samples[i] for i in range(len(samples)) if samples[i] and (i == 0 or samples[i - 1] != samples[i])]
+    return " ".join(f"w{value // 1000}" for value in values)
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+def feed(stream: TranscriptionStream, samples: np.ndarray, frame_samples: int = 4096) -> None:
+    for start in range(0, len(samples), frame_samples):
+        stream.send_audio(samples[start:start + frame_samples].tobytes())
+
+def test_segments_are_cut_in_pauses_and_cover_all_audio(executor):
+    audio = spoken_words(30)
+    segments = []
+    def record(pcm_bytes):
+        segments.append(np.frombuffer(pcm_bytes, dtype=np.int16))
+        return ""
+    stream = TranscriptionStream(record, executor, sample_rate=SAMPLE_RATE)
+    feed(stream, audio)
+    stream.finish()
+
+    overlap = int(Config.STT_SEGMENT_OVERLAP_SECONDS * SAMPLE_RATE)
+    assert len(segments) > 2
+    position = 0
+    for index, segment in enumerate(segments):
+        body = segment[overlap:] if index else segment
+        if index:
+            # Each segment repeats the end of the previous one
+            assert np.array_equal(segment[:overlap], audio[position - overlap:position])
+        assert np.array_equal(body, audio[position:position + len(body)])
+        position += len(body)
+        if index < len(segments) - 1:
+            # Cut in a pause, not inside a word
+            assert audio[position] == 0
+    assert position == len(audio)
+
+def test_transcript_is_stitched_across_segment_overlaps(executor):
+    stream = TranscriptionStream(word_transcriber, executor, sample_rate=SAMPLE_RATE)
+    feed(stream, spoken_words(30))
+    expected = " ".join(f"w{k}" for k in range(1, 31))
+
+    assert stream.finish() == expected
+    assert stream.partial() == expected
+
+def test_partial_is_empty_until_a_segment_is_complete(executor):
+    stream = TranscriptionStream(word_transcriber, executor, sample_rate=SAMPLE_RATE)
+    feed(stream, spoken_words(3))
+    assert stream.partial() == ""
+    assert stream.finish() == "w1 w2 w3"
+
+def test_local_stand_in_describes_the_audio(executor, monkeypatch):
+    monkeypatch.setattr(Config, "STT_BACKEND", "local")
+    stream = create_transcription_stream()
+    feed(stream, np.ones(2 * SAMPLE_RATE, dtype=np.int16))
+    assert stream.finish() == "[2.0s of speech]"
+
+def test_local_stand_in_covers_long_answers(executor, monkeypatch):
+    monkeypatch.setattr(Config, "STT_BACKEND", "local")
+    stream = create_transcription_stream()
+    audio = spoken_words(22)
+    feed(stream, audio)
+    transcript = stream.finish()
+
+    # One placeholder per segment; together they cover the answer plus the repeated overlaps
+    seconds = [float(value) for value in re.findall(r"\[(\d+\.\d)s of speech\]", transcript)]
+    assert len(seconds) > 1
+    overlaps = (len(seconds) - 1) * Config.STT_SEGMENT_OVERLAP_SECONDS
+    assert sum(seconds) == pytest.approx(len(audio) / SAMPLE_RATE + overlaps, abs=0.1 * len(seconds))
+
+def test_empty_answer_has_empty_transcript(executor, monkeypatch):
+    monkeypatch.setattr(Config, "STT_BACKEND", "local")
+    assert create_transcription_stream().finish() == ""
+
+VAD_FRAME = SAMPLE_RATE * 30 // 1000
+
+def frames_of(value, frames):
+    return np.full(frames * VAD_FRAME, value, dtype=np.int16)
+
+def speech(frames):
+    # Voiced sound well above the silence: a 200 Hz tone
+    t = np.arange(frames * VAD_FRAME) / SAMPLE_RATE
+    return (3000 * np.sin(2 * np.pi * 200 * t)).astype(np.int16)
+
+def make_vad(**kwargs):
+    return VoiceActivityDetector(**dict(dict(frame_ms=30, hangover_ms=0, keep_pause_ms=300, split_pause_ms=0), **kwargs))
+
+def test_vad_drops_edge_silence_and_shortens_pauses():
+    audio = np.concatenate([frames_of(0, 30), speech(20), frames_of(0, 40), speech(20), frames_of(0, 30)])
+    segments, stats = make_vad().process(audio.tobytes())
+
+    assert len(segments) == 1
+    # Both words kept whole, the 1.2 s pause shortened to 300 ms (10 frames)
+    assert len(segments[0]) == (20 + 10 + 20) * VAD_FRAME * 2
+    assert stats["bytes_removed"] == audio.nbytes - len(segments[0])
+    assert stats["seconds_removed"] == pytest.approx((30 + 30 + 30) * 0.03)
+
+def test_vad_splits_on_long_pauses():
+    audio = np.concatenate([frames_of(0, 5), speech(20), frames_of(0, 40), speech(10), frames_of(0, 5)])
+    segments, stats = make_vad(split_pause_ms=600).process(audio.tobytes())
+
+    assert [len(segment) // 2 // VAD_FRAME for segment in segments] == [20, 10]
+    assert stats["segments"] == 2
+
+def test_vad_hangover_keeps_word_edges():
+    audio = np.concatenate([frames_of(0, 30), speech(20), frames_of(0, 30)])
+    segments, _ = make_vad(hangover_ms=150).process(audio.tobytes())
+    assert len(segments[0]) == (5 + 20 + 5) * VAD_FRAME * 2
+
+def test_vad_keeps_quiet_unvoiced_sounds():
+    # Just below the energy threshold: kept with a high zero-crossing rate (a hiss), dropped without
+    quiet = 73
+    hiss = np.tile(np.array([quiet, -quiet], dtype=np.int16), 10 * VAD_FRAME // 2)
+    hum = frames_of(quiet, 10)
+    silence = frames_of(0, 30)
+    speech_flags = make_vad().speech_frames(np.concatenate([silence, hiss, silence, hum, silence]), VAD_FRAME)
+
+    assert speech_flags[30:40].all()
+    assert not speech_flags[70:80].any()
+
+def test_vad_of_silence_and_empty_audio():
+    assert make_vad().process(frames_of(0, 50).tobytes())[0] == []
+    assert make_vad().process(b"")[1]["output_bytes"] == 0
+
+def test_quietest_cut_finds_the_pause():
+    samples = np.full(SAMPLE_RATE, 1000, dtype=np.int16)
+    samples[9600:9920] = 0
+    assert quietest_cut(samples, 8000, 12000, 320) == 9600
+    # No room to search: cut at the target
+    assert quietest_cut(samples, 12000, 12000, 320) == 12000
+
+def test_split_long_audio_cuts_in_pauses_with_overlap():
+    audio = spoken_words(30)
+    chunks = [np.frombuffer(chunk, dtype=np.int16) for chunk in split_long_audio(
+        audio.tobytes(), SAMPLE_RATE, chunk_seconds=5, overlap_seconds=1, search_seconds=2
+    )]
+    overlap = SAMPLE_RATE
+
+    assert len(chunks) > 2
+    position = 0
+    for index, chunk in enumerate(chunks):
+        start = position - overlap if index else 0
+        assert np.array_equal(chunk, audio[start:start + len(chunk)])
+        position = start + len(chunk)
+        if index < len(chunks) - 1:
+            assert audio[position] == 0
+            assert len(chunk) - (overlap if index else 0) <= 5 * SAMPLE_RATE
+    assert position == len(audio)
+
+def test_split_long_audio_keeps_short_audio_whole():
+    pcm_bytes = spoken_words(5).tobytes()
+    assert split_long_audio(pcm_bytes, SAMPLE_RATE, chunk_seconds=5) == [pcm_bytes]
+
+def test_split_and_stitch_reproduce_the_words():
+    chunks = split_long_audio(spoken_words(30).tobytes(), SAMPLE_RATE, chunk_seconds=5, overlap_seconds=1, search_seconds=2)
+    assert stitch_transcripts([word_transcriber(chunk) for chunk in chunks]) == " ".join(f"w{k}" for k in range(1, 31))
+
+def test_stitch_ignores_case_and_punctuation_in_the_overlap():
+    assert stitch_transcripts(["So I moved the service to", "moved the Service, to Kafka.", ""]) == \
+        "So I moved the service to Kafka."
+    assert stitch_transcripts(["first part", "second part"]) == "first part second part"
+    # Overlaps longer than max_overlap_words are not searched for
+    assert stitch_transcripts(["a b c", "b c d"], max_overlap_words=1) == "a b c b c d"
@@ -0,0 +1,227 @@
+# backend/utils/audio_decode.py
+import atexit
+import io
+import logging
+import queue
+import subprocess
+import threading
+from functools import lru_cache
+from math import gcd
+from typing import Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from config import Config
+
+try:
+    import av
+except ImportError:
+    av = None
+
+logger = logging.getLogger(__name__)
+
+# Output samples computed per block when resampling, to bound the size of the tap matrix
+RESAMPLE_BLOCK_SAMPLES = 32768
+
+@lru_cache(maxsize=16)
+def _polyphase_filter(up: int, down: int, zero_crossings: int) -> np.ndarray:
+    """
+    Kaiser-windowed sinc low-pass filter split into its polyphase components
+
+    Returns:
+        Array of shape (up, taps_per_phase); row p holds the taps used for output phase p
+    """
+    # Odd length, so the filter delay is a whole number of upsampled samples
+    half_length = zero_crossings * max(up, down)
+    length = 2 * half_length + 1
+    cutoff = 0.95 / max(up, down)  # relative to the Nyquist rate of the upsampled signal
+    n = np.arange(length) - half_length
+    taps = cutoff * np.sinc(cutoff * n) * np.kaiser(length, 8.0) * up
+
+    taps_per_phase = -(-length // up)
+    taps = np.concatenate([taps, np.zeros(taps_per_phase * up - length)]).astype(np.float32)
+    return taps.reshape(taps_per_phase, up).T.copy()
+
+def resample(samples: np.ndarray, from_rate: int, to_rate: int, zero_crossings: int = 16) -> np.ndarray:
+    """
+    Polyphase resampling of mono float samples by the rational factor to_rate / from_rate
+
+    Each output sample is a dot product of a few input samples with one row of the
+    polyphase filter, computed in blocks with NumPy instead of upsampling with zeros.
+    """
+    if from_rate == to_rate or len(samples) == 0:
+        return samples.astype(np.float32, copy=False)
+
+    divisor = gcd(from_rate, to_rate)
+    up, down = to_rate // divisor, from_rate // divisor
+    phases = _polyphase_filter(up, down, zero_crossings)
+    taps_per_phase = phases.shape[1]
+
+    # Delay so output is centred on the filter, then pad so every tap lands inside the signal
+    delay = zero_crossings * max(up, down)
+    output_length = len(samples) * up // down
+    padded = np.concatenate([
+        np.zeros(taps_per_phase, dtype=np.float32),
+        samples.astype(np.float32, copy=False),
+        np.zeros(taps_per_phase, dtype=np.float32)
+    ])
+
+    if up == 1:
+        # Integer decimation (e.g. 48 kHz -> 16 kHz): filter once in C and keep every down-th sample
+        filtered = np.convolve(padded, phases[0])
+        return filtered[delay + taps_per_phase::down][:output_length].astype(np.float32, copy=False)
+
+    output = np.empty(output_length, dtype=np.float32)
+    offsets = np.arange(taps_per_phase)
+    for start in range(0, output_length, RESAMPLE_BLOCK_SAMPLES):
+        positions = np.arange(start, min(start + RESAMPLE_BLOCK_SAMPLES, output_length), dtype=np.int64) * down + delay
+        base = positions // up
+        phase = positions % up
+        # Input index for tap k of each output is base - k (shifted by the front padding)
+        indices = base[:, None] - offsets[None, :] + taps_per_phase
+        output[start:start + len(positions)] = np.einsum("ij,ij->i", padded[indices], phases[phase])
+    return output
+
+def to_pcm16(samples: np.ndarray) -> np.ndarray:
+    """Convert float samples in [-1, 1] to int16"""
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+
+class FfmpegPool:
+    """
+    Pre-started ffmpeg processes for codecs the in-process decoders cannot handle.
+
+    Each process waits on stdin for one input file and writes 16-bit mono PCM to stdout.
+    A replacement is started by a background refill thread as soon as one is taken, so
+    requests do not pay for process start-up.
+    """
+
+    def __init__(self, size: int = Config.FFMPEG_POOL_SIZE, sample_rate: int = Config.STT_SAMPLE_RATE, timeout_seconds: int = 60):
+        self.size = size
+        self.sample_rate = sample_rate
+        self.timeout_seconds = timeout_seconds
+        self._idle: queue.Queue = queue.Queue()
+        self._refills: queue.Queue = queue.Queue()
+        self._started = False
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def _spawn(self) -> subprocess.Popen:
+        return subprocess.Popen(
+            [
+                "ffmpeg", "-loglevel", "error", "-i", "pipe:0",
+                "-f", "s16le", "-acodec", "pcm_s16le", "-ar", str(self.sample_rate), "-ac", "1", "pipe:1"
+            ],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+
+    def _refill(self) -> None:
+        try:
+            self._idle.put(self._spawn())
+        except OSError as e:
+            logger.error(f"Error starting ffmpeg worker: {e}")
+
+    def _refill_loop(self) -> None:
+        """Start one replacement worker per request until the pool is closed"""
+        while self._refills.get():
+            if self._closed:
+                return
+            self._refill()
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if not self._started:
+                self._started = True
+                for _ in range(self.size):
+                    self._refill()
+                threading.Thread(target=self._refill_loop, name="ffmpeg-pool-refill", daemon=True).start()
+                atexit.register(self.close)
+
+    def decode(self, audio_bytes) -> np.ndarray:
+        """
+        Decode audio with an idle ffmpeg worker
+
+        Returns:
+            int16 mono samples at the pool's sample rate
+        """
+        self._ensure_started()
+        try:
+            process = self._idle.get_nowait()
+        except queue.Empty:
+            process = self._spawn()
+        self._refills.put(True)
+
+        try:
+            stdout, stderr = process.communicate(input=bytes(audio_bytes), timeout=self.timeout_seconds)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            raise
+        if process.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed: {stderr.decode(errors='replace').strip()}")
+        return np.frombuffer(stdout, dtype=np.int16)
+
+    def close(self) -> None:
+        """Stop the refill thread and the idle workers"""
+        self._closed = True
+        self._refills.put(False)
+        while True:
+            try:
+                process = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            process.kill()
+            process.wait()
+
+ffmpeg_pool = FfmpegPool()
+
+def _decode_soundfile(audio_bytes) -> Tuple[np.ndarray, int]:
+    samples, sample_rate = sf.read(io.BytesIO(audio_bytes), dtype="float32", always_2d=True)
+    return samples.mean(axis=1), sample_rate
+
+def _decode_av(audio_bytes) -> Tuple[np.ndarray, int]:
+    with av.open(io.BytesIO(audio_bytes)) as container:
+        stream = container.streams.audio[0]
+        # Decode to planar float so each frame is a (channels, samples) array
+        resampler = av.AudioResampler(format="fltp", layout=stream.layout.name, rate=stream.rate)
+        chunks = []
+        for frame in container.decode(stream):
+            for resampled in resampler.resample(frame):
+                chunks.append(resampled.to_ndarray())
+        for resampled in resampler.resample(None):
+            chunks.append(resampled.to_ndarray())
+    if not chunks:
+        return np.zeros(0, dtype=np.float32), stream.rate
+    return np.concatenate(chunks, axis=1).mean(axis=0), stream.rate
+
+def decode_audio(audio_bytes, sample_rate: int = Config.STT_SAMPLE_RATE) -> Optional[np.ndarray]:
+    """
+    Decode an audio file to mono 16-bit PCM at the given sample rate, in process where possible
+
+    WAV/FLAC/Ogg are decoded with soundfile, other containers (e.g. WebM/Opus from the browser)
+    with PyAV if installed; both are downmixed and resampled with NumPy. Anything else goes to
+    the ffmpeg worker pool.
+
+    Args:
+        audio_bytes: Contents of the audio file
+        sample_rate: Output sample rate
+
+    Returns:
+        int16 samples, or None if the audio could not be decoded
+    """
+    # soundfile is expected to reject compressed browser formats, so its failures are only debug output
+    decoders = [(_decode_soundfile, logging.DEBUG)] + ([(_decode_av, logging.WARNING)] if av is not None else [])
+    for decoder, level in decoders:
+        try:
+            samples, source_rate = decoder(audio_bytes)
+            return to_pcm16(resample(samples, source_rate, sample_rate))
+        except Exception as e:
+            logger.log(level, f"{decoder.__name__} could not decode audio, falling back: {e}")
+
+    try:
+        if ffmpeg_pool.sample_rate == sample_rate:
+            return ffmpeg_pool.decode(audio_bytes)
+        samples = ffmpeg_pool.decode(audio_bytes).astype(np.float32) / 32768.0
+        return to_pcm16(resample(samples, ffmpeg_pool.sample_rate, sample_rate))
+    except Exception as e:
+        logger.error(f"Error decoding audio: {e}")
+        return None
@@ -0,0 +1,90 @@
+# backend/utils/auth.py
+import uuid
+import time
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from jose import jwt, JWTError
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Revoked token IDs mapped to their expiry time, kept only until the token would have expired anyway.
+# The size is bounded by the tokens revoked within one token lifetime; past this many, expired
+# entries are pruned and a warning is logged.
+MAX_REVOKED_TOKENS = 10000
+revoked_tokens: Dict[str, float] = {}
+
+class TokenUser:
+    """Authenticated user reconstructed from a signed token, without a database lookup"""
+
+    def __init__(self, id: int, email: str, name: str, user_type: str):
+        self.id = id
+        self.email = email
+        self.name = name
+        self.user_type = user_type
+
+def create_access_token(user, expires_minutes: int = Config.ACCESS_TOKEN_EXPIRE_MINUTES) -> str:
+    """
+    Create a signed, expiring access token for a user
+
+    Args:
+        user: User the token is issued for
+        expires_minutes: Lifetime of the token in minutes
+
+    Returns:
+        Encoded token
+    """
+    payload = {
+        "sub": str(user.id),
+        "email": user.email,
+        "name": user.name,
+        "user_type": user.user_type,
+        "jti": uuid.uuid4().hex,
+        "exp": datetime.utcnow() + timedelta(minutes=expires_minutes)
+    }
+    return jwt.encode(payload, Config.SECRET_KEY, algorithm=Config.ALGORITHM)
+
+def decode_access_token(token: str) -> Optional[TokenUser]:
+    """
+    Verify a token and return the user it carries
+
+    Args:
+        token: Encoded token
+
+    Returns:
+        TokenUser if the token is valid, unexpired and not revoked, otherwise None
+    """
+    try:
+        payload = jwt.decode(token, Config.SECRET_KEY, algorithms=[Config.ALGORITHM])
+    except JWTError:
+        return None
+
+    if payload.get("jti") in revoked_tokens:
+        return None
+
+    return TokenUser(
+        id=int(payload["sub"]),
+        email=payload.get("email"),
+        name=payload.get("name"),
+        user_type=payload.get("user_type")
+    )
+
+def revoke_access_token(token: str) -> None:
+    """Revoke a token until it expires"""
+    try:
+        payload = jwt.decode(token, Config.SECRET_KEY, algorithms=[Config.ALGORITHM])
+    except JWTError:
+        return
+
+    now = time.time()
+    if len(revoked_tokens) >= MAX_REVOKED_TOKENS:
+        # Drop entries for tokens that have expired since they were revoked. Unexpired entries
+        # are never dropped, as that would make a logged-out token valid again.
+        for jti in [jti for jti, expires_at in revoked_tokens.items() if expires_at <= now]:
+            del revoked_tokens[jti]
+        if len(revoked_tokens) >= MAX_REVOKED_TOKENS:
+            logger.warning(f"Revocation cache holds {len(revoked_tokens)} unexpired tokens, above the expected {MAX_REVOKED_TOKENS}")
+
+    revoked_tokens[payload["jti"]] = float(payload["exp"])
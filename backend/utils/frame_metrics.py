@@ -0,0 +1,176 @@
+# backend/utils/frame_metrics.py
+import os
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+
+# One record per analysed frame, stored back to back in a raw little-endian file
+FRAME_METRICS_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("faces", "<u2"),
+    ("eyes", "<i2"),  # -1 when no face was found, so eyes were not searched
+    ("eye_contact", "<f4"),
+    ("attention", "<f4"),
+    ("anomaly", "u1"),
+])
+
+# Anomaly codes; the last reason recorded for a frame is the one stored
+ANOMALY_NONE = 0
+ANOMALY_REASONS = {
+    1: "No face detected",
+    2: "Multiple faces detected",
+    3: "Eyes not visible",
+    255: "Unknown anomaly",
+}
+ANOMALY_CODES = {reason: code for code, reason in ANOMALY_REASONS.items()}
+
+def to_frame_metrics(results: Iterable[Dict[str, Any]]) -> np.ndarray:
+    """
+    Convert frame analysis results to metric records
+
+    Args:
+        results: Frame results from VideoProcessor.analyze_video_frame; results without a
+            timestamp (analysis errors) are skipped
+
+    Returns:
+        Structured array with FRAME_METRICS_DTYPE
+    """
+    rows = [
+        (
+            result["timestamp"],
+            result.get("faces_detected", 0),
+            result.get("eyes_detected", -1),
+            result.get("eye_contact", 0.0),
+            result.get("attention_score", 0.0),
+            ANOMALY_CODES.get(result.get("anomaly_reason"), 255) if result.get("anomaly") else ANOMALY_NONE,
+        )
+        for result in results
+        if "timestamp" in result
+    ]
+    return np.array(rows, dtype=FRAME_METRICS_DTYPE)
+
+def append_frame_metrics(path: str, metrics: np.ndarray) -> None:
+    """
+    Append metric records to a metrics file
+
+    A record cut short by a crash mid-write is truncated away first, so the new records
+    stay aligned to the record size.
+    """
+    if len(metrics):
+        with open(path, 'ab') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size % FRAME_METRICS_DTYPE.itemsize:
+                f.truncate(size - size % FRAME_METRICS_DTYPE.itemsize)
+            f.write(np.ascontiguousarray(metrics, dtype=FRAME_METRICS_DTYPE).tobytes())
+
+def load_frame_metrics(path: str) -> np.ndarray:
+    """
+    Memory-map a metrics file
+
+    Returns:
+        Read-only structured array of the complete records in the file (a record cut short
+        by a crash mid-write is ignored)
+    """
+    count = os.path.getsize(path) // FRAME_METRICS_DTYPE.itemsize if os.path.exists(path) else 0
+    if count == 0:
+        return np.zeros(0, dtype=FRAME_METRICS_DTYPE)
+    return np.memmap(path, dtype=FRAME_METRICS_DTYPE, mode='r', shape=(count,))
+
+def summarize_frame_metrics(metrics: np.ndarray) -> Dict[str, Any]:
+    """
+    Summary statistics of the analysed frames
+
+    Eye contact and attention are averaged over frames in which a face was found, as they
+    are not scored otherwise.
+
+    Returns:
+        Dictionary with averages, frame count and the number of frames per anomaly reason
+    """
+    with_face = metrics["faces"] > 0
+    face_frames = int(np.count_nonzero(with_face))
+    codes, counts = np.unique(metrics["anomaly"][metrics["anomaly"] != ANOMALY_NONE], return_counts=True)
+    return {
+        "average_eye_contact": float(metrics["eye_contact"][with_face].sum(dtype=np.float64)) / max(face_frames, 1),
+        "average_attention": float(metrics["attention"][with_face].sum(dtype=np.float64)) / max(face_frames, 1),
+        "total_frames_analyzed": int(len(metrics)),
+        "anomaly_frames": {ANOMALY_REASONS[int(code)]: int(count) for code, count in zip(codes, counts)},
+    }
+
+def find_key_moments(metrics: np.ndarray, threshold: float = 0.3) -> List[Dict[str, Any]]:
+    """
+    Attention changes larger than the threshold between consecutive frames, and anomalies
+
+    Returns:
+        List of key moments in frame order; for a frame with both, the attention change comes first
+    """
+    attention = metrics["attention"].astype(np.float64)
+    changes = np.flatnonzero(np.abs(np.diff(attention)) > threshold) + 1
+    anomalies = np.flatnonzero(metrics["anomaly"] != ANOMALY_NONE)
+
+    # Merge both kinds in frame order with a single sort
+    order = np.concatenate([changes * 2, anomalies * 2 + 1])
+    order.sort()
+
+    timestamps = metrics["timestamp"]
+    codes = metrics["anomaly"]
+    key_moments = []
+    for entry in order.tolist():
+        index = entry >> 1
+        if entry & 1:
+            reason = ANOMALY_REASONS.get(int(codes[index]), "Unknown anomaly")
+            key_moments.append({
+                "timestamp": float(timestamps[index]),
+                "type": "anomaly",
+                "reason": reason,
+                "description": f"Anomaly detected: {reason}"
+            })
+        else:
+            key_moments.append({
+                "timestamp": float(timestamps[index]),
+                "type": "attention_change",
+                "from": round(float(attention[index - 1]), 4),
+                "to": round(float(attention[index]), 4),
+                "description": "Significant change in candidate attention"
+            })
+    return key_moments
+
+def rolling_attention(metrics: np.ndarray, window_seconds: float) -> np.ndarray:
+    """
+    Rolling mean of attention over the preceding window of media time, for every frame
+
+    Frames must be in timestamp order, as they are in the metrics file.
+
+    Returns:
+        float64 array aligned with the frames
+    """
+    if len(metrics) == 0:
+        return np.zeros(0)
+    timestamps = metrics["timestamp"]
+    totals = np.concatenate([[0.0], np.cumsum(metrics["attention"], dtype=np.float64)])
+    ends = np.arange(1, len(metrics) + 1)
+    starts = np.searchsorted(timestamps, timestamps - window_seconds, side='left')
+    return (totals[ends] - totals[starts]) / (ends - starts)
+
+def attention_trend(metrics: np.ndarray, window_seconds: float) -> List[Dict[str, float]]:
+    """
+    Average attention per fixed window of media time
+
+    Returns:
+        List of {"start", "end", "average_attention", "frames"} for windows containing frames
+    """
+    if len(metrics) == 0:
+        return []
+    windows = (metrics["timestamp"] // window_seconds).astype(np.int64)
+    windows -= windows.min()
+    frames = np.bincount(windows)
+    totals = np.bincount(windows, weights=metrics["attention"])
+    origin = float(metrics["timestamp"].min() // window_seconds) * window_seconds
+    return [
+        {
+            "start": origin + window * window_seconds,
+            "end": origin + (window + 1) * window_seconds,
+            "average_attention": round(float(totals[window] / frames[window]), 4),
+            "frames": int(frames[window])
+        }
+        for window in np.flatnonzero(frames).tolist()
+    ]
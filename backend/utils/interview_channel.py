@@ -0,0 +1,176 @@
+# backend/utils/interview_channel.py
+import asyncio
+import json
+import logging
+from typing import Dict, Any, Callable, Optional, Tuple
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from config import Config
+from database.models import Interview
+
+logger = logging.getLogger(__name__)
+
+class InterviewChannel:
+    """
+    Persistent WebSocket session for a live interview.
+
+    The connection is authenticated once and keeps the loaded Interview for its lifetime.
+    Client messages are JSON text frames:
+        {"type": "next_question", "request_id": ..., "current_question_id": ..., "answer": ...}
+        {"type": "transcribe", "request_id": ...} followed by one binary frame with the audio
+        {"type": "ping"}
+    Server messages:
+        {"type": "question", "request_id": ..., "question": {...}}
+        {"type": "transcription", "request_id": ..., "transcription": "..."}
+        {"type": "pong"} / {"type": "ping"} (heartbeat)
+        {"type": "error", "request_id": ..., "detail": "..."}
+        {"type": "event", ...} for events pushed by the server
+
+    Requests are handled one at a time in order. Both the request and the outgoing message
+    queues are bounded: when the client sends faster than turns are processed, the channel
+    stops reading from the socket, and when the client reads slowly, work stops producing.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        interview: Interview,
+        next_question: Callable[[Interview, Any, Optional[str]], Tuple[Dict[str, Any], bool]],
+        transcribe: Callable[[int, bytes], str],
+        flush: Callable[[int], int],
+        max_pending: int = Config.CHANNEL_MAX_PENDING,
+        heartbeat_seconds: int = Config.CHANNEL_HEARTBEAT_SECONDS,
+        idle_timeout_seconds: int = Config.CHANNEL_IDLE_TIMEOUT_SECONDS
+    ):
+        self.websocket = websocket
+        self.interview = interview
+        self.next_question = next_question
+        self.transcribe = transcribe
+        self.flush = flush
+        self.heartbeat_seconds = heartbeat_seconds
+        self.idle_timeout_seconds = idle_timeout_seconds
+
+        self._requests: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._outgoing: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._flushes = set()
+        self.closed = False
+
+    async def push(self, event: Dict[str, Any]) -> None:
+        """Push a server event to the client, giving up if the client is not reading"""
+        try:
+            await asyncio.wait_for(self.send(dict(event, type="event")), self.heartbeat_seconds)
+        except asyncio.TimeoutError:
+            logger.warning(f"Dropped event {event} for interview {self.interview.id}: client is not reading")
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        """Queue a message for the client, waiting while the outgoing queue is full"""
+        if not self.closed:
+            await self._outgoing.put(message)
+
+    async def close(self) -> None:
+        """Close the connection, e.g. when a newer connection for the interview replaces it"""
+        if not self.closed:
+            self.closed = True
+            await self.websocket.close()
+
+    async def run(self) -> None:
+        """Serve the connection until the client disconnects or goes idle"""
+        tasks = [
+            asyncio.create_task(self._send_loop()),
+            asyncio.create_task(self._work_loop()),
+            asyncio.create_task(self._heartbeat_loop()),
+        ]
+        try:
+            await self._receive_loop()
+        except (WebSocketDisconnect, RuntimeError):
+            # RuntimeError: the socket was closed by close() while a receive was pending
+            pass
+        finally:
+            self.closed = True
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            # Persist whatever was buffered during this connection
+            if self._flushes:
+                await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    async def _receive_loop(self) -> None:
+        while not self.closed:
+            try:
+                message = await asyncio.wait_for(self.websocket.receive(), self.idle_timeout_seconds)
+            except asyncio.TimeoutError:
+                logger.info(f"Closing idle channel for interview {self.interview.id}")
+                await self.close()
+                return
+
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("text") is None:
+                await self.send({"type": "error", "detail": "Expected a JSON message"})
+                continue
+
+            try:
+                request = json.loads(message["text"])
+            except json.JSONDecodeError:
+                await self.send({"type": "error", "detail": "Invalid JSON"})
+                continue
+            if not isinstance(request, dict):
+                await self.send({"type": "error", "detail": "Expected a JSON object"})
+                continue
+
+            request_type = request.get("type")
+            if request_type == "ping":
+                await self.send({"type": "pong"})
+            elif request_type == "pong":
+                continue
+            elif request_type == "transcribe":
+                # The audio follows as a single binary frame
+                audio = await self.websocket.receive()
+                if audio["type"] == "websocket.disconnect":
+                    return
+                if audio.get("bytes") is None:
+                    await self.send({"type": "error", "request_id": request.get("request_id"), "detail": "Expected audio"})
+                    continue
+                await self._requests.put(dict(request, audio=audio["bytes"]))
+            elif request_type == "next_question":
+                await self._requests.put(request)
+            else:
+                await self.send({"type": "error", "request_id": request.get("request_id"), "detail": "Unknown message type"})
+
+    async def _work_loop(self) -> None:
+        while True:
+            request = await self._requests.get()
+            request_id = request.get("request_id")
+            try:
+                if request["type"] == "next_question":
+                    question_obj, flush_due = await asyncio.to_thread(
+                        self.next_question, self.interview, request.get("current_question_id"), request.get("answer")
+                    )
+                    if flush_due:
+                        self._flush_in_background()
+                    await self.send({"type": "question", "request_id": request_id, "question": question_obj})
+                else:
+                    transcription = await asyncio.to_thread(self.transcribe, self.interview.id, request["audio"])
+                    await self.send({"type": "transcription", "request_id": request_id, "transcription": transcription})
+            except Exception as e:
+                logger.error(f"Error handling {request['type']} for interview {self.interview.id}: {e}")
+                await self.send({"type": "error", "request_id": request_id, "detail": "Request failed"})
+
+    def _flush_in_background(self) -> None:
+        task = asyncio.create_task(asyncio.to_thread(self.flush, self.interview.id))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _send_loop(self) -> None:
+        while True:
+            message = await self._outgoing.get()
+            await self.websocket.send_json(message)
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            # Skip the heartbeat rather than wait behind a full queue
+            if not self._outgoing.full():
+                self._outgoing.put_nowait({"type": "ping"})
@@ -0,0 +1,215 @@
+# backend/utils/recording_upload.py
+import os
+import json
+import asyncio
+import uuid
+import hashlib
+import logging
+import time
+from typing import Dict, Any, Optional, AsyncIterator
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class UploadError(Exception):
+    """Raised when a chunk cannot be accepted"""
+
+    def __init__(self, status_code: int, detail: str, offset: Optional[int] = None):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.offset = offset
+
+class RecordingUploadStore:
+    """
+    Resumable chunked uploads for interview recordings.
+
+    Each upload session is a partial file plus a small JSON sidecar on disk, so sessions
+    survive restarts. The committed offset is the size of the partial file.
+    """
+
+    def __init__(
+        self,
+        upload_dir: str = str(Config.VIDEO_DIR / "uploads"),
+        video_dir: str = str(Config.VIDEO_DIR),
+        max_bytes: int = Config.RECORDING_MAX_BYTES,
+        max_chunk_bytes: int = Config.RECORDING_MAX_CHUNK_BYTES,
+        expiry_seconds: int = Config.RECORDING_UPLOAD_EXPIRY_HOURS * 3600
+    ):
+        self.upload_dir = upload_dir
+        self.video_dir = video_dir
+        self.max_bytes = max_bytes
+        self.max_chunk_bytes = max_chunk_bytes
+        self.expiry_seconds = expiry_seconds
+        os.makedirs(upload_dir, exist_ok=True)
+        
+        # One writer per upload at a time
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def _part_path(self, upload_id: str) -> str:
+        return os.path.join(self.upload_dir, f"{upload_id}.part")
+
+    def _meta_path(self, upload_id: str) -> str:
+        return os.path.join(self.upload_dir, f"{upload_id}.json")
+
+    def create(self, interview_id: int, total_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Create an upload session
+
+        Args:
+            interview_id: ID of the interview
+            total_size: Expected size of the recording in bytes, if known
+
+        Returns:
+            Session details including the upload ID
+        """
+        if total_size is not None and total_size > self.max_bytes:
+            raise UploadError(413, f"Recording exceeds the {self.max_bytes} byte limit")
+
+        self.expire_stale()
+
+        upload_id = uuid.uuid4().hex
+        meta = {"upload_id": upload_id, "interview_id": interview_id, "total_size": total_size}
+        with open(self._meta_path(upload_id), "w") as f:
+            json.dump(meta, f)
+        open(self._part_path(upload_id), "wb").close()
+
+        return dict(meta, offset=0, max_chunk_bytes=self.max_chunk_bytes)
+
+    def get(self, interview_id: int, upload_id: str) -> Dict[str, Any]:
+        """Get an upload session with its committed offset"""
+        meta_path = self._meta_path(os.path.basename(upload_id))
+        if not os.path.exists(meta_path):
+            raise UploadError(404, "Upload not found")
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        if meta["interview_id"] != interview_id:
+            raise UploadError(404, "Upload not found")
+        return dict(meta, offset=os.path.getsize(self._part_path(meta["upload_id"])))
+
+    async def append_chunk(
+        self,
+        interview_id: int,
+        upload_id: str,
+        offset: int,
+        stream: AsyncIterator[bytes],
+        content_length: Optional[int] = None,
+        checksum: Optional[str] = None
+    ) -> int:
+        """
+        Append a chunk at the given offset, streaming it to disk
+
+        Args:
+            interview_id: ID of the interview
+            upload_id: ID of the upload session
+            offset: Offset the chunk starts at; must equal the committed offset
+            stream: Chunk body
+            content_length: Declared chunk size, checked against the limits before reading
+            checksum: Optional SHA-256 hex digest of the chunk
+
+        Returns:
+            The new committed offset
+        """
+        # Check the session exists first, so unknown IDs do not leave lock entries behind
+        await asyncio.to_thread(self.get, interview_id, upload_id)
+        async with self._locks.setdefault(upload_id, asyncio.Lock()):
+            return await self._append_chunk(interview_id, upload_id, offset, stream, content_length, checksum)
+
+    async def _append_chunk(self, interview_id, upload_id, offset, stream, content_length, checksum) -> int:
+        meta = await asyncio.to_thread(self.get, interview_id, upload_id)
+        committed = meta["offset"]
+        if offset != committed:
+            raise UploadError(409, "Offset does not match the committed offset", committed)
+
+        limit = min(meta["total_size"] or self.max_bytes, self.max_bytes)
+        if content_length is not None:
+            if content_length > self.max_chunk_bytes:
+                raise UploadError(413, f"Chunk exceeds the {self.max_chunk_bytes} byte limit", committed)
+            if committed + content_length > limit:
+                raise UploadError(413, "Recording exceeds its size limit", committed)
+
+        part_path = self._part_path(meta["upload_id"])
+        digest = hashlib.sha256()
+        received = 0
+        # File I/O runs in worker threads so slow disks do not stall the event loop
+        f = await asyncio.to_thread(open, part_path, "ab")
+        try:
+            async for data in stream:
+                received += len(data)
+                if received > self.max_chunk_bytes or committed + received > limit:
+                    raise UploadError(413, "Chunk exceeds the size limit", committed)
+                digest.update(data)
+                await asyncio.to_thread(f.write, data)
+            await asyncio.to_thread(f.close)
+
+            if checksum and digest.hexdigest() != checksum.lower():
+                raise UploadError(422, "Chunk checksum mismatch", committed)
+        except BaseException:
+            # Roll back to the last committed offset so the client can resend the chunk. This
+            # runs inline, so it finishes under the upload lock even when the request is cancelled
+            f.close()
+            os.truncate(part_path, committed)
+            raise
+
+        return committed + received
+
+    async def finalize(self, interview_id: int, upload_id: str) -> str:
+        """
+        Complete an upload and move the recording into place, after any chunk being appended
+
+        Returns:
+            Path to the recording
+        """
+        await asyncio.to_thread(self.get, interview_id, upload_id)
+        async with self._locks.setdefault(upload_id, asyncio.Lock()):
+            return await asyncio.to_thread(self._finalize, interview_id, upload_id)
+
+    def _finalize(self, interview_id: int, upload_id: str) -> str:
+        meta = self.get(interview_id, upload_id)
+        if meta["total_size"] is not None and meta["offset"] != meta["total_size"]:
+            raise UploadError(409, "Upload is incomplete", meta["offset"])
+
+        video_path = os.path.join(self.video_dir, f"{interview_id}.webm")
+        os.replace(self._part_path(meta["upload_id"]), video_path)
+        os.remove(self._meta_path(meta["upload_id"]))
+        self._locks.pop(upload_id, None)
+        logger.info(f"Finalized recording upload {upload_id} for interview {interview_id}")
+        return video_path
+
+    def expire_stale(self) -> int:
+        """
+        Delete upload sessions that have not received a chunk within the expiry period
+
+        Returns:
+            Number of sessions deleted
+        """
+        cutoff = time.time() - self.expiry_seconds
+        expired = 0
+        for filename in os.listdir(self.upload_dir):
+            upload_id, extension = os.path.splitext(filename)
+            if extension != ".json":
+                continue
+            lock = self._locks.get(upload_id)
+            if lock is not None and lock.locked():
+                continue
+
+            paths = [self._meta_path(upload_id), self._part_path(upload_id)]
+            try:
+                last_activity = max(os.path.getmtime(path) for path in paths if os.path.exists(path))
+            except ValueError:
+                continue
+            if last_activity >= cutoff:
+                continue
+
+            for path in paths:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self._locks.pop(upload_id, None)
+            expired += 1
+
+        if expired:
+            logger.info(f"Deleted {expired} abandoned recording uploads")
+        return expired
@@ -428,11 +428,8 @@ def parse_resume(pdf_path: str, job_description: str = None) -> Dict[str, Any]:
             resume_data["matching_keywords"] = extract_keywords(text, job_description)
         
         # Cache the parsed data
-        cache_dir = "uploads/parsed_resumes"
-        os.makedirs(cache_dir, exist_ok=True)
-        
-        filename = os.path.basename(pdf_path)
-        cache_path = os.path.join(cache_dir, f"{os.path.splitext(filename)[0]}.json")
+        cache_path = get_parsed_resume_path(pdf_path)
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
         
         with open(cache_path, 'w') as f:
             json.dump(resume_data, f, indent=2)
@@ -441,4 +438,30 @@ def parse_resume(pdf_path: str, job_description: str = None) -> Dict[str, Any]:
         
     except Exception as e:
         logger.error(f"Error parsing resume: {e}")
-        return {}
\ No newline at end of file
+        return {}
+
+def get_parsed_resume_path(pdf_path: str) -> str:
+    """Return the path of the cached parsed resume for a PDF"""
+    filename = os.path.basename(pdf_path)
+    return os.path.join("uploads/parsed_resumes", f"{os.path.splitext(filename)[0]}.json")
+
+def get_resume_skills(pdf_path: str) -> List[str]:
+    """
+    Get the skills for a resume, preferring the cached parsed resume
+    
+    Args:
+        pdf_path: Path to the PDF resume
+        
+    Returns:
+        List of skills found in the resume
+    """
+    cache_path = get_parsed_resume_path(pdf_path)
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r') as f:
+                return json.load(f).get("skills", [])
+        except Exception as e:
+            logger.error(f"Error reading parsed resume cache: {e}")
+    
+    text = extract_text_from_pdf(pdf_path)
+    return extract_skills(text) if text else []
@@ -0,0 +1,268 @@
+# backend/utils/scheduler.py
+import asyncio
+import os
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+from config import Config
+from database.database import SessionLocal
+from database.models import Interview
+from database.crud import (
+    get_interview, get_upcoming_interviews, count_interviews_by_status,
+    get_question_plan, save_question_plan, sweep_interview_statuses
+)
+from utils.resume_parser import parse_resume, get_parsed_resume_path
+from utils.voice_handling import tts_cache
+
+logger = logging.getLogger(__name__)
+
+def get_opening_questions(plan: Dict[str, Dict], count: int) -> List[str]:
+    """Return the questions asked first from a question plan (first question of each category, in order)"""
+    opening = []
+    for config in plan.values():
+        if config.get("questions"):
+            opening.append(config["questions"][0])
+        if len(opening) >= count:
+            break
+    return opening
+
+class WarmupScheduler:
+    """
+    In-process scheduler that warms interview resources ahead of scheduled_date:
+    parsed resume, stored question plan and TTS audio for the opening questions.
+    """
+
+    def __init__(
+        self,
+        llm_agent,
+        lead_minutes: int = Config.WARMUP_LEAD_MINUTES,
+        poll_seconds: int = Config.WARMUP_POLL_SECONDS,
+        max_concurrent: int = Config.WARMUP_MAX_CONCURRENT,
+        max_live_interviews: int = Config.WARMUP_MAX_LIVE_INTERVIEWS,
+        spacing_seconds: float = Config.WARMUP_SPACING_SECONDS,
+        tts_questions: int = Config.WARMUP_TTS_QUESTIONS
+    ):
+        self.llm_agent = llm_agent
+        self.lead = timedelta(minutes=lead_minutes)
+        self.poll_seconds = poll_seconds
+        self.max_concurrent = max_concurrent
+        self.max_live_interviews = max_live_interviews
+        self.spacing_seconds = spacing_seconds
+        self.tts_questions = tts_questions
+
+        # Warm-up state per interview
+        self.warm_status: Dict[int, Dict[str, Any]] = {}
+        self.start_records: Dict[int, Dict[str, Any]] = {}
+
+        self._in_flight = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the polling loop on the running event loop"""
+        if self._task is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Warm-up scheduler started ({self.lead} lead time)")
+
+    async def stop(self) -> None:
+        """Stop the polling loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Error in warm-up scheduler: {e}")
+            await asyncio.sleep(self.poll_seconds)
+
+    async def run_once(self) -> None:
+        """Launch warm-ups for interviews starting within the lead time"""
+        now = datetime.now()
+        db = SessionLocal()
+        try:
+            upcoming = [
+                (interview.id, interview.scheduled_date)
+                for interview in get_upcoming_interviews(db, now, now + self.lead)
+            ]
+            live_interviews = count_interviews_by_status(db, "in_progress")
+        finally:
+            db.close()
+
+        for interview_id, scheduled_date in upcoming:
+            if interview_id in self._in_flight or self.warm_status.get(interview_id, {}).get("complete"):
+                continue
+
+            # Under load, only warm interviews that are about to start
+            urgent = scheduled_date - now <= self.lead / 3
+            if live_interviews >= self.max_live_interviews and not urgent:
+                logger.info(f"Deferring warm-up of interview {interview_id}: {live_interviews} interviews live")
+                continue
+
+            self._in_flight.add(interview_id)
+            asyncio.create_task(self._warm(interview_id))
+
+            # Spread warm-ups out so they don't arrive as a burst
+            await asyncio.sleep(self.spacing_seconds)
+
+    async def _warm(self, interview_id: int) -> None:
+        try:
+            async with self._semaphore:
+                await asyncio.to_thread(self.warm_interview, interview_id)
+        finally:
+            self._in_flight.discard(interview_id)
+
+    def warm_interview(self, interview_id: int) -> Dict[str, Any]:
+        """
+        Make sure the resume, question plan and opening question audio are ready
+
+        Args:
+            interview_id: ID of the interview
+
+        Returns:
+            Dictionary with the warm-up status of each item
+        """
+        status = {"resume": False, "question_plan": False, "tts": False, "complete": False}
+        db = SessionLocal()
+        try:
+            interview = get_interview(db, interview_id)
+            if not interview:
+                return status
+
+            # Parsed resume
+            if not os.path.exists(get_parsed_resume_path(interview.resume_path)):
+                parse_resume(interview.resume_path, interview.job_description)
+            status["resume"] = os.path.exists(get_parsed_resume_path(interview.resume_path))
+
+            # Question plan
+            question_plan = get_question_plan(db, interview_id)
+            if not question_plan:
+                question_plan = save_question_plan(db, interview_id, self.llm_agent.build_question_plan(interview))
+            status["question_plan"] = True
+
+            # TTS audio for the opening questions (shared with other interviews through the cache)
+            opening_questions = get_opening_questions(question_plan.categories, self.tts_questions)
+            for question in opening_questions:
+                tts_cache.get_or_synthesize(question)
+            status["tts"] = all(tts_cache.contains(tts_cache.key(question)) for question in opening_questions)
+
+            status["complete"] = all([status["resume"], status["question_plan"], status["tts"]])
+            status["warmed_at"] = datetime.now().isoformat()
+            logger.info(f"Warmed interview {interview_id}: {status}")
+
+        except Exception as e:
+            logger.error(f"Error warming interview {interview_id}: {e}")
+        finally:
+            db.close()
+
+        self.warm_status[interview_id] = status
+        return status
+
+    def record_start(self, db, interview: Interview) -> Dict[str, Any]:
+        """
+        Record which items were warm when the interview started
+
+        Args:
+            db: Database session
+            interview: Interview that is starting
+
+        Returns:
+            Dictionary with the warm state of each item at start time
+        """
+        question_plan = get_question_plan(db, interview.id)
+        opening_questions = get_opening_questions(question_plan.categories, self.tts_questions) if question_plan else []
+
+        record = {
+            "resume": os.path.exists(get_parsed_resume_path(interview.resume_path)),
+            "question_plan": question_plan is not None,
+            "tts": bool(opening_questions) and all(
+                tts_cache.contains(tts_cache.key(question)) for question in opening_questions
+            ),
+            "started_at": datetime.now().isoformat(),
+            "scheduled_date": interview.scheduled_date.isoformat()
+        }
+        self.start_records[interview.id] = record
+        logger.info(f"Interview {interview.id} started with warm state: {record}")
+        return record
+
+class StatusSweeper:
+    """
+    Periodically expires interviews that were never started and cancels interviews
+    that were abandoned, using batched UPDATEs.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: int = Config.SWEEP_INTERVAL_SECONDS,
+        batch_size: int = Config.SWEEP_BATCH_SIZE,
+        stale_scheduled_hours: int = Config.STALE_SCHEDULED_HOURS,
+        stale_in_progress_hours: int = Config.STALE_IN_PROGRESS_HOURS
+    ):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.stale_scheduled = timedelta(hours=stale_scheduled_hours)
+        self.stale_in_progress = timedelta(hours=stale_in_progress_hours)
+
+        # Rows affected by the sweeper
+        self.metrics = {"runs": 0, "expired": 0, "cancelled": 0, "last_run": None}
+
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the sweep loop on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the sweep loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.sweep)
+            except Exception as e:
+                logger.error(f"Error in status sweeper: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def sweep(self) -> Dict[str, int]:
+        """
+        Run one sweep
+
+        Returns:
+            Dictionary with the number of interviews expired and cancelled
+        """
+        now = datetime.now()
+        db = SessionLocal()
+        try:
+            expired = sweep_interview_statuses(
+                db, "scheduled", "expired", now - self.stale_scheduled, self.batch_size
+            )
+            cancelled = sweep_interview_statuses(
+                db, "in_progress", "cancelled", now - self.stale_in_progress, self.batch_size
+            )
+        finally:
+            db.close()
+
+        self.metrics["runs"] += 1
+        self.metrics["expired"] += expired
+        self.metrics["cancelled"] += cancelled
+        self.metrics["last_run"] = now.isoformat()
+        if expired or cancelled:
+            logger.info(f"Status sweep: {expired} interviews expired, {cancelled} cancelled")
+
+        return {"expired": expired, "cancelled": cancelled}
@@ -0,0 +1,238 @@
+# backend/utils/tts_cache.py
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, Future
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Media types of the synthesised formats; raw PCM needs its rate and channels to be playable
+TTS_MEDIA_TYPES = {
+    "pcm": f"audio/L16;rate={Config.TTS_SAMPLE_RATE};channels=1",
+    "wav": "audio/wav",
+    "mp3": "audio/mpeg",
+    "ogg": "audio/ogg",
+}
+
+def tts_cache_key(text: str, voice: str, audio_format: str) -> str:
+    """Content address of a clip: SHA-256 over the text, voice and format"""
+    return hashlib.sha256(json.dumps([text.strip(), voice, audio_format]).encode("utf-8")).hexdigest()
+
+class TTSCache:
+    """
+    Content-addressed cache of synthesised speech.
+
+    Clips are stored on disk as <key>.<format> with least-recently-used eviction once the
+    store exceeds max_disk_bytes, and the hottest clips are also kept in an in-memory LRU
+    bounded by max_memory_bytes. Identical questions across interviews are synthesised once.
+    """
+
+    def __init__(
+        self,
+        synthesize: Callable[[str, str, str], bytes],
+        cache_dir: str = str(Config.TTS_DIR),
+        max_disk_bytes: int = Config.TTS_CACHE_MAX_BYTES,
+        max_memory_bytes: int = Config.TTS_CACHE_MEMORY_BYTES,
+        voice: str = Config.TTS_VOICE,
+        audio_format: str = Config.TTS_FORMAT
+    ):
+        self.synthesize = synthesize
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.max_memory_bytes = max_memory_bytes
+        self.voice = voice
+        self.audio_format = audio_format
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._synth_locks: Dict[str, threading.Lock] = {}
+        self._prefetching = set()
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()  # key -> (filename, size), oldest first
+        self._disk_bytes = 0
+        self.metrics = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        self._load_index()
+
+    def _load_index(self) -> None:
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            key, _, extension = entry.name.partition(".")
+            if entry.is_file() and len(key) == 64 and extension in TTS_MEDIA_TYPES:
+                stat = entry.stat()
+                entries.append((stat.st_mtime, key, entry.name, stat.st_size))
+        for _, key, filename, size in sorted(entries):
+            self._disk[key] = (filename, size)
+            self._disk_bytes += size
+
+    def key(self, text: str, voice: Optional[str] = None, audio_format: Optional[str] = None) -> str:
+        """Cache key of a clip with the given (or default) voice and format"""
+        return tts_cache_key(text, voice or self.voice, audio_format or self.audio_format)
+
+    def contains(self, key: str) -> bool:
+        """Check whether a clip is cached, without touching its recency"""
+        with self._lock:
+            return key in self._memory or key in self._disk
+
+    def media_type(self, key: str) -> str:
+        """Media type of a cached clip"""
+        with self._lock:
+            filename = self._disk[key][0] if key in self._disk else f".{self.audio_format}"
+        return TTS_MEDIA_TYPES.get(filename.rpartition(".")[2], "application/octet-stream")
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Get a cached clip
+
+        Returns:
+            Audio bytes, or None if the clip is not cached
+        """
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                if key in self._disk:
+                    self._disk.move_to_end(key)
+                self.metrics["memory_hits"] += 1
+                return data
+            entry = self._disk.get(key)
+
+        if entry is None:
+            with self._lock:
+                self.metrics["misses"] += 1
+            return None
+
+        path = os.path.join(self.cache_dir, entry[0])
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                if self._disk.pop(key, None):
+                    self._disk_bytes -= entry[1]
+                self.metrics["misses"] += 1
+            return None
+
+        with self._lock:
+            if key in self._disk:
+                self._disk.move_to_end(key)
+            self.metrics["disk_hits"] += 1
+            self._remember(key, data)
+        return data
+
+    def get_or_synthesize(self, text: str, voice: Optional[str] = None, audio_format: Optional[str] = None) -> Tuple[str, bytes]:
+        """
+        Get a clip from the cache, synthesising and storing it on a miss
+
+        Returns:
+            Tuple of the cache key and the audio (empty if synthesis failed)
+        """
+        voice = voice or self.voice
+        audio_format = audio_format or self.audio_format
+        key = tts_cache_key(text, voice, audio_format)
+
+        data = self.get(key)
+        if data is not None:
+            return key, data
+
+        # One synthesis per clip, even when several interviews ask for it at once
+        with self._lock:
+            synth_lock = self._synth_locks.setdefault(key, threading.Lock())
+        with synth_lock:
+            data = self.get(key) if self.contains(key) else None
+            if data is None:
+                data = self.synthesize(text, voice, audio_format)
+                if data:
+                    self.put(key, data, audio_format)
+        with self._lock:
+            self._synth_locks.pop(key, None)
+        return key, data or b""
+
+    def prefetch(self, texts: Iterable[str], executor: Executor) -> List[Future]:
+        """
+        Synthesise clips that are not cached yet in the background
+
+        Args:
+            texts: Texts whose clips will be needed soon
+            executor: Executor to synthesise on
+
+        Returns:
+            Futures of the syntheses started; texts already cached or queued are skipped
+        """
+        futures = []
+        for text in texts:
+            if not text or not text.strip():
+                continue
+            key = self.key(text)
+            with self._lock:
+                if key in self._memory or key in self._disk or key in self._prefetching:
+                    continue
+                self._prefetching.add(key)
+            futures.append(executor.submit(self._prefetch_one, key, text))
+        return futures
+
+    def _prefetch_one(self, key: str, text: str) -> str:
+        try:
+            self.get_or_synthesize(text)
+        except Exception as e:
+            logger.error(f"Error prefetching speech: {e}")
+        finally:
+            with self._lock:
+                self._prefetching.discard(key)
+        return key
+
+    def put(self, key: str, data: bytes, audio_format: Optional[str] = None) -> None:
+        """Store a clip on disk and in memory, evicting least recently used clips"""
+        filename = f"{key}.{audio_format or self.audio_format}"
+        path = os.path.join(self.cache_dir, filename)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            previous = self._disk.pop(key, None)
+            if previous:
+                self._disk_bytes -= previous[1]
+            self._disk[key] = (filename, len(data))
+            self._disk_bytes += len(data)
+            self._remember(key, data)
+            evicted = self._evict_disk()
+
+        for filename in evicted:
+            try:
+                os.remove(os.path.join(self.cache_dir, filename))
+            except FileNotFoundError:
+                pass
+
+    def _remember(self, key: str, data: bytes) -> None:
+        # Caller holds the lock
+        if len(data) > self.max_memory_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, old = self._memory.popitem(last=False)
+            self._memory_bytes -= len(old)
+
+    def _evict_disk(self) -> list:
+        # Caller holds the lock; returns the files to delete
+        evicted = []
+        while self._disk_bytes > self.max_disk_bytes and len(self._disk) > 1:
+            key, (filename, size) = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            if key in self._memory:
+                self._memory_bytes -= len(self._memory.pop(key))
+            evicted.append(filename)
+            self.metrics["evictions"] += 1
+        return evicted
@@ -2,13 +2,25 @@
 import cv2
 import numpy as np
 import os
-import time
-import uuid
 import json
 import logging
-from typing import Dict, Any, List, Tuple
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from datetime import datetime
 
+from config import Config
+from utils.frame_metrics import (
+    to_frame_metrics, append_frame_metrics, load_frame_metrics,
+    summarize_frame_metrics, find_key_moments, rolling_attention, attention_trend
+)
+
+try:
+    import av
+except ImportError:
+    av = None
+
 logger = logging.getLogger(__name__)
 
 # Face detection cascades
@@ -21,13 +33,14 @@ except Exception as e:
     eye_cascade = None
 
 class VideoProcessor:
-    def __init__(self, interview_id: int, storage_dir: str = "uploads/videos"):
+    def __init__(self, interview_id: int, storage_dir: str = "uploads/videos", face_tracking: bool = Config.VIDEO_FACE_TRACKING):
         """
         Initialize the video processor
         
         Args:
             interview_id: ID of the interview
             storage_dir: Directory to store video files
+            face_tracking: Search for the face near its previous position between full-frame detections
         """
         self.interview_id = interview_id
         self.storage_dir = storage_dir
@@ -39,37 +52,66 @@ class VideoProcessor:
         self.attention_scores = []
         self.anomalies = []
         
+        # Face tracking: primary face of the last analysed frame (full-resolution coordinates)
+        self.face_tracking = face_tracking
+        self.face_track = None
+        self.frames_since_full_detection = 0
+        self.detection_thumbnail = None  # thumbnail of the frame of the last full detection
+        
+        # Motion gating: thumbnail and result of the last fully analysed frame
+        self.motion_thumbnail = None
+        self.last_analysis = None
+        self.last_anomaly_reasons = []
+        self.reuse_count = 0
+        self.motion_stats = {"analyzed": 0, "reused": 0}
+        
+        # Frames seen in the media, run through the decoder, and converted to images for analysis
+        self.sampling_stats = {"frames": 0, "decoded": 0, "retrieved": 0}
+        
         # Create a subdirectory for the interview
         self.interview_dir = os.path.join(storage_dir, f"interview_{interview_id}")
         os.makedirs(self.interview_dir, exist_ok=True)
         
-        # Initialize analysis file
+        # Live recording stream
+        self.stream_file = os.path.join(self.interview_dir, "stream.webm")
+        self.stream_state_file = os.path.join(self.interview_dir, "stream.json")
+        self.stream_state = None
+        
+        # Analysis log: one JSON record per line, appended per chunk, plus a small summary file.
+        # analysis.json is the format of earlier recordings and is only read.
+        self.frame_log_file = os.path.join(self.interview_dir, "analysis_frames.jsonl")
+        self.anomaly_log_file = os.path.join(self.interview_dir, "analysis_anomalies.jsonl")
+        self.summary_file = os.path.join(self.interview_dir, "analysis_summary.json")
+        self.metrics_file = os.path.join(self.interview_dir, "analysis_metrics.bin")  # columnar frame metrics
         self.analysis_file = os.path.join(self.interview_dir, "analysis.json")
-        if not os.path.exists(self.analysis_file):
-            with open(self.analysis_file, 'w') as f:
-                json.dump({
-                    "interview_id": interview_id,
-                    "analysis_data": [],
-                    "summary": {},
-                    "anomalies": []
-                }, f)
+        self.anomalies_logged = 0
+        self.motion_logged = {"analyzed": 0, "reused": 0}  # motion_stats already added to the summary file
+        self.unsynced_records = 0
     
     def save_video_chunk(self, video_data: bytes) -> str:
         """
         Save a video chunk to disk
         
+        Chunks are named chunk_<sequence>.webm with a sequence number one past the last
+        chunk of the interview; the name is claimed exclusively, so concurrent saves get
+        distinct numbers and recording order does not depend on the clock.
+        
         Args:
             video_data: Raw video data
             
         Returns:
             Path to the saved video file
         """
-        timestamp = int(time.time())
-        chunk_filename = f"chunk_{timestamp}_{uuid.uuid4().hex[:8]}.webm"
-        chunk_path = os.path.join(self.interview_dir, chunk_filename)
-        
         try:
-            with open(chunk_path, 'wb') as f:
+            sequence = max((chunk_sequence(path) for path in self.list_video_chunks()), default=-1) + 1
+            while True:
+                chunk_path = os.path.join(self.interview_dir, f"chunk_{sequence:06d}.webm")
+                try:
+                    fd = os.open(chunk_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+                    break
+                except FileExistsError:
+                    sequence += 1
+            with os.fdopen(fd, 'wb') as f:
                 f.write(video_data)
             logger.info(f"Saved video chunk: {chunk_path}")
             return chunk_path
@@ -77,6 +119,158 @@ class VideoProcessor:
             logger.error(f"Error saving video chunk: {e}")
             return ""
     
+    def open_stream(self, session_id: str) -> None:
+        """
+        Select the live recording stream of one recording session
+        
+        Each page load records a new session with sequence numbers starting at 0, so its
+        chunks are kept apart from those of earlier (abandoned) sessions.
+        
+        Args:
+            session_id: Client-generated recording session ID (letters, digits, '-' and '_')
+        """
+        if not session_id or len(session_id) > 64 or not all(c.isalnum() or c in "-_" for c in session_id):
+            raise ValueError("Invalid recording session ID")
+        self.stream_file = os.path.join(self.interview_dir, f"stream_{session_id}.webm")
+        self.stream_state_file = os.path.join(self.interview_dir, f"stream_{session_id}.json")
+        self.stream_state = None
+    
+    def _load_stream_state(self) -> Dict[str, int]:
+        """Load the committed state of the live recording stream"""
+        state = {"last_sequence": -1, "size": 0}
+        if os.path.exists(self.stream_state_file):
+            with open(self.stream_state_file, 'r') as f:
+                state = json.load(f)
+        
+        # Drop bytes written after the last committed chunk (e.g. after a crash)
+        if os.path.exists(self.stream_file) and os.path.getsize(self.stream_file) > state["size"]:
+            with open(self.stream_file, 'r+b') as f:
+                f.truncate(state["size"])
+        return state
+    
+    def get_stream_state(self) -> Dict[str, int]:
+        """Get the last committed sequence number and size of the live recording stream"""
+        if self.stream_state is None:
+            self.stream_state = self._load_stream_state()
+        return self.stream_state
+    
+    def append_stream_chunk(self, sequence: int, video_data: bytes) -> int:
+        """
+        Append a live MediaRecorder chunk to the interview's stream file
+        
+        Args:
+            sequence: Sequence number of the chunk (starting at 0)
+            video_data: Raw chunk data
+            
+        Returns:
+            Last committed sequence number; chunks are only appended in order and
+            duplicates are ignored, so the caller can ask the client to resend from here
+        """
+        self.get_stream_state()
+        
+        if sequence != self.stream_state["last_sequence"] + 1:
+            return self.stream_state["last_sequence"]
+        
+        with open(self.stream_file, 'ab') as f:
+            f.write(video_data)
+        
+        self.stream_state["last_sequence"] = sequence
+        self.stream_state["size"] += len(video_data)
+        tmp_path = self.stream_state_file + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.stream_state, f)
+        os.replace(tmp_path, self.stream_state_file)
+        
+        return sequence
+    
+    def finalize_stream(self, output_path: str) -> str:
+        """
+        Move the completed live recording to its final location
+        
+        Args:
+            output_path: Path for the recording
+            
+        Returns:
+            Path to the recording, or an empty string if nothing was streamed
+        """
+        if not os.path.exists(self.stream_file):
+            return ""
+        
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        os.replace(self.stream_file, output_path)
+        if os.path.exists(self.stream_state_file):
+            os.remove(self.stream_state_file)
+        self.stream_state = None
+        logger.info(f"Finalized live recording: {output_path}")
+        return output_path
+    
+    def detect_faces(self, gray: np.ndarray) -> np.ndarray:
+        """
+        Detect faces on a downscaled copy of the frame, searching only around the tracked face
+        
+        While exactly one face is being tracked, detection runs on a padded region around its
+        previous position. A full-frame detection runs when the face is lost, every
+        VIDEO_FULL_DETECTION_INTERVAL analysed frames, whenever the last full detection did
+        not find exactly one face, and when a thumbnail of the frame has changed outside the
+        search region since the last full detection, so missing and additional faces are
+        still reported on the frame they appear.
+        
+        Args:
+            gray: Grayscale frame
+            
+        Returns:
+            Array of face rectangles (x, y, w, h) in full-resolution coordinates
+        """
+        height, width = gray.shape[:2]
+        scale = min(1.0, Config.VIDEO_DETECTION_WIDTH / width)
+        small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA) if scale < 1.0 else gray
+        thumbnail = self._motion_thumbnail(small) if self.face_tracking else None
+        
+        if (
+            self.face_tracking
+            and self.face_track is not None
+            and self.frames_since_full_detection < Config.VIDEO_FULL_DETECTION_INTERVAL
+        ):
+            x, y, w, h = self.face_track
+            pad_x, pad_y = int(w * Config.VIDEO_TRACK_PADDING), int(h * Config.VIDEO_TRACK_PADDING)
+            left, top = int(max(0, x - pad_x) * scale), int(max(0, y - pad_y) * scale)
+            right, bottom = int(min(width, x + w + pad_x) * scale), int(min(height, y + h + pad_y) * scale)
+            
+            # Anything moving elsewhere in the frame could be another face: scan all of it
+            if not self._changed_outside(thumbnail, (left, top, right, bottom), small.shape[1]):
+                region = small[top:bottom, left:right]
+                faces = face_cascade.detectMultiScale(region, 1.3, 5) if region.size else ()
+                if len(faces) == 1:
+                    self.frames_since_full_detection += 1
+                    faces = (faces + [left, top, 0, 0]) / scale
+                    self.face_track = faces[0].astype(int)
+                    return faces.astype(int)
+        
+        # Full-frame detection
+        faces = face_cascade.detectMultiScale(small, 1.3, 5)
+        faces = (np.asarray(faces, dtype=float).reshape(-1, 4) / scale).astype(int)
+        self.frames_since_full_detection = 0
+        self.face_track = faces[0] if len(faces) == 1 else None
+        self.detection_thumbnail = thumbnail
+        return faces
+    
+    def _changed_outside(self, thumbnail: np.ndarray, region: Tuple[int, int, int, int], small_width: int) -> bool:
+        """
+        Check whether the frame changed outside the face search region since the last full detection
+        
+        Args:
+            thumbnail: Motion thumbnail of the current frame
+            region: Search region (left, top, right, bottom) in downscaled-frame coordinates
+            small_width: Width of the downscaled frame
+        """
+        if self.detection_thumbnail is None or self.detection_thumbnail.shape != thumbnail.shape:
+            return True
+        changed = cv2.absdiff(thumbnail, self.detection_thumbnail) > Config.VIDEO_TRACK_CHANGE_LEVEL
+        ratio = thumbnail.shape[1] / small_width
+        left, top, right, bottom = region
+        changed[int(top * ratio):math.ceil(bottom * ratio), int(left * ratio):math.ceil(right * ratio)] = False
+        return int(np.count_nonzero(changed)) >= Config.VIDEO_TRACK_CHANGE_PIXELS
+    
     def analyze_video_frame(self, frame: np.ndarray, timestamp: float) -> Dict[str, Any]:
         """
         Analyze a video frame for facial expressions, eye contact, etc.
@@ -95,8 +289,76 @@ class VideoProcessor:
             # Convert to grayscale for detection
             gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
             
+            # Skip detection when the frame has not changed since the last analysed one
+            thumbnail = self._motion_thumbnail(gray)
+            if self._is_static(thumbnail):
+                return self._reuse_last_analysis(timestamp)
+            
+            anomaly_count = len(self.anomalies)
+            result = self._analyze_gray_frame(frame, gray, timestamp)
+            if "error" not in result:
+                self.motion_thumbnail = thumbnail
+                self.last_analysis = result
+                self.last_anomaly_reasons = [a["reason"] for a in self.anomalies[anomaly_count:]]
+                self.reuse_count = 0
+                self.motion_stats["analyzed"] += 1
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error analyzing video frame: {e}")
+            return {"error": str(e)}
+    
+    def _motion_thumbnail(self, gray: np.ndarray) -> np.ndarray:
+        """Tiny grayscale copy of a frame for cheap change detection"""
+        height, width = gray.shape[:2]
+        thumbnail_width = Config.VIDEO_MOTION_THUMBNAIL_WIDTH
+        thumbnail_height = max(1, round(height * thumbnail_width / width))
+        return cv2.resize(gray, (thumbnail_width, thumbnail_height), interpolation=cv2.INTER_AREA)
+    
+    def _is_static(self, thumbnail: np.ndarray) -> bool:
+        """Check whether a frame is close enough to the last analysed one to reuse its result"""
+        if (
+            Config.VIDEO_MOTION_THRESHOLD <= 0
+            or self.last_analysis is None
+            or self.motion_thumbnail is None
+            or self.motion_thumbnail.shape != thumbnail.shape
+            or self.reuse_count >= Config.VIDEO_MOTION_MAX_REUSE
+        ):
+            return False
+        return float(cv2.absdiff(thumbnail, self.motion_thumbnail).mean()) < Config.VIDEO_MOTION_THRESHOLD
+    
+    def _reuse_last_analysis(self, timestamp: float) -> Dict[str, Any]:
+        """
+        Repeat the last analysed frame's result for an unchanged frame
+        
+        The record, its anomaly and its scores are emitted with the new timestamp exactly
+        as if the frame had been analysed.
+        """
+        result = dict(self.last_analysis, timestamp=timestamp)
+        for reason in self.last_anomaly_reasons:
+            self.anomalies.append({
+                "timestamp": timestamp,
+                "reason": reason
+            })
+        # Scores are only recorded for frames with a face
+        if "eyes_detected" in result:
+            self.eye_contact_scores.append(result["eye_contact"])
+            self.attention_scores.append(result["attention_score"])
+        
+        self.reuse_count += 1
+        self.motion_stats["reused"] += 1
+        return result
+    
+    def motion_skip_ratio(self) -> float:
+        """Fraction of analysed frames whose result was reused instead of running detection"""
+        total = self.motion_stats["analyzed"] + self.motion_stats["reused"]
+        return self.motion_stats["reused"] / total if total else 0.0
+    
+    def _analyze_gray_frame(self, frame: np.ndarray, gray: np.ndarray, timestamp: float) -> Dict[str, Any]:
+        """Run face and eye detection on a frame and score it"""
+        try:
             # Detect faces
-            faces = face_cascade.detectMultiScale(gray, 1.3, 5)
+            faces = self.detect_faces(gray)
             
             # Analysis results
             result = {
@@ -195,75 +457,440 @@ class VideoProcessor:
             logger.error(f"Error analyzing video frame: {e}")
             return {"error": str(e)}
     
-    def analyze_video_chunk(self, video_path: str, frame_interval: int = 30) -> List[Dict[str, Any]]:
+    def analyze_video_chunk(
+        self,
+        video_path: str,
+        frame_interval: int = 30,
+        sample_fps: float = Config.VIDEO_SAMPLE_FPS,
+        keyframes_only: bool = Config.VIDEO_KEYFRAMES_ONLY
+    ) -> List[Dict[str, Any]]:
         """
         Analyze a video chunk by sampling frames at the given interval
         
+        Frame and anomaly timestamps are shifted by the media already analysed for the
+        interview (media_offset in the summary file), so successive chunks continue the
+        timeline instead of restarting at 0 and the logs stay in timestamp order. The
+        offset of each chunk is kept in chunk_offsets, keyed by file name: analysing a
+        chunk again reuses its offset and neither logs its results again nor moves
+        media_offset.
+        
         Args:
             video_path: Path to the video file
             frame_interval: Number of frames to skip between analyses
+            sample_fps: Frames to analyze per second of media instead of every frame_interval
+                frames (0 to sample by frame count)
+            keyframes_only: Only decode key frames (requires PyAV)
             
         Returns:
             List of frame analysis results
         """
+        state = self._load_summary_file()
+        chunk = os.path.basename(video_path)
+        analysed = chunk in state["chunk_offsets"]
+        offset = state["chunk_offsets"][chunk][0] if analysed else state["media_offset"]
+        anomaly_count = len(self.anomalies)
+        analysis_results, duration = self._analyze_frames(video_path, frame_interval, sample_fps, keyframes_only)
+        for result in analysis_results:
+            if "timestamp" in result:
+                result["timestamp"] += offset
+        for anomaly in self.anomalies[anomaly_count:]:
+            anomaly["timestamp"] += offset
+        
+        # Save analysis results
+        if analysed:
+            self.anomalies_logged = len(self.anomalies)
+        elif analysis_results or duration:
+            self._append_analysis_results(analysis_results, {chunk: [offset, duration]})
+        
+        return analysis_results
+    
+    def _analyze_frames(
+        self,
+        video_path: str,
+        frame_interval: int,
+        sample_fps: float = 0,
+        keyframes_only: bool = False
+    ) -> Tuple[List[Dict[str, Any]], float]:
+        """
+        Analyze the sampled frames of a video file without persisting the results
+        
+        Returns:
+            Tuple of the frame analysis results and the duration of the video in seconds
+        """
+        stats = {"duration": 0.0}
+        self.face_track = None
+        self.detection_thumbnail = None
+        self.motion_thumbnail = None
+        self.last_analysis = None
         try:
-            cap = cv2.VideoCapture(video_path)
-            if not cap.isOpened():
-                logger.error(f"Could not open video: {video_path}")
-                return []
+            analysis_results = [
+                self.analyze_video_frame(frame, timestamp)
+                for frame, timestamp in self.sample_frames(video_path, frame_interval, sample_fps, keyframes_only, stats)
+            ]
+            return analysis_results, stats["duration"]
+        except Exception as e:
+            logger.error(f"Error analyzing video chunk: {e}")
+            # Keep later chunks aligned even though this one was cut short
+            return [], max(stats["duration"], probe_video_duration(video_path))
+    
+    def sample_frames(
+        self,
+        video_path: str,
+        frame_interval: int = 30,
+        sample_fps: float = 0,
+        keyframes_only: bool = False,
+        stats: Optional[Dict[str, float]] = None
+    ) -> Iterator[Tuple[np.ndarray, float]]:
+        """
+        Yield the frames of a video file selected for analysis
+        
+        Frames that are skipped are only grabbed, never retrieved, so they are not converted
+        to BGR images. With keyframes_only, PyAV skips decoding everything but key frames.
+        
+        Args:
+            video_path: Path to the video file
+            frame_interval: Analyze every frame_interval-th frame (when sample_fps is 0)
+            sample_fps: Frames to analyze per second of media, independent of the encoded frame rate
+            keyframes_only: Only decode key frames, optionally thinned further by sample_fps
+            stats: Optional dictionary that receives the duration of the video in seconds
             
+        Returns:
+            Iterator of (BGR frame, timestamp in seconds)
+        """
+        if stats is None:
+            stats = {}
+        stats["duration"] = 0.0
+        
+        if keyframes_only:
+            if av is not None:
+                yield from self._sample_keyframes(video_path, sample_fps, stats)
+                return
+            logger.warning("PyAV is not installed, sampling decoded frames instead of key frames only")
+        
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            logger.error(f"Could not open video: {video_path}")
+            return
+        
+        try:
+            fps = cap.get(cv2.CAP_PROP_FPS)
             frame_count = 0
-            analysis_results = []
+            next_sample = 0.0
             
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                
-                # Only analyze every frame_interval frames
-                if frame_count % frame_interval == 0:
-                    timestamp = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
-                    result = self.analyze_video_frame(frame, timestamp)
-                    analysis_results.append(result)
+            # grab() demuxes and decodes; only retrieve() converts the frame to an image
+            while cap.grab():
+                position = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+                stats["duration"] = max(stats["duration"], position)
+                self.sampling_stats["frames"] += 1
+                self.sampling_stats["decoded"] += 1
                 
+                if sample_fps > 0:
+                    due = position >= next_sample
+                    if due:
+                        next_sample = (math.floor(position * sample_fps) + 1) / sample_fps
+                else:
+                    due = frame_count % frame_interval == 0
                 frame_count += 1
+                
+                if due:
+                    ret, frame = cap.retrieve()
+                    if ret:
+                        self.sampling_stats["retrieved"] += 1
+                        yield frame, position
             
+            # Position of the last frame plus its display time
+            if fps > 0 and frame_count:
+                stats["duration"] = max(stats["duration"] + 1.0 / fps, frame_count / fps)
+        finally:
             cap.release()
+    
+    def _sample_keyframes(self, video_path: str, sample_fps: float, stats: Dict[str, float]) -> Iterator[Tuple[np.ndarray, float]]:
+        """Yield the key frames of a video file, decoding nothing else"""
+        try:
+            container = av.open(video_path)
+        except Exception as e:
+            logger.error(f"Could not open video: {video_path}: {e}")
+            return
+        
+        with container:
+            stream = container.streams.video[0]
+            stream.codec_context.skip_frame = "NONKEY"
+            next_sample = 0.0
             
-            # Save analysis results
-            self._append_analysis_results(analysis_results)
-            
-            return analysis_results
+            for packet in container.demux(stream):
+                if packet.pts is not None:
+                    end = (packet.pts + (packet.duration or 0)) * packet.time_base
+                    stats["duration"] = max(stats["duration"], float(end))
+                    self.sampling_stats["frames"] += 1
+                
+                for frame in packet.decode():
+                    self.sampling_stats["decoded"] += 1
+                    timestamp = float(frame.time or 0.0)
+                    if sample_fps > 0:
+                        if timestamp < next_sample:
+                            continue
+                        next_sample = (math.floor(timestamp * sample_fps) + 1) / sample_fps
+                    self.sampling_stats["retrieved"] += 1
+                    yield frame.to_ndarray(format="bgr24"), timestamp
+    
+    def list_video_chunks(self) -> List[str]:
+        """
+        List the recorded video chunks of the interview in recording order
+        
+        Returns:
+            Paths to the chunk files, sorted by the sequence number in their names
+        """
+        video_files = [f for f in os.listdir(self.interview_dir) if f.startswith("chunk_") and f.endswith(".webm")]
+        paths = [os.path.join(self.interview_dir, f) for f in video_files]
+        return sorted(paths, key=lambda path: (chunk_sequence(path), path))
+    
+    def list_recording_files(self) -> List[str]:
+        """
+        List the media of the interview to analyse, in recording order
+        
+        Returns:
+            The video chunks, or else the finalized recording (from the live stream or a
+            resumable upload), or else the live stream files of recording sessions that
+            were never finalized, oldest first
+        """
+        chunks = self.list_video_chunks()
+        if chunks:
+            return chunks
+        
+        recording = os.path.join(self.storage_dir, f"{self.interview_id}.webm")
+        if os.path.exists(recording):
+            return [recording]
+        
+        streams = [
+            os.path.join(self.interview_dir, f) for f in os.listdir(self.interview_dir)
+            if f.startswith("stream_") and f.endswith(".webm")
+        ]
+        return sorted(streams, key=os.path.getmtime)
+    
+    def analyze_recording(
+        self,
+        frame_interval: int = 30,
+        sample_fps: float = Config.VIDEO_SAMPLE_FPS,
+        keyframes_only: bool = Config.VIDEO_KEYFRAMES_ONLY,
+        max_workers: int = Config.VIDEO_ANALYSIS_WORKERS
+    ) -> List[Dict[str, Any]]:
+        """
+        Analyze all video chunks of the interview in parallel worker processes
+        
+        The media comes from list_recording_files. Workers use this processor's face
+        tracking setting and the detection and motion settings of the parent's Config.
+        Each chunk is analyzed in its own process and the results are merged in recording
+        order. Frame and anomaly timestamps are shifted by the duration of the preceding
+        chunks (and of any media analysed before, as in analyze_video_chunk), so they are
+        relative to the start of the whole recording, and the per-frame
+        scores are appended to this processor in the same order as a serial run. A chunk
+        whose worker fails contributes no results but still its probed duration, so the
+        chunks after it keep their timestamps. Chunks already in chunk_offsets are skipped,
+        so running the analysis again only analyses chunks recorded since.
+        
+        Args:
+            frame_interval: Number of frames to skip between analyses
+            sample_fps: Frames to analyze per second of media (0 to sample by frame count)
+            keyframes_only: Only decode key frames (requires PyAV)
+            max_workers: Number of worker processes (0 for one per core)
             
-        except Exception as e:
-            logger.error(f"Error analyzing video chunk: {e}")
+        Returns:
+            List of frame analysis results of the newly analysed chunks in timestamp order
+        """
+        chunks = self.list_recording_files()
+        if not chunks:
+            logger.error("No video files found for analysis")
+            return []
+        
+        analysed = self._load_summary_file()["chunk_offsets"]
+        chunks = [chunk for chunk in chunks if os.path.basename(chunk) not in analysed]
+        if not chunks:
+            logger.info(f"All video of interview {self.interview_id} is already analysed")
             return []
+        
+        sampling = (frame_interval, sample_fps, keyframes_only, self.face_tracking)
+        workers = min(len(chunks), max_workers or os.cpu_count() or 1)
+        outcomes = []
+        if workers == 1:
+            for chunk in chunks:
+                try:
+                    outcomes.append(_analyze_chunk_worker(self.interview_id, self.storage_dir, chunk, *sampling))
+                except Exception as e:
+                    logger.error(f"Error analyzing video chunk {chunk}: {e}")
+                    outcomes.append(_failed_chunk_outcome(chunk))
+        else:
+            # Spawned rather than forked: OpenCV's internal thread pool does not survive fork
+            context = multiprocessing.get_context("spawn")
+            settings = {name: getattr(Config, name) for name in ANALYSIS_SETTINGS}
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=context, initializer=_init_analysis_worker, initargs=(settings,)
+            ) as pool:
+                futures = [
+                    pool.submit(_analyze_chunk_worker, self.interview_id, self.storage_dir, chunk, *sampling)
+                    for chunk in chunks
+                ]
+                for chunk, future in zip(chunks, futures):
+                    try:
+                        outcomes.append(future.result())
+                    except Exception as e:
+                        logger.error(f"Error analyzing video chunk {chunk}: {e}")
+                        outcomes.append(_failed_chunk_outcome(chunk))
+        
+        analysis_results = []
+        chunk_offsets = {}
+        offset = self._load_summary_file()["media_offset"]
+        for chunk, outcome in zip(chunks, outcomes):
+            for result in outcome["results"]:
+                if "timestamp" in result:
+                    result["timestamp"] += offset
+                analysis_results.append(result)
+            for anomaly in outcome["anomalies"]:
+                anomaly["timestamp"] += offset
+                self.anomalies.append(anomaly)
+            self.eye_contact_scores.extend(outcome["eye_contact_scores"])
+            self.attention_scores.extend(outcome["attention_scores"])
+            for key, value in outcome["sampling_stats"].items():
+                self.sampling_stats[key] += value
+            for key, value in outcome["motion_stats"].items():
+                self.motion_stats[key] += value
+            chunk_offsets[os.path.basename(chunk)] = [offset, outcome["duration"]]
+            offset += outcome["duration"]
+        
+        self._append_analysis_results(analysis_results, chunk_offsets)
+        
+        return analysis_results
     
-    def _append_analysis_results(self, results: List[Dict[str, Any]]) -> None:
+    def _append_analysis_results(
+        self,
+        results: List[Dict[str, Any]],
+        chunk_offsets: Optional[Dict[str, List[float]]] = None
+    ) -> None:
         """
-        Append analysis results to the analysis file
+        Append analysis results to the analysis log
+        
+        Frame results and the anomalies recorded since the last call are appended to their
+        logs, and the counters in the summary file are updated, so the cost does not grow
+        with the length of the interview. The logs are fsynced every VIDEO_LOG_FSYNC_FRAMES
+        records and when the summary is generated, and the summary file only after them, so
+        its counters on disk never run ahead of the records.
         
         Args:
             results: List of analysis results
+            chunk_offsets: [offset, duration] in seconds of each newly analysed chunk the
+                results come from; their durations are added to media_offset
         """
         try:
-            # Load existing analysis
-            with open(self.analysis_file, 'r') as f:
-                analysis_data = json.load(f)
+            new_anomalies = self.anomalies[self.anomalies_logged:]
+            self._append_log(self.frame_log_file, results)
+            append_frame_metrics(self.metrics_file, to_frame_metrics(results))
+            self._append_log(self.anomaly_log_file, new_anomalies)
+            self.anomalies_logged = len(self.anomalies)
             
-            # Append new results
-            analysis_data["analysis_data"].extend(results)
+            self.unsynced_records += len(results) + len(new_anomalies)
+            sync = self.unsynced_records >= Config.VIDEO_LOG_FSYNC_FRAMES
+            if sync:
+                self._sync_logs()
             
-            # Update anomalies
-            analysis_data["anomalies"] = self.anomalies
-            
-            # Save updated analysis
-            with open(self.analysis_file, 'w') as f:
-                json.dump(analysis_data, f, indent=2)
+            state = self._load_summary_file()
+            state["frames_logged"] += len(results)
+            state["anomalies_logged"] += len(new_anomalies)
+            for chunk, (offset, duration) in (chunk_offsets or {}).items():
+                state["chunk_offsets"][chunk] = [offset, duration]
+                state["media_offset"] += duration
+            for key, value in self.motion_stats.items():
+                state[f"motion_{key}"] += value - self.motion_logged[key]
+            self.motion_logged = dict(self.motion_stats)
+            self._write_summary_file(state, sync)
                 
         except Exception as e:
             logger.error(f"Error appending analysis results: {e}")
     
+    def _append_log(self, path: str, records: List[Dict[str, Any]]) -> None:
+        if records:
+            data = "".join(json.dumps(record) + "\n" for record in records).encode("utf-8")
+            with open(path, 'ab+') as f:
+                # A crash mid-write can leave the last record unterminated; start a new line after it
+                if f.tell() and (f.seek(-1, os.SEEK_END), f.read(1))[1] != b"\n":
+                    data = b"\n" + data
+                f.write(data)
+    
+    def _sync_logs(self) -> None:
+        for path in (self.frame_log_file, self.anomaly_log_file, self.metrics_file):
+            if os.path.exists(path):
+                with open(path, 'a') as f:
+                    os.fsync(f.fileno())
+        self.unsynced_records = 0
+    
+    def _load_summary_file(self) -> Dict[str, Any]:
+        if os.path.exists(self.summary_file):
+            with open(self.summary_file, 'r') as f:
+                state = json.load(f)
+        else:
+            state = {"interview_id": self.interview_id, "frames_logged": 0, "anomalies_logged": 0, "summary": {}}
+        # Counters across all chunks; absent from summaries of older recordings
+        state.setdefault("motion_analyzed", 0)
+        state.setdefault("motion_reused", 0)
+        state.setdefault("media_offset", 0.0)  # seconds of media analysed so far
+        state.setdefault("chunk_offsets", {})  # file name -> [offset, duration] of each analysed chunk
+        return state
+    
+    def _write_summary_file(self, state: Dict[str, Any], sync: bool = False) -> None:
+        # Write-then-rename, so readers never see a partial file; synced only after the logs
+        tmp_path = self.summary_file + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.summary_file)
+    
+    def _read_log(self, path: str) -> Iterator[Dict[str, Any]]:
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A record cut short by a crash mid-write
+                    logger.warning(f"Skipping incomplete record in {path}")
+    
+    def iter_analysis_frames(self) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the logged frame analysis results in order
+        
+        Returns:
+            Iterator of frame results, read from the legacy analysis.json for older recordings
+        """
+        if os.path.exists(self.frame_log_file):
+            yield from self._read_log(self.frame_log_file)
+        elif os.path.exists(self.analysis_file):
+            with open(self.analysis_file, 'r') as f:
+                yield from json.load(f)["analysis_data"]
+    
+    def iter_anomalies(self) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the logged anomalies in order
+        
+        Returns:
+            Iterator of anomalies, read from the legacy analysis.json for older recordings
+        """
+        if os.path.exists(self.anomaly_log_file):
+            yield from self._read_log(self.anomaly_log_file)
+        elif os.path.exists(self.analysis_file):
+            with open(self.analysis_file, 'r') as f:
+                yield from json.load(f)["anomalies"]
+    
+    def load_frame_metrics(self) -> np.ndarray:
+        """
+        Load the per-frame metrics of the interview as a structured array
+        
+        Returns:
+            Memory-mapped array from the metrics file, or an array built from the frame log
+            for recordings analysed before metrics were stored
+        """
+        if os.path.exists(self.metrics_file) or not (os.path.exists(self.frame_log_file) or os.path.exists(self.analysis_file)):
+            return load_frame_metrics(self.metrics_file)
+        return to_frame_metrics(self.iter_analysis_frames())
+    
     def generate_summary(self) -> Dict[str, Any]:
         """
         Generate a summary of the video analysis
@@ -272,28 +899,27 @@ class VideoProcessor:
             Dictionary with summary statistics
         """
         try:
-            # Load analysis data
-            with open(self.analysis_file, 'r') as f:
-                analysis_data = json.load(f)
+            self._sync_logs()
+            state = self._load_summary_file()
+            if not os.path.exists(self.anomaly_log_file):
+                # Older recording: count the anomalies of the legacy analysis file
+                state["anomalies_logged"] = sum(1 for _ in self.iter_anomalies())
             
             # Calculate summary statistics
-            eye_contact = self.eye_contact_scores
-            attention = self.attention_scores
-            anomalies = self.anomalies
+            metrics = self.load_frame_metrics()
             
             summary = {
                 "interview_id": self.interview_id,
-                "average_eye_contact": sum(eye_contact) / max(len(eye_contact), 1),
-                "average_attention": sum(attention) / max(len(attention), 1),
-                "anomaly_count": len(anomalies),
-                "total_frames_analyzed": len(analysis_data["analysis_data"]),
+                **summarize_frame_metrics(metrics),
+                "anomaly_count": state["anomalies_logged"],
+                "attention_trend": attention_trend(metrics, Config.VIDEO_TREND_WINDOW_SECONDS),
+                "motion_skip_ratio": state["motion_reused"] / max(state["motion_analyzed"] + state["motion_reused"], 1),
                 "timestamp": datetime.now().isoformat()
             }
             
-            # Update the analysis file with summary
-            analysis_data["summary"] = summary
-            with open(self.analysis_file, 'w') as f:
-                json.dump(analysis_data, f, indent=2)
+            # Update the summary file
+            state["summary"] = summary
+            self._write_summary_file(state, sync=True)
             
             return summary
             
@@ -312,45 +938,32 @@ class VideoProcessor:
             List of key moments with timestamps
         """
         try:
-            # Load analysis data
-            with open(self.analysis_file, 'r') as f:
-                analysis_data = json.load(f)
-            
-            key_moments = []
-            prev_attention = None
-            
-            for frame in analysis_data["analysis_data"]:
-                timestamp = frame.get("timestamp", 0)
-                # backend/utils/video_processor.py (continued)
-                attention = frame.get("attention_score", 0.0)
-                
-                # Check for significant attention changes
-                if prev_attention is not None and abs(attention - prev_attention) > threshold:
-                    key_moments.append({
-                        "timestamp": timestamp,
-                        "type": "attention_change",
-                        "from": prev_attention,
-                        "to": attention,
-                        "description": "Significant change in candidate attention"
-                    })
-                
-                # Check for anomalies
-                if frame.get("anomaly", False):
-                    key_moments.append({
-                        "timestamp": timestamp,
-                        "type": "anomaly",
-                        "reason": frame.get("anomaly_reason", "Unknown anomaly"),
-                        "description": f"Anomaly detected: {frame.get('anomaly_reason', 'Unknown')}"
-                    })
-                
-                prev_attention = attention
-            
-            return key_moments
-            
+            return find_key_moments(self.load_frame_metrics(), threshold)
         except Exception as e:
             logger.error(f"Error extracting key moments: {e}")
             return []
     
+    def attention_over_time(self, window_seconds: float = Config.VIDEO_TREND_WINDOW_SECONDS) -> List[Dict[str, float]]:
+        """
+        Rolling average of candidate attention
+        
+        Args:
+            window_seconds: Length of the window preceding each frame
+            
+        Returns:
+            List of {"timestamp", "attention"} per analysed frame
+        """
+        try:
+            metrics = self.load_frame_metrics()
+            rolling = rolling_attention(metrics, window_seconds)
+            return [
+                {"timestamp": timestamp, "attention": round(attention, 4)}
+                for timestamp, attention in zip(metrics["timestamp"].tolist(), rolling.tolist())
+            ]
+        except Exception as e:
+            logger.error(f"Error computing attention over time: {e}")
+            return []
+    
     def generate_thumbnails(self, interval_seconds: int = 60) -> List[str]:
         """
         Generate thumbnails from the video at the specified interval
@@ -362,15 +975,12 @@ class VideoProcessor:
             List of paths to the generated thumbnails
         """
         try:
-            # Find all video chunks in the interview directory
-            video_files = [f for f in os.listdir(self.interview_dir) if f.startswith("chunk_") and f.endswith(".webm")]
+            # Find all video chunks in the interview directory, in recording order
+            video_files = [os.path.basename(path) for path in self.list_video_chunks()]
             if not video_files:
                 logger.error("No video files found for thumbnail generation")
                 return []
             
-            # Sort by timestamp in filename
-            video_files.sort()
-            
             # Create thumbnails directory
             thumbnails_dir = os.path.join(self.interview_dir, "thumbnails")
             os.makedirs(thumbnails_dir, exist_ok=True)
@@ -420,15 +1030,12 @@ class VideoProcessor:
             Path to the merged video file
         """
         try:
-            # Find all video chunks in the interview directory
-            video_files = [f for f in os.listdir(self.interview_dir) if f.startswith("chunk_") and f.endswith(".webm")]
+            # Find all video chunks in the interview directory, in recording order
+            video_files = [os.path.basename(path) for path in self.list_video_chunks()]
             if not video_files:
                 logger.error("No video files found for merging")
                 return ""
             
-            # Sort by timestamp in filename
-            video_files.sort()
-            
             # Create a file list for ffmpeg
             file_list_path = os.path.join(self.interview_dir, "file_list.txt")
             with open(file_list_path, 'w') as f:
@@ -458,4 +1065,94 @@ class VideoProcessor:
             
         except Exception as e:
             logger.error(f"Error merging video chunks: {e}")
-            return ""
\ No newline at end of file
+            return ""
+
+def probe_video_duration(video_path: str) -> float:
+    """
+    Duration of a video file in seconds, without decoding it
+
+    Uses the container duration, or the end of the last packet for files without one (such
+    as WebM from MediaRecorder), when PyAV is installed, and OpenCV's frame count otherwise.
+
+    Returns:
+        Duration in seconds, or 0.0 if it cannot be determined
+    """
+    if av is not None:
+        try:
+            with av.open(video_path) as container:
+                if container.duration:
+                    return container.duration / av.time_base
+                duration = 0.0
+                for packet in container.demux(container.streams.video[0]):
+                    if packet.pts is not None:
+                        duration = max(duration, float((packet.pts + (packet.duration or 0)) * packet.time_base))
+                return duration
+        except Exception as e:
+            logger.warning(f"Could not probe video duration with PyAV: {video_path}: {e}")
+
+    cap = cv2.VideoCapture(video_path)
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        return frames / fps if fps > 0 and frames > 0 else 0.0
+    finally:
+        cap.release()
+
+def _failed_chunk_outcome(video_path: str) -> Dict[str, Any]:
+    """Stand-in for the outcome of a chunk whose worker failed: no results, only its duration"""
+    return {
+        "results": [],
+        "anomalies": [],
+        "eye_contact_scores": [],
+        "attention_scores": [],
+        "sampling_stats": {},
+        "motion_stats": {},
+        "duration": probe_video_duration(video_path)
+    }
+
+def chunk_sequence(chunk_path: str) -> int:
+    """Sequence number of a chunk named chunk_<sequence>[_<suffix>].webm (-1 if it has none)"""
+    number = os.path.basename(chunk_path)[len("chunk_"):].split(".")[0].split("_")[0]
+    return int(number) if number.isdigit() else -1
+
+# Config settings that change analysis results, passed to spawned workers that would
+# otherwise re-read them from the environment
+ANALYSIS_SETTINGS = (
+    "VIDEO_DETECTION_WIDTH", "VIDEO_FULL_DETECTION_INTERVAL", "VIDEO_TRACK_PADDING",
+    "VIDEO_TRACK_CHANGE_LEVEL", "VIDEO_TRACK_CHANGE_PIXELS", "VIDEO_MOTION_THRESHOLD",
+    "VIDEO_MOTION_THUMBNAIL_WIDTH", "VIDEO_MOTION_MAX_REUSE"
+)
+
+def _init_analysis_worker(settings: Dict[str, Any]) -> None:
+    # One OpenCV thread per worker process; the pool provides the parallelism
+    cv2.setNumThreads(1)
+    for name, value in settings.items():
+        setattr(Config, name, value)
+
+def _analyze_chunk_worker(
+    interview_id: int,
+    storage_dir: str,
+    video_path: str,
+    frame_interval: int,
+    sample_fps: float,
+    keyframes_only: bool,
+    face_tracking: bool = Config.VIDEO_FACE_TRACKING
+) -> Dict[str, Any]:
+    """
+    Analyze one video chunk in a worker process
+
+    Returns:
+        Dictionary with the frame results, the anomalies and scores collected while
+        analyzing the chunk, and the chunk's duration in seconds
+    """
+    processor = VideoProcessor(interview_id, storage_dir, face_tracking=face_tracking)
+    results, duration = processor._analyze_frames(video_path, frame_interval, sample_fps, keyframes_only)
+    return {
+        "results": results,
+        "anomalies": processor.anomalies,
+        "eye_contact_scores": processor.eye_contact_scores,
+        "attention_scores": processor.attention_scores,
+        "sampling_stats": processor.sampling_stats,
+        "motion_stats": processor.motion_stats,
+        "duration": duration
+    }
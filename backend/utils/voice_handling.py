@@ -1,16 +1,293 @@
 import boto3
 import json
-import base64
+import binascii
 import os
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, List, Tuple
 import numpy as np
 import soundfile as sf
 import wave
 import io
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from config import Config
+from utils.audio_decode import decode_audio
+from utils.tts_cache import TTSCache
 
 logger = logging.getLogger(__name__)
 
+# Transcription request body around the base64 audio
+TRANSCRIPTION_BODY_PREFIX = b'{"inputText": "", "inputAudio": "'
+TRANSCRIPTION_BODY_SUFFIX = b'", "taskType": "TRANSCRIPTION"}'
+
+# Bytes of audio encoded per base64 step (a multiple of 3, so steps need no padding)
+BASE64_STEP_BYTES = 3 * 64 * 1024
+
+def read_audio(file_obj, size: Optional[int] = None, chunk_size: int = 1024 * 1024) -> bytearray:
+    """
+    Read an audio upload into a single buffer
+    
+    Args:
+        file_obj: Binary file object to read from
+        size: Size of the upload if known, so the buffer is allocated once and filled in place
+        chunk_size: Read size when the size is unknown
+        
+    Returns:
+        Buffer with the audio
+    """
+    if size is not None:
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        offset = 0
+        while offset < size:
+            read = file_obj.readinto(view[offset:])
+            if not read:
+                break
+            offset += read
+        view.release()
+        del buffer[offset:]
+        return buffer
+    
+    buffer = bytearray()
+    while True:
+        chunk = file_obj.read(chunk_size)
+        if not chunk:
+            return buffer
+        buffer.extend(chunk)
+
+def build_transcription_body(audio_bytes) -> bytearray:
+    """
+    Build the JSON request body for a transcription without intermediate copies.
+    
+    The audio is base64-encoded step by step straight into a preallocated buffer that
+    already holds the JSON around it, instead of building a base64 bytes object, a
+    decoded str, and a JSON str on top of the audio itself.
+    """
+    audio = memoryview(audio_bytes)
+    encoded_length = 4 * ((len(audio) + 2) // 3)
+    body = bytearray(len(TRANSCRIPTION_BODY_PREFIX) + encoded_length + len(TRANSCRIPTION_BODY_SUFFIX))
+    
+    position = len(TRANSCRIPTION_BODY_PREFIX)
+    body[:position] = TRANSCRIPTION_BODY_PREFIX
+    for start in range(0, len(audio), BASE64_STEP_BYTES):
+        encoded = binascii.b2a_base64(audio[start:start + BASE64_STEP_BYTES], newline=False)
+        body[position:position + len(encoded)] = encoded
+        position += len(encoded)
+    body[position:] = TRANSCRIPTION_BODY_SUFFIX
+    
+    audio.release()
+    return body
+
+class VoiceActivityDetector:
+    """
+    Energy and zero-crossing-rate voice activity detection on 16-bit mono PCM.
+
+    Frames are classified in bulk with NumPy: a frame is speech if its energy is well above
+    the recording's noise floor, or somewhat above it with a high zero-crossing rate (unvoiced
+    consonants such as "s" and "f"). Speech is padded by a hangover so word edges survive.
+    Leading and trailing silence is dropped, pauses are shortened to keep_pause_ms, and pauses
+    of at least split_pause_ms (if set) split the audio into separate segments.
+    """
+    
+    def __init__(
+        self,
+        frame_ms: int = Config.VAD_FRAME_MS,
+        energy_margin_db: float = Config.VAD_ENERGY_MARGIN_DB,
+        min_energy_db: float = Config.VAD_MIN_ENERGY_DB,
+        max_threshold_db: float = Config.VAD_MAX_THRESHOLD_DB,
+        zcr_threshold: float = Config.VAD_ZCR_THRESHOLD,
+        hangover_ms: int = Config.VAD_HANGOVER_MS,
+        keep_pause_ms: int = Config.VAD_KEEP_PAUSE_MS,
+        split_pause_ms: int = Config.VAD_SPLIT_PAUSE_MS
+    ):
+        self.frame_ms = frame_ms
+        self.energy_margin_db = energy_margin_db
+        self.min_energy_db = min_energy_db
+        self.max_threshold_db = max_threshold_db
+        self.zcr_threshold = zcr_threshold
+        self.hangover_ms = hangover_ms
+        self.keep_pause_ms = keep_pause_ms
+        self.split_pause_ms = split_pause_ms
+    
+    def speech_frames(self, samples: np.ndarray, frame_length: int) -> np.ndarray:
+        """
+        Classify frames as speech
+        
+        Args:
+            samples: int16 samples
+            frame_length: Samples per frame
+            
+        Returns:
+            Boolean array with one entry per frame (the last frame is zero-padded)
+        """
+        frame_count = -(-len(samples) // frame_length)
+        frames = np.zeros(frame_count * frame_length, dtype=np.float32)
+        frames[:len(samples)] = samples
+        frames = frames.reshape(frame_count, frame_length) / 32768.0
+        
+        energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / max(frame_length - 1, 1)
+        
+        # Threshold relative to the quietest tenth of the recording, within absolute bounds
+        noise_floor = np.percentile(energy_db, 10)
+        threshold = min(max(noise_floor + self.energy_margin_db, self.min_energy_db), self.max_threshold_db)
+        speech = (energy_db > threshold) | (
+            (energy_db > threshold - self.energy_margin_db / 2) & (zcr > self.zcr_threshold)
+        )
+        
+        hangover = self.hangover_ms // self.frame_ms
+        if hangover:
+            speech = np.convolve(speech.astype(np.int32), np.ones(2 * hangover + 1, dtype=np.int32), "same") > 0
+        return speech
+    
+    def process(self, pcm_bytes, sample_rate: int = Config.STT_SAMPLE_RATE) -> Tuple[List[bytes], Dict[str, Any]]:
+        """
+        Trim and compact silence
+        
+        Args:
+            pcm_bytes: 16-bit mono PCM
+            sample_rate: Sample rate of the audio
+            
+        Returns:
+            Tuple of the speech segments (PCM) and stats on what was removed
+        """
+        samples = np.frombuffer(pcm_bytes, dtype=np.int16, count=len(pcm_bytes) // 2)
+        frame_length = max(1, sample_rate * self.frame_ms // 1000)
+        segments: List[bytes] = []
+        
+        if len(samples):
+            speech = self.speech_frames(samples, frame_length)
+            frame_count = len(speech)
+            keep = speech.copy()
+            keep_frames = self.keep_pause_ms // self.frame_ms
+            split_frames = self.split_pause_ms // self.frame_ms if self.split_pause_ms else 0
+            
+            # Runs of silence between speech
+            edges = np.diff(np.concatenate(([0], (~speech).astype(np.int8), [0])))
+            split_points = [0]
+            for start, end in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)):
+                if start == 0 or end == frame_count:
+                    continue  # leading or trailing silence is dropped
+                if split_frames and end - start >= split_frames:
+                    split_points.extend([start, end])
+                elif end - start > keep_frames:
+                    keep[start:start + keep_frames // 2] = True
+                    keep[end - (keep_frames - keep_frames // 2):end] = True
+                else:
+                    keep[start:end] = True
+            split_points.append(frame_count)
+            
+            sample_mask = np.repeat(keep, frame_length)[:len(samples)]
+            for first, last in zip(split_points[::2], split_points[1::2]):
+                segment = samples[first * frame_length:last * frame_length][sample_mask[first * frame_length:last * frame_length]]
+                if len(segment):
+                    segments.append(segment.tobytes())
+        
+        output_bytes = sum(len(segment) for segment in segments)
+        bytes_removed = len(pcm_bytes) - output_bytes
+        stats = {
+            "input_bytes": len(pcm_bytes),
+            "output_bytes": output_bytes,
+            "bytes_removed": bytes_removed,
+            "seconds_removed": bytes_removed / 2 / sample_rate,
+            "segments": len(segments)
+        }
+        return segments, stats
+
+def quietest_cut(samples: np.ndarray, earliest: int, target: int, frame_length: int) -> int:
+    """
+    Sample index at which to cut audio: the start of the quietest frame between earliest and target
+
+    Args:
+        samples: int16 samples
+        earliest: First sample a cut may be placed at
+        target: Preferred (latest) cut position
+        frame_length: Samples per energy frame
+    """
+    frame_count = (target - earliest) // frame_length
+    if frame_count <= 0:
+        return target
+    frames = samples[earliest:earliest + frame_count * frame_length].reshape(frame_count, frame_length).astype(np.float32)
+    return earliest + int(np.argmin(np.mean(frames ** 2, axis=1))) * frame_length
+
+def split_long_audio(
+    pcm_bytes: bytes,
+    sample_rate: int = Config.STT_SAMPLE_RATE,
+    chunk_seconds: float = Config.STT_CHUNK_SECONDS,
+    overlap_seconds: float = Config.STT_CHUNK_OVERLAP_SECONDS,
+    search_seconds: float = 3.0,
+    frame_ms: int = 20
+) -> List[bytes]:
+    """
+    Split long 16-bit mono PCM into chunks of about chunk_seconds for parallel transcription
+
+    Each cut is placed at the quietest frame in the search_seconds before the target length,
+    so cuts fall in pauses where possible, and each chunk after the first starts
+    overlap_seconds before its cut so a word split by the cut is whole in one of the chunks.
+
+    Returns:
+        List of PCM chunks (the input itself if it is short enough)
+    """
+    samples = np.frombuffer(pcm_bytes, dtype=np.int16, count=len(pcm_bytes) // 2)
+    chunk_length = int(chunk_seconds * sample_rate)
+    if len(samples) <= chunk_length * 1.25:
+        return [pcm_bytes]
+
+    frame_length = sample_rate * frame_ms // 1000
+    search = int(search_seconds * sample_rate)
+    overlap = int(overlap_seconds * sample_rate)
+    cuts = [0]
+    while len(samples) - cuts[-1] > chunk_length * 1.25:
+        target = cuts[-1] + chunk_length
+        cuts.append(quietest_cut(samples, max(target - search, cuts[-1] + frame_length), target, frame_length))
+    cuts.append(len(samples))
+
+    return [
+        samples[max(start - overlap, 0) if index else start:end].tobytes()
+        for index, (start, end) in enumerate(zip(cuts[:-1], cuts[1:]))
+    ]
+
+def _normalise_word(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower())
+
+def stitch_transcripts(texts: List[str], max_overlap_words: int = 12) -> str:
+    """
+    Join transcripts of overlapping chunks, dropping the longest run of words at the start
+    of each chunk that repeats the end of the previous one
+    """
+    words: List[str] = []
+    for text in texts:
+        new_words = text.split()
+        if words and new_words:
+            tail = [_normalise_word(word) for word in words[-max_overlap_words:]]
+            head = [_normalise_word(word) for word in new_words[:max_overlap_words]]
+            for length in range(min(len(tail), len(head)), 0, -1):
+                if tail[-length:] == head[:length]:
+                    new_words = new_words[length:]
+                    break
+        words.extend(new_words)
+    return " ".join(words)
+
+def wav_to_pcm(audio_bytes) -> Optional[Tuple[bytes, int]]:
+    """
+    Extract the samples of a 16-bit mono WAV file
+    
+    Returns:
+        Tuple of PCM bytes and sample rate, or None if the audio is not 16-bit mono WAV
+    """
+    if bytes(audio_bytes[:4]) != b"RIFF":
+        return None
+    try:
+        with wave.open(io.BytesIO(audio_bytes), "rb") as wav_file:
+            if wav_file.getnchannels() != 1 or wav_file.getsampwidth() != 2:
+                return None
+            return wav_file.readframes(wav_file.getnframes()), wav_file.getframerate()
+    except (wave.Error, EOFError):
+        return None
+
 class VoiceProcessor:
     def __init__(self):
         # Initialize AWS Bedrock client
@@ -20,6 +297,12 @@ class VoiceProcessor:
             aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
             aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
         )
+        
+        # Silence trimming before transcription
+        self.vad = VoiceActivityDetector() if Config.VAD_ENABLED else None
+        self.vad_totals = {"answers": 0, "bytes_removed": 0, "seconds_removed": 0.0}
+        # Answers are transcribed from several worker threads at once
+        self._vad_totals_lock = threading.Lock()
     
     def transcribe_audio(self, audio_file_path: str) -> str:
         """
@@ -35,23 +318,66 @@ class VoiceProcessor:
             # Read the audio file
             with open(audio_file_path, "rb") as audio_file:
                 audio_bytes = audio_file.read()
+        except Exception as e:
+            logger.error(f"Error reading audio file: {e}")
+            return ""
+        
+        return self.transcribe_bytes(audio_bytes)
+    
+    def transcribe_bytes(self, audio_bytes) -> str:
+        """
+        Transcribe in-memory audio using AWS Bedrock Nova Sonic model
+        
+        Args:
+            audio_bytes: Contents of an audio file (e.g. WAV), as bytes or bytearray
             
-            # Encode audio bytes to base64
-            audio_base64 = base64.b64encode(audio_bytes).decode("utf-8")
-            
-            # Prepare request body for AWS Bedrock Nova Sonic
-            request_body = {
-                "inputText": "",  # No input text for pure transcription
-                "inputAudio": audio_base64,
-                "taskType": "TRANSCRIPTION"
-            }
-            
+        Returns:
+            Transcribed text
+        """
+        # Decode to PCM in process; undecodable audio is sent as it is
+        wav = wav_to_pcm(audio_bytes)
+        if wav is None:
+            samples = decode_audio(audio_bytes)
+            if samples is None:
+                return self._invoke_transcription(audio_bytes)
+            wav = (samples.tobytes(), Config.STT_SAMPLE_RATE)
+        
+        pcm_bytes, sample_rate = wav
+        segments = [pcm_bytes]
+        if self.vad:
+            segments, stats = self.vad.process(pcm_bytes, sample_rate)
+            with self._vad_totals_lock:
+                self.vad_totals["answers"] += 1
+                self.vad_totals["bytes_removed"] += stats["bytes_removed"]
+                self.vad_totals["seconds_removed"] += stats["seconds_removed"]
+            logger.info(
+                f"VAD removed {stats['bytes_removed']} bytes ({stats['seconds_removed']:.1f}s) of silence, "
+                f"{stats['segments']} speech segments"
+            )
+        
+        # Split long speech into overlapping chunks and transcribe them concurrently
+        chunked = [split_long_audio(segment, sample_rate) for segment in segments]
+        requests = [pcm_to_wav(chunk, sample_rate) for chunks in chunked for chunk in chunks]
+        if len(requests) > 1:
+            texts = list(chunk_executor.map(self._invoke_transcription, requests))
+        else:
+            texts = [self._invoke_transcription(request) for request in requests]
+        
+        # Stitch the chunks of each segment back together, dropping words repeated in the overlap
+        transcripts = []
+        for chunks in chunked:
+            transcripts.append(stitch_transcripts(texts[:len(chunks)]))
+            texts = texts[len(chunks):]
+        return " ".join(text for text in transcripts if text)
+    
+    def _invoke_transcription(self, audio_bytes) -> str:
+        try:
             # Call AWS Bedrock Nova Sonic model
             response = self.bedrock_runtime.invoke_model(
                 modelId="amazon.nova-sonic-v1:0",  # Correct Nova Sonic model ID
                 contentType="application/json",
                 accept="application/json",
-                body=json.dumps(request_body)
+                body=build_transcription_body(audio_bytes)
             )
             
             # Parse response
@@ -64,53 +390,211 @@ class VoiceProcessor:
             logger.error(f"Error transcribing audio: {e}")
             return ""
     
-    def text_to_speech(self, text: str, output_file_path: str) -> str:
+    def synthesize(self, text: str, voice: str = Config.TTS_VOICE, audio_format: str = Config.TTS_FORMAT) -> bytes:
         """
-        Convert text to speech using AWS Bedrock TTS model
+        Synthesise speech using AWS Bedrock TTS model
         
         Args:
             text: Text to convert to speech
-            output_file_path: Path to save the audio file
+            voice: Voice to use
+            audio_format: Audio format to return; "wav" is requested as PCM and wrapped locally
             
         Returns:
-            Path to the generated audio file
+            Audio bytes, or empty bytes on failure
         """
+        model_format = "pcm" if audio_format == "wav" else audio_format
         try:
             # Prepare request body for AWS Bedrock
             request_body = {
                 "text": text,
-                "voice": "alloy",  # Default voice
-                "accept_format": "pcm"
+                "voice": voice,
+                "accept_format": model_format
             }
             
             # Call AWS Bedrock TTS model
             response = self.bedrock_runtime.invoke_model(
                 modelId="amazon.titan-tts-expressive",  # TTS model ID
                 contentType="application/json",
-                accept="audio/pcm",
+                accept=f"audio/{model_format}",
                 body=json.dumps(request_body)
             )
             
             # Parse response
             audio_bytes = response["body"].read()
-            
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
-            
-            # Save audio to file
-            with open(output_file_path, "wb") as audio_file:
-                audio_file.write(audio_bytes)
-            
-            return output_file_path
+            if audio_format == "wav" and audio_bytes:
+                return pcm_to_wav(audio_bytes, Config.TTS_SAMPLE_RATE)
+            return audio_bytes
             
         except Exception as e:
             logger.error(f"Error generating speech: {e}")
-            return ""
+            return b""
+    
+    def text_to_speech(self, text: str, output_file_path: str) -> str:
+        """
+        Convert text to speech using AWS Bedrock TTS model
+        
+        Args:
+            text: Text to convert to speech
+            output_file_path: Path to save the audio file
+            
+        Returns:
+            Path to the generated audio file
+        """
+        return write_audio_file(self.synthesize(text), output_file_path)
 
 
+def write_audio_file(audio_bytes: bytes, output_file_path: str) -> str:
+    """Save audio to a file, returning the path (or an empty string if there is no audio)"""
+    if not audio_bytes:
+        return ""
+    try:
+        # Create directory if it doesn't exist
+        os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
+        
+        # Save audio to file
+        with open(output_file_path, "wb") as audio_file:
+            audio_file.write(audio_bytes)
+        
+        return output_file_path
+    except Exception as e:
+        logger.error(f"Error saving audio: {e}")
+        return ""
+
+def pcm_to_wav(pcm_bytes: bytes, sample_rate: int = Config.STT_SAMPLE_RATE) -> bytes:
+    """Wrap 16-bit mono PCM in an in-memory WAV container"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm_bytes)
+    return buffer.getvalue()
+
+def local_transcribe_segment(pcm_bytes: bytes, sample_rate: int = Config.STT_SAMPLE_RATE) -> str:
+    """
+    Local stand-in for the speech service, for development and tests.
+    Returns a deterministic placeholder describing the segment instead of calling AWS.
+    """
+    seconds = len(pcm_bytes) / 2 / sample_rate
+    return f"[{seconds:.1f}s of speech]" if pcm_bytes else ""
+
+class TranscriptionStream:
+    """
+    Incremental transcription of one answer.
+
+    16-bit mono PCM frames are fed as they arrive from the client. About every segment_seconds
+    of audio a segment is sent to the speech service in the background, so by the time the
+    candidate stops talking only the last partial segment is left to transcribe. As in
+    split_long_audio, each segment is cut at the quietest frame in the search_seconds before
+    its full length and starts overlap_seconds before its cut, and the segment transcripts are
+    joined with stitch_transcripts, so words at a boundary are not lost. partial() returns the
+    text of the segments transcribed so far, in order.
+    """
+    
+    def __init__(
+        self,
+        transcribe_segment: Callable[[bytes], str],
+        executor: ThreadPoolExecutor,
+        sample_rate: int = Config.STT_SAMPLE_RATE,
+        segment_seconds: float = Config.STT_SEGMENT_SECONDS,
+        search_seconds: float = Config.STT_SEGMENT_SEARCH_SECONDS,
+        overlap_seconds: float = Config.STT_SEGMENT_OVERLAP_SECONDS,
+        frame_ms: int = 20
+    ):
+        self.transcribe_segment = transcribe_segment
+        self.executor = executor
+        self.segment_samples = int(sample_rate * segment_seconds)
+        self.search_samples = min(int(sample_rate * search_seconds), self.segment_samples // 2)
+        self.overlap_bytes = int(sample_rate * overlap_seconds) * 2
+        self.frame_length = sample_rate * frame_ms // 1000
+        
+        self._buffer = bytearray()
+        self._overlap = b""  # end of the previous segment, repeated at the start of the next
+        self._segments: List[Future] = []
+        self._lock = threading.Lock()
+    
+    def send_audio(self, frame: bytes) -> None:
+        """Add a PCM frame, submitting a segment for transcription when one is complete"""
+        with self._lock:
+            self._buffer.extend(frame)
+            while len(self._buffer) >= self.segment_samples * 2:
+                samples = np.frombuffer(bytes(self._buffer[:self.segment_samples * 2]), dtype=np.int16)
+                cut = 2 * quietest_cut(
+                    samples, self.segment_samples - self.search_samples, self.segment_samples, self.frame_length
+                )
+                segment = self._overlap + bytes(self._buffer[:cut])
+                self._overlap = bytes(self._buffer[max(cut - self.overlap_bytes, 0):cut])
+                del self._buffer[:cut]
+                self._segments.append(self.executor.submit(self.transcribe_segment, segment))
+    
+    def partial(self) -> str:
+        """Transcript of the leading segments that have finished transcribing"""
+        texts = []
+        for segment in self._segments:
+            if not segment.done():
+                break
+            texts.append(self._result(segment))
+        return stitch_transcripts(texts)
+    
+    def finish(self) -> str:
+        """Transcribe the remaining audio and return the full transcript"""
+        with self._lock:
+            if self._buffer:
+                segment = self._overlap + bytes(self._buffer)
+                self._segments.append(self.executor.submit(self.transcribe_segment, segment))
+                self._buffer.clear()
+            segments = list(self._segments)
+        
+        return stitch_transcripts([self._result(segment) for segment in segments])
+    
+    @staticmethod
+    def _result(segment: Future) -> str:
+        try:
+            return segment.result()
+        except Exception as e:
+            logger.error(f"Error transcribing segment: {e}")
+            return ""
+
 # Initialize voice processor
 voice_processor = VoiceProcessor()
 
+# Synthesised speech, shared across interviews
+tts_cache = TTSCache(voice_processor.synthesize)
+
+# Background synthesis of clips that will be asked for soon
+tts_prefetch_executor = ThreadPoolExecutor(max_workers=Config.TTS_PREFETCH_WORKERS, thread_name_prefix="tts-prefetch")
+
+def prefetch_speech(texts: List[str]) -> List[Future]:
+    """
+    Synthesise the clips of upcoming texts into the TTS cache in the background
+    
+    Args:
+        texts: Texts that will be spoken soon
+        
+    Returns:
+        Futures of the syntheses started
+    """
+    return tts_cache.prefetch(texts, tts_prefetch_executor)
+
+# Bounded fan-out for the chunks of long answers
+chunk_executor = ThreadPoolExecutor(max_workers=Config.STT_CHUNK_CONCURRENCY, thread_name_prefix="stt-chunk")
+
+# Shared pool for streaming transcription segments
+transcription_executor = ThreadPoolExecutor(max_workers=Config.STT_MAX_WORKERS, thread_name_prefix="stt")
+
+def create_transcription_stream() -> TranscriptionStream:
+    """
+    Create a transcription stream for one answer, using the configured speech backend
+    
+    Returns:
+        TranscriptionStream fed with 16 kHz mono 16-bit PCM
+    """
+    if Config.STT_BACKEND == "local":
+        transcribe_segment = local_transcribe_segment
+    else:
+        transcribe_segment = lambda pcm_bytes: voice_processor.transcribe_bytes(pcm_to_wav(pcm_bytes))
+    return TranscriptionStream(transcribe_segment, transcription_executor)
+
 def set_up_sonic() -> VoiceProcessor:
     """
     Set up and return the voice processor
@@ -132,6 +616,40 @@ def process_audio(audio_file_path: str) -> str:
     """
     return voice_processor.transcribe_audio(audio_file_path)
 
+def transcribe_audio_bytes(audio_bytes) -> str:
+    """
+    Transcribe in-memory audio
+    
+    Args:
+        audio_bytes: Contents of the audio file
+        
+    Returns:
+        Transcribed text
+    """
+    return voice_processor.transcribe_bytes(audio_bytes)
+
+# Single writer for optional audio archival, off the request path
+archive_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-archive")
+
+def archive_audio(audio_bytes, output_file_path: str) -> Future:
+    """
+    Write audio to disk in the background
+    
+    Args:
+        audio_bytes: Audio to write; must not be modified afterwards
+        output_file_path: Path to save the audio file
+        
+    Returns:
+        Future completing with the path once the file is written
+    """
+    def write() -> str:
+        os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
+        with open(output_file_path, "wb") as audio_file:
+            audio_file.write(audio_bytes)
+        return output_file_path
+    
+    return archive_executor.submit(write)
+
 def text_to_speech(text: str, output_file_path: str) -> str:
     """
     Convert text to speech
@@ -143,7 +661,8 @@ def text_to_speech(text: str, output_file_path: str) -> str:
     Returns:
         Path to the generated audio file
     """
-    return voice_processor.text_to_speech(text, output_file_path)
+    _, audio_bytes = tts_cache.get_or_synthesize(text)
+    return write_audio_file(audio_bytes, output_file_path)
 
 def convert_webm_to_wav(webm_file_path: str, wav_file_path: str) -> str:
     """
@@ -157,18 +676,20 @@ def convert_webm_to_wav(webm_file_path: str, wav_file_path: str) -> str:
         Path to the converted WAV file
     """
     try:
-        import subprocess
-        
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(wav_file_path), exist_ok=True)
         
-        # Use ffmpeg to convert WebM to WAV
-        subprocess.run([
-            "ffmpeg", "-i", webm_file_path, "-acodec", "pcm_s16le", "-ar", "16000", "-ac", "1", wav_file_path
-        ], check=True)
+        # Decode and resample to 16 kHz mono in process (ffmpeg workers are the fallback)
+        with open(webm_file_path, "rb") as webm_file:
+            samples = decode_audio(webm_file.read())
+        if samples is None:
+            return ""
+        
+        with open(wav_file_path, "wb") as wav_file:
+            wav_file.write(pcm_to_wav(samples.tobytes(), Config.STT_SAMPLE_RATE))
         
         return wav_file_path
         
     except Exception as e:
         logger.error(f"Error converting WebM to WAV: {e}")
-        return ""
\ No newline at end of file
+        return ""
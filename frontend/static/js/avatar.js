@@ -7,6 +7,7 @@ let speechSynthesizer;
 let selectedVoice = null;
 let isSpeaking = false;
 let currentUtterance = null;
+let currentAudio = null;
 
 // Initialize the video avatar
 function initializeAvatar(videoId) {
@@ -245,10 +246,51 @@ function speakText(text) {
     }, duration);
 }
 
+// Play pre-synthesised speech for the text, falling back to browser speech synthesis
+function avatarPlayAudio(url, text) {
+    if (!videoIsInitialized || !videoElement) {
+        console.error("Video element not initialized");
+        return;
+    }
+    
+    // Stop any current speech
+    stopSpeaking();
+    
+    const audio = new Audio(url);
+    currentAudio = audio;
+    const fallback = (error) => {
+        if (currentAudio !== audio) return;
+        console.warn("Speech clip could not be played, using speech synthesis:", error);
+        currentAudio = null;
+        avatarSpeak(text);
+    };
+    
+    audio.onplay = () => {
+        isSpeaking = true;
+        videoElement.currentTime = 0;
+        videoElement.loop = true;
+        videoElement.play().catch(e => console.error("Video play error:", e));
+    };
+    audio.onended = () => {
+        if (currentAudio !== audio) return;
+        currentAudio = null;
+        isSpeaking = false;
+        videoElement.loop = false;
+        handleVideoEnd();
+    };
+    audio.onerror = fallback;
+    audio.play().catch(fallback);
+}
+
 function stopSpeaking() {
     if (speechSynthesizer) {
         speechSynthesizer.cancel();
     }
+    if (currentAudio) {
+        currentAudio.pause();
+        currentAudio = null;
+        if (videoElement) videoElement.loop = false;
+    }
     isSpeaking = false;
     currentUtterance = null;
 }
@@ -305,6 +347,7 @@ document.addEventListener('DOMContentLoaded', function() {
 
 // Export to global scope
 window.avatarSpeak = avatarSpeak;
+window.avatarPlayAudio = avatarPlayAudio;
 window.initializeAvatar = initializeAvatar;
 window.readCurrentQuestion = readCurrentQuestion;
 window.stopSpeaking = stopSpeaking;
\ No newline at end of file
@@ -7,10 +7,22 @@ let currentAnswer = '';
 let interviewTimer;
 let interviewPaused = false;
 let mediaRecorder;
-let recordedChunks = [];
+let recordingSocket = null;
+let recordingSessionId = null;
+let streamingRecording = false;
+let nextChunkSequence = 0;
+let unackedChunks = new Map();
+let recordingSaved = Promise.resolve();
+let interviewChannel = null;
+let channelRequestId = 0;
+let channelRequests = new Map();
 let isRecording = false;
 let interviewEnded = false;
 let speechRecognition;
+let speechSocket = null;
+let speechAudioContext = null;
+let speechFinalResolvers = [];
+let speechAnswerActive = true;
 let interviewData = {
     questions: [],
     score: 0,
@@ -22,6 +34,9 @@ let interviewData = {
 function initializeInterview(interviewId) {
     currentInterviewId = interviewId;
     
+    // Open the live interview channel while the prompt is shown
+    connectInterviewChannel();
+    
     // Show the interview prompt
     const interviewPrompt = document.getElementById('interviewPrompt');
     interviewPrompt.classList.add('active');
@@ -36,6 +51,9 @@ function initializeInterview(interviewId) {
         
         // Start speech recognition
         startSpeechRecognition();
+        
+        // Stream answer audio to the server for transcription
+        startServerTranscription();
     }, 3000);
 }
 
@@ -45,32 +63,43 @@ async function getNextQuestion() {
         // Show loading state
         document.getElementById('currentQuestion').textContent = 'Loading next question...';
         
-        // Prepare form data
-        const formData = new FormData();
-        if (currentQuestionId !== null) {
-            formData.append('current_question_id', currentQuestionId);
-        }
-        if (currentAnswer) {
-            formData.append('answer', currentAnswer);
-        }
-        
-        // Send request to get next question
-        const response = await fetch(`/interview/${currentInterviewId}/question`, {
-            method: 'POST',
-            body: formData
-        });
-        
-        if (!response.ok) {
-            throw new Error('Failed to get next question');
+        let questionData;
+        if (interviewChannel) {
+            // Send the turn over the live channel
+            const message = await channelRequest({
+                type: 'next_question',
+                current_question_id: currentQuestionId,
+                answer: currentAnswer || null
+            });
+            questionData = message.question;
+        } else {
+            // Prepare form data
+            const formData = new FormData();
+            if (currentQuestionId !== null) {
+                formData.append('current_question_id', currentQuestionId);
+            }
+            if (currentAnswer) {
+                formData.append('answer', currentAnswer);
+            }
+            
+            // Send request to get next question
+            const response = await fetch(`/interview/${currentInterviewId}/question`, {
+                method: 'POST',
+                body: formData
+            });
+            
+            if (!response.ok) {
+                throw new Error('Failed to get next question');
+            }
+            
+            questionData = await response.json();
         }
         
-        const questionData = await response.json();
-        
         // Update UI with new question
         document.getElementById('currentQuestion').textContent = questionData.question;
         
         // Make avatar speak the question
-        speakQuestion(questionData.question);
+        speakQuestion(questionData.question, questionData.audio_url);
         
         // Update current question ID
         currentQuestionId = questionData.id;
@@ -78,6 +107,7 @@ async function getNextQuestion() {
         // Reset current answer
         currentAnswer = '';
         document.getElementById('answerTranscription').textContent = 'Your answer will appear here as you speak...';
+        startServerAnswer();
         
     } catch (error) {
         console.error('Error getting next question:', error);
@@ -85,10 +115,87 @@ async function getNextQuestion() {
     }
 }
 
+// Open (or reopen) the live interview channel
+function connectInterviewChannel() {
+    const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+    const socket = new WebSocket(`${protocol}://${window.location.host}/interview/${currentInterviewId}/channel`);
+    
+    socket.onopen = () => {
+        interviewChannel = socket;
+    };
+    
+    socket.onmessage = (event) => {
+        handleChannelMessage(JSON.parse(event.data));
+    };
+    
+    socket.onclose = () => {
+        const wasOpen = interviewChannel === socket;
+        if (wasOpen) {
+            interviewChannel = null;
+        }
+        
+        // Fail outstanding requests; new ones use HTTP until the channel is back
+        for (const pending of channelRequests.values()) {
+            pending.reject(new Error('Interview channel closed'));
+        }
+        channelRequests.clear();
+        
+        if (wasOpen && !interviewEnded) {
+            setTimeout(connectInterviewChannel, 1000);
+        }
+    };
+}
+
+// Handle a message from the live interview channel
+function handleChannelMessage(message) {
+    if (message.type === 'ping') {
+        interviewChannel?.send(JSON.stringify({ type: 'pong' }));
+        return;
+    }
+    if (message.type === 'event') {
+        if (message.event === 'completed') {
+            interviewEnded = true;
+        }
+        return;
+    }
+    
+    const pending = channelRequests.get(message.request_id);
+    if (!pending) return;
+    channelRequests.delete(message.request_id);
+    
+    if (message.type === 'error') {
+        pending.reject(new Error(message.detail));
+    } else {
+        pending.resolve(message);
+    }
+}
+
+// Send a request over the live channel and wait for its response
+function channelRequest(message, audioBlob = null) {
+    return new Promise((resolve, reject) => {
+        const requestId = ++channelRequestId;
+        channelRequests.set(requestId, { resolve, reject });
+        interviewChannel.send(JSON.stringify({ ...message, request_id: requestId }));
+        if (audioBlob) {
+            // The audio follows its request as a single binary message
+            interviewChannel.send(audioBlob);
+        }
+    });
+}
+
 // Process and get next question
-function processAndGetNextQuestion() {
+async function processAndGetNextQuestion() {
     if (interviewEnded) return;
     
+    // Use the server's transcript of the answer when streaming transcription is running,
+    // unless the backend only returned a placeholder for the audio it received
+    if (speechSocket) {
+        const result = await finishServerTranscription();
+        if (result && result.transcript && !result.placeholder) {
+            currentAnswer = result.transcript;
+        }
+    }
+    
     // Process current answer if any
     if (currentAnswer.trim()) {
         // Store the question and answer
@@ -168,16 +275,27 @@ async function endInterview() {
     // Stop timer
     clearInterval(interviewTimer);
     
-    // Stop recording
-    if (isRecording && mediaRecorder && mediaRecorder.state !== 'inactive') {
-        mediaRecorder.stop();
-    }
+    // Stop recording; it is saved while the interview is completed
+    const recordingFinished = stopRecording();
     
     try {
         // Stop speech recognition
         if (speechRecognition) {
             speechRecognition.stop();
         }
+        if (speechSocket) {
+            speechSocket.close();
+        }
+        
+        // The answer in progress is only sent with the completed interview
+        if (currentQuestionId !== null && currentAnswer.trim()) {
+            interviewData.questions.push({
+                id: currentQuestionId,
+                question: document.getElementById('currentQuestion').textContent,
+                answer: currentAnswer,
+                is_follow_up: currentQuestionId.toString().includes('.')
+            });
+        }
         
         // Send complete interview data to server
         const formData = new FormData();
@@ -188,6 +306,10 @@ async function endInterview() {
             body: formData
         });
         
+        // Leaving the page would cut off the recording before it is finalized
+        document.getElementById('currentQuestion').textContent = 'Saving your recording...';
+        await recordingFinished;
+        
         // Redirect to results page
         window.location.href = `/candidate/interview/${currentInterviewId}/complete`;
         
@@ -213,32 +335,26 @@ function startRecording() {
             mimeType: 'video/webm;codecs=vp9,opus'
         });
         
+        // Stream chunks to the server as they are recorded, as a new recording session
+        recordingSessionId = Array.from(crypto.getRandomValues(new Uint8Array(16)))
+            .map(b => b.toString(16).padStart(2, '0')).join('');
+        nextChunkSequence = 0;
+        unackedChunks = new Map();
+        connectRecordingStream();
+        
         // Event handlers
         mediaRecorder.ondataavailable = (event) => {
             if (event.data.size > 0) {
-                recordedChunks.push(event.data);
+                // Every chunk is numbered from the start, including those recorded before the
+                // socket opens (the first carries the WebM header); they are sent on connect
+                const sequence = nextChunkSequence++;
+                unackedChunks.set(sequence, event.data);
+                sendRecordingChunk(sequence, event.data);
             }
         };
         
-        mediaRecorder.onstop = async () => {
-            // Create a blob from recorded chunks
-            const recordedBlob = new Blob(recordedChunks, { type: 'video/webm' });
-            
-            try {
-                // Save the recording
-                const formData = new FormData();
-                formData.append('video_data', recordedBlob);
-                
-                await fetch(`/interview/${currentInterviewId}/save-recording`, {
-                    method: 'POST',
-                    body: formData
-                });
-                
-                console.log('Recording saved successfully');
-                
-            } catch (error) {
-                console.error('Error saving recording:', error);
-            }
+        mediaRecorder.onstop = () => {
+            recordingSaved = saveRecording();
         };
         
         // Start recording
@@ -250,6 +366,205 @@ function startRecording() {
     }
 }
 
+// Stop the recorder and wait until the recording has been saved
+async function stopRecording() {
+    if (!isRecording || !mediaRecorder || mediaRecorder.state === 'inactive') {
+        return recordingSaved;
+    }
+    
+    // The final chunk is delivered before the stop event, whose handler starts the save
+    await new Promise(resolve => {
+        mediaRecorder.addEventListener('stop', resolve, { once: true });
+        mediaRecorder.stop();
+    });
+    isRecording = false;
+    return recordingSaved;
+}
+
+// Finalize the streamed recording, or upload it in one piece if streaming never connected
+async function saveRecording() {
+    if (streamingRecording) {
+        try {
+            await finishRecordingStream();
+            console.log('Recording saved successfully');
+        } catch (error) {
+            console.error('Error finishing recording stream:', error);
+        }
+        return;
+    }
+    
+    // Streaming never connected: nothing was acknowledged, so every chunk is still here
+    const recordedChunks = Array.from(unackedChunks.keys())
+        .sort((a, b) => a - b)
+        .map(sequence => unackedChunks.get(sequence));
+    const recordedBlob = new Blob(recordedChunks, { type: 'video/webm' });
+    
+    try {
+        // Save the recording with the resumable upload protocol
+        await uploadRecording(recordedBlob);
+        console.log('Recording saved successfully');
+        
+    } catch (error) {
+        console.error('Error saving recording:', error);
+    }
+}
+
+// Open (or reopen) the live recording stream
+function connectRecordingStream() {
+    const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+    const socket = new WebSocket(
+        `${protocol}://${window.location.host}/interview/${currentInterviewId}/recording-stream?session=${recordingSessionId}`
+    );
+    let opened = false;
+    
+    socket.onopen = () => {
+        opened = true;
+        streamingRecording = true;
+        recordingSocket = socket;
+    };
+    
+    let resumed = false;
+    socket.onmessage = (event) => {
+        const message = JSON.parse(event.data);
+        if (message.ack === undefined) return;
+        
+        // Drop acknowledged chunks
+        for (const sequence of Array.from(unackedChunks.keys())) {
+            if (sequence <= message.ack) {
+                unackedChunks.delete(sequence);
+            }
+        }
+        
+        // The first ack on a connection is the server's committed sequence: resend everything after it
+        if (!resumed) {
+            resumed = true;
+            for (const [sequence, chunk] of unackedChunks) {
+                sendRecordingChunk(sequence, chunk);
+            }
+        }
+    };
+    
+    socket.onclose = () => {
+        if (recordingSocket === socket) {
+            recordingSocket = null;
+        }
+        if (!opened && !streamingRecording) {
+            // Streaming unavailable: keep chunks in memory and upload at the end
+            console.warn('Live recording stream unavailable, buffering recording locally');
+            return;
+        }
+        if (!interviewEnded || unackedChunks.size > 0) {
+            setTimeout(connectRecordingStream, 1000);
+        }
+    };
+}
+
+// Send one chunk prefixed with its 4-byte sequence number
+function sendRecordingChunk(sequence, chunk) {
+    if (!recordingSocket || recordingSocket.readyState !== WebSocket.OPEN) return;
+    
+    const header = new ArrayBuffer(4);
+    new DataView(header).setUint32(0, sequence);
+    recordingSocket.send(new Blob([header, chunk]));
+}
+
+// Wait for all chunks to be acknowledged, then finalize the recording
+async function finishRecordingStream(timeoutMs = 30000) {
+    const deadline = Date.now() + timeoutMs;
+    while (unackedChunks.size > 0 || !recordingSocket || recordingSocket.readyState !== WebSocket.OPEN) {
+        if (Date.now() > deadline) {
+            throw new Error('Timed out waiting for recording chunks to be acknowledged');
+        }
+        await new Promise(resolve => setTimeout(resolve, 200));
+    }
+    
+    const socket = recordingSocket;
+    await new Promise((resolve, reject) => {
+        socket.addEventListener('message', (event) => {
+            const message = JSON.parse(event.data);
+            if (message.finalized !== undefined) {
+                message.finalized ? resolve() : reject(new Error('Recording could not be finalized'));
+            }
+        });
+        // Settled already if the finalized message arrived first
+        socket.addEventListener('close', () => {
+            reject(new Error('Recording stream closed before the recording was finalized'));
+        });
+        socket.send(JSON.stringify({ type: 'end' }));
+    });
+}
+
+// SHA-256 hex digest of a blob
+async function sha256Hex(blob) {
+    const digest = await crypto.subtle.digest('SHA-256', await blob.arrayBuffer());
+    return Array.from(new Uint8Array(digest)).map(b => b.toString(16).padStart(2, '0')).join('');
+}
+
+// Upload a recording in checksummed chunks, resuming from the committed offset after failures
+async function uploadRecording(blob, maxRetries = 5) {
+    const baseUrl = `/interview/${currentInterviewId}/recording-uploads`;
+    
+    // Create the upload session
+    const formData = new FormData();
+    formData.append('total_size', blob.size);
+    const createResponse = await fetch(baseUrl, { method: 'POST', body: formData });
+    if (!createResponse.ok) {
+        throw new Error('Failed to start recording upload');
+    }
+    const session = await createResponse.json();
+    const chunkSize = Math.min(session.max_chunk_bytes, 4 * 1024 * 1024);
+    
+    let offset = 0;
+    let retries = 0;
+    while (offset < blob.size) {
+        const chunk = blob.slice(offset, offset + chunkSize);
+        try {
+            const response = await fetch(`${baseUrl}/${session.upload_id}?offset=${offset}`, {
+                method: 'PUT',
+                headers: { 'X-Chunk-SHA256': await sha256Hex(chunk) },
+                body: chunk
+            });
+            const data = await response.json();
+            
+            if (response.ok) {
+                offset = data.offset;
+                retries = 0;
+                continue;
+            }
+            if (response.status === 413) {
+                // Size limits will not change on retry
+                const error = new Error(data.detail);
+                error.fatal = true;
+                throw error;
+            }
+            if (data.offset !== undefined) {
+                // Resume from the server's committed offset
+                offset = data.offset;
+            }
+        } catch (error) {
+            if (error.fatal) throw error;
+            console.warn('Chunk upload failed, retrying:', error);
+        }
+        
+        if (++retries > maxRetries) {
+            throw new Error('Recording upload failed after retries');
+        }
+        await new Promise(resolve => setTimeout(resolve, 1000 * 2 ** retries));
+        
+        // Ask the server where to resume
+        const statusResponse = await fetch(`${baseUrl}/${session.upload_id}`);
+        if (statusResponse.ok) {
+            offset = (await statusResponse.json()).offset;
+        }
+    }
+    
+    // Finalize the upload
+    const finalizeResponse = await fetch(`${baseUrl}/${session.upload_id}/finalize`, { method: 'POST' });
+    if (!finalizeResponse.ok) {
+        throw new Error('Failed to finalize recording upload');
+    }
+}
+
 // Speech recognition for transcribing answers
 function startSpeechRecognition() {
     // Check browser support
@@ -308,13 +623,86 @@ function startSpeechRecognition() {
     speechRecognition.start();
 }
 
+// Stream microphone audio to the server as 16 kHz mono PCM for incremental transcription
+function startServerTranscription() {
+    const audioTrack = window.mediaStream && window.mediaStream.getAudioTracks()[0];
+    if (!audioTrack) return;
+    
+    const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+    const socket = new WebSocket(`${protocol}://${window.location.host}/interview/${currentInterviewId}/speech`);
+    
+    socket.onopen = () => {
+        speechSocket = socket;
+        speechAudioContext = new AudioContext({ sampleRate: 16000 });
+        const source = speechAudioContext.createMediaStreamSource(new MediaStream([audioTrack]));
+        const processor = speechAudioContext.createScriptProcessor(4096, 1, 1);
+        
+        processor.onaudioprocess = (event) => {
+            if (interviewPaused || interviewEnded || !speechAnswerActive || socket.readyState !== WebSocket.OPEN) return;
+            
+            // Convert float samples to 16-bit PCM
+            const samples = event.inputBuffer.getChannelData(0);
+            const pcm = new Int16Array(samples.length);
+            for (let i = 0; i < samples.length; i++) {
+                const sample = Math.max(-1, Math.min(1, samples[i]));
+                pcm[i] = sample < 0 ? sample * 0x8000 : sample * 0x7FFF;
+            }
+            socket.send(pcm.buffer);
+        };
+        
+        source.connect(processor);
+        processor.connect(speechAudioContext.destination);
+    };
+    
+    socket.onmessage = (event) => {
+        const message = JSON.parse(event.data);
+        if (message.type === 'partial') {
+            // Browser speech recognition gives faster feedback when it is available
+            if (!speechRecognition) {
+                document.getElementById('answerTranscription').textContent = message.transcript;
+            }
+        } else if (message.type === 'final') {
+            const resolve = speechFinalResolvers.shift();
+            if (resolve) resolve(message);
+        }
+    };
+    
+    socket.onclose = () => {
+        if (speechSocket === socket) {
+            speechSocket = null;
+        }
+        speechFinalResolvers.forEach(resolve => resolve(null));
+        speechFinalResolvers = [];
+        if (speechAudioContext) {
+            speechAudioContext.close();
+            speechAudioContext = null;
+        }
+    };
+}
+
+// Start a new answer, discarding any audio the server buffered since the last one
+function startServerAnswer() {
+    speechAnswerActive = true;
+    if (speechSocket && speechSocket.readyState === WebSocket.OPEN) {
+        speechSocket.send(JSON.stringify({ type: 'start' }));
+    }
+}
+
+// End the current answer and get its final message ({transcript, placeholder}) from the server
+function finishServerTranscription() {
+    if (!speechSocket) return Promise.resolve(null);
+    
+    speechAnswerActive = false;
+    return new Promise(resolve => {
+        speechFinalResolvers.push(resolve);
+        speechSocket.send(JSON.stringify({ type: 'end' }));
+    });
+}
+
 // Process audio chunk with backend for better transcription
 async function processAudioChunk() {
-    // This would typically send audio data to the backend for processing
-    // For now, we're using the browser's speech recognition
-    // In a real implementation, you would process the audio on the server
-    
-    if (!window.mediaStream) return;
+    // Answers are already being transcribed from the streamed audio
+    if (!window.mediaStream || speechSocket) return;
     
     try {
         // Create a recorder for this audio chunk
@@ -337,24 +725,31 @@ async function processAudioChunk() {
             // Create blob from chunks
             const audioBlob = new Blob(audioChunks, { type: 'audio/webm' });
             
-            // Send to server for processing
-            const formData = new FormData();
-            formData.append('audio_data', audioBlob);
-            
             try {
-                const response = await fetch(`/interview/${currentInterviewId}/process-audio`, {
-                    method: 'POST',
-                    body: formData
-                });
-                
-                if (response.ok) {
-                    const data = await response.json();
-                    if (data.transcription) {
-                        // Update with more accurate transcription from server
-                        // In practice, we'd merge or compare this with our local transcription
-                        console.log('Server transcription:', data.transcription);
+                let data = null;
+                if (interviewChannel) {
+                    // Send over the live channel
+                    data = await channelRequest({ type: 'transcribe' }, audioBlob);
+                } else {
+                    // Send to server for processing
+                    const formData = new FormData();
+                    formData.append('audio_data', audioBlob);
+                    
+                    const response = await fetch(`/interview/${currentInterviewId}/process-audio`, {
+                        method: 'POST',
+                        body: formData
+                    });
+                    
+                    if (response.ok) {
+                        data = await response.json();
                     }
                 }
+                
+                if (data && data.transcription) {
+                    // Update with more accurate transcription from server
+                    // In practice, we'd merge or compare this with our local transcription
+                    console.log('Server transcription:', data.transcription);
+                }
             } catch (error) {
                 console.error('Error processing audio chunk:', error);
             }
@@ -374,9 +769,11 @@ async function processAudioChunk() {
 }
 
 // Make the avatar speak the question
-function speakQuestion(question) {
-    // Call the avatar's speak function from avatar.js
-    if (window.avatarSpeak) {
+function speakQuestion(question, audioUrl) {
+    // Play the server's synthesised clip when there is one, else use the avatar's speech synthesis
+    if (audioUrl && window.avatarPlayAudio) {
+        window.avatarPlayAudio(audioUrl, question);
+    } else if (window.avatarSpeak) {
         window.avatarSpeak(question);
     } else {
         console.error('Avatar speak function not available');